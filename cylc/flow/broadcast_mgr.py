@@ -202,7 +202,7 @@ class BroadcastMgr:
                     # Matched.
                     point_string = TaskID.split(itask.identity)[1]
                     # Set trigger satisfied.
-                    itask.state.external_triggers[trig] = True
+                    itask.state.satisfy_external_trigger(trig)
                     # Broadcast the event ID to the cycle point.
                     if qid is not None:
                         self.put_broadcast(
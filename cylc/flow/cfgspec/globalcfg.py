@@ -109,6 +109,63 @@ with Conf('global.cylc', desc='''
                The default is set quite high to avoid killing important
                processes when the system is under load.
         ''')
+        Conf('process pool type', VDR.V_STRING, 'poll',
+             options=['poll', 'asyncio'], desc='''
+            How the process pool runs commands.
+
+            Options:
+
+            poll
+               Commands are launched, and their exit detected, by polling
+               on each iteration of the scheduler main loop.
+            asyncio
+               Commands are run as asynchronous subprocesses, launched as
+               soon as there is space in the pool, with their exit handled
+               as soon as it happens.
+        ''')
+        Conf('xtrigger function pool size', VDR.V_INTEGER, 0, desc='''
+            If greater than zero, xtrigger functions (other than
+            ``wall_clock``) are called in this many persistent worker
+            processes, instead of in a new ``cylc function-run`` process (in
+            the process pool) for each call.
+
+            Function calls are killed after the ``process pool timeout``.
+
+            Functions are imported once in each worker process. The workers
+            are restarted on suite reload, so changes to xtrigger modules
+            take effect on reload (or restart) of the suite.
+        ''')
+        Conf('public database write interval', VDR.V_INTERVAL, desc='''
+            If set, the public suite database (in the suite run log directory)
+            is written by a background thread at this interval, instead of
+            synchronously in the scheduler main loop. Use this if the run
+            directory is on a slow (e.g. shared network) file system.
+
+            The private suite database is always written synchronously.
+        ''')
+        Conf('config cache directory', VDR.V_STRING, desc='''
+            If set, cache processed suite configurations in this directory,
+            to speed up the start-up, reload and validation of suites that
+            take a long time to process (e.g. with complex Jinja2).
+
+            The cache holds the result of include-file inlining, Jinja2 or
+            EmPy templating and line continuation, parsed into sections and
+            items (before upgrade and validation). It is used as long as the
+            ``flow.cylc`` file path and template variables, the files in its
+            directory (apart from run directory sub-directories such as
+            ``log/``), its include-files, the environment variables read via
+            ``environ`` in Jinja2 templates, the ``HOME``, ``CYLC_*`` and
+            ``ROSE_*`` environment variables, and the Cylc version are
+            unchanged. Only the latest entry for each suite is kept.
+
+            Templates which depend on anything else (e.g. Python modules or
+            Jinja2 filters from outside the suite directory, environment
+            variables read by EmPy or Python code, or the current time)
+            should not be used with the cache.
+
+            Environment variables and ``~`` are expanded, e.g.
+            ``$HOME/.cache/cylc/config``.
+        ''')
         Conf('run directory rolling archive length', VDR.V_INTEGER, -1,
              desc='''
             The number of old run directory trees to retain at start-up.
@@ -594,6 +651,16 @@ with Conf('global.cylc', desc='''
                 submission subprocess beyond the standard locations''' +
                  ', '.join(SYSPATH) + '''. You are unlikely to need this.
             ''')
+            Conf('job submission parallelism', VDR.V_INTEGER, 1, desc='''
+                Maximum number of jobs to submit to the job runner at the same
+                time, for each batch of jobs submitted to this platform.
+
+                Job submission commands are normally run one after another.
+                Where each submission takes a long time (e.g. ``qsub`` or
+                ``sbatch`` on a busy front end), submitting several at once
+                can greatly reduce the time taken to submit a large batch of
+                jobs.
+            ''')
         with Conf('localhost', meta=Platform):
             Conf('hosts', VDR.V_STRING_LIST, ['localhost'])
 
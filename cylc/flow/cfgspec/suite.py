@@ -1507,8 +1507,9 @@ def warn_about_depr_event_handler_tmpl(cfg):
 class RawSuiteConfig(ParsecConfig):
     """Raw suite configuration."""
 
-    def __init__(self, fpath, output_fname, tvars):
+    def __init__(self, fpath, output_fname, tvars, cache_dir=None):
         """Return the default instance."""
         ParsecConfig.__init__(
-            self, SPEC, upg, output_fname, tvars, cylc_config_validate)
+            self, SPEC, upg, output_fname, tvars, cylc_config_validate,
+            cache_dir)
         self.loadcfg(fpath, "suite definition")
@@ -29,6 +29,7 @@ structures.
 
 from copy import copy
 from fnmatch import fnmatchcase
+from functools import partial
 import os
 import re
 import traceback
@@ -39,7 +40,7 @@ from metomi.isodatetime.exceptions import IsodatetimeError
 from metomi.isodatetime.timezone import get_local_time_zone_format
 from metomi.isodatetime.dumpers import TimePointDumper
 from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
-from cylc.flow.parsec.util import replicate
+from cylc.flow.parsec.util import overlay, replicate
 
 from cylc.flow import LOG
 from cylc.flow.c3mro import C3
@@ -219,10 +220,14 @@ class SuiteConfig:
         self.mem_log("config.py: before RawSuiteConfig init")
         if output_fname:
             output_fname = os.path.expandvars(output_fname)
+        cache_dir = glbl_cfg().get(['scheduler', 'config cache directory'])
+        if cache_dir:
+            cache_dir = os.path.expandvars(os.path.expanduser(cache_dir))
         self.pcfg = RawSuiteConfig(
             fpath,
             output_fname,
-            template_vars
+            template_vars,
+            cache_dir
         )
         self.mem_log("config.py: after RawSuiteConfig init")
         self.mem_log("config.py: before get(sparse=True")
@@ -1125,15 +1130,20 @@ class SuiteConfig:
                     self.runtime['first-parent descendants'][p].append(name)
 
     def compute_inheritance(self):
-        LOG.debug("Parsing the runtime namespace hierarchy")
+        """Compute the runtime of each namespace by inheritance.
+
+        Each namespace is the settings of its linearized ancestors overlaid
+        in turn, from root. The result of each partial hierarchy is stored
+        and reused by namespaces with the same ancestors (e.g. children of
+        the same family), which only overlay the rest of their hierarchy
+        on it. Overlaid namespaces share the sections they don't override.
 
-        # TODO: Note an unused alternative mechanism was removed here
-        # (March 2020). It stored the result of each completed MRO and
-        # re-used these wherever possible. This could be more efficient
-        # for full namespaces in deep hierarchies. We should go back and
-        # look if inheritance computation becomes a problem.
+        """
+        LOG.debug("Parsing the runtime namespace hierarchy")
 
         results = OrderedDictWithDefaults()
+        # Overlaid runtime, by linearized hierarchy from root.
+        partials = {(): OrderedDictWithDefaults()}
 
         # Loop through runtime members, 'root' first.
         nses = list(self.cfg['runtime'])
@@ -1143,23 +1153,24 @@ class SuiteConfig:
 
             hierarchy = copy(self.runtime['linearized ancestors'][ns])
             hierarchy.reverse()
-
-            result = OrderedDictWithDefaults()
-
-            # Go up the linearized MRO from root, replicating or
-            # overriding each namespace element as we go.
-            for name in hierarchy:
-                replicate(result, self.cfg['runtime'][name])
-                # n_reps += 1
+            hierarchy = tuple(hierarchy)
+
+            # Find the longest computed partial hierarchy, then go up the
+            # rest of the linearized MRO, overriding elements as we go.
+            start = len(hierarchy)
+            while hierarchy[:start] not in partials:
+                start -= 1
+            result = partials[hierarchy[:start]]
+            for end in range(start + 1, len(hierarchy) + 1):
+                result = overlay(
+                    result, self.cfg['runtime'][hierarchy[end - 1]])
+                partials[hierarchy[:end]] = result
 
             results[ns] = result
 
         # replace pre-inheritance namespaces with the post-inheritance result
         self.cfg['runtime'] = results
 
-        # uncomment this to compare the simple and efficient methods
-        # print '  Number of namespace replications:', n_reps
-
     # def print_inheritance(self):
     #     # (use for debugging)
     #     for foo in self.runtime:
@@ -1914,82 +1925,91 @@ class SuiteConfig:
                    for i in self.closed_families):
                 clf_map[name] = first_parent_descendants[name]
 
+        # Points beyond this are not plotted.
+        stops = [
+            point for point in (stop_point, suite_final_point)
+            if point is not None]
+        if stops:
+            stop = min(stops)
+        else:
+            stop = None
+        if stop_point is None:
+            # Take n_points cycles from each sequence.
+            limit = n_points
+        else:
+            limit = None
+
         gr_edges = {}
         start_point_offset_cache = {}
-        point_offset_cache = None
         for sequence, edges in self.edges.items():
-            # Get initial cycle point for this sequence
-            point = sequence.get_first_point(start_point)
-            new_points = []
-            while point is not None:
-                if point not in new_points:
-                    new_points.append(point)
-                if stop_point is not None and point > stop_point:
-                    # Beyond requested final cycle point.
-                    break
-                if suite_final_point is not None and point > suite_final_point:
-                    # Beyond suite final cycle point.
-                    break
-                if stop_point is None and len(new_points) > n_points:
-                    # Take n_points cycles from each sequence.
-                    break
-                point_offset_cache = {}
-                for left, right, suicide, cond in edges:
-                    if is_validate and (not right or suicide):
-                        continue
-                    if right:
-                        r_id = (right, point)
-                    else:
-                        r_id = None
-                    if left.startswith('@'):
-                        # @trigger node.
-                        name = left
-                        offset_is_from_icp = False
-                        offset = None
-                    else:
-                        name, offset, _, offset_is_from_icp, _, _ = (
-                            GraphNodeParser.get_inst().parse(left))
-                    if offset:
-                        if offset_is_from_icp:
-                            cache = start_point_offset_cache
-                            rel_point = start_point
-                        else:
-                            cache = point_offset_cache
-                            rel_point = point
-                        try:
-                            l_point = cache[offset]
-                        except KeyError:
-                            l_point = get_point_relative(offset, rel_point)
-                            cache[offset] = l_point
-                    else:
-                        l_point = point
-                    l_id = (name, l_point)
-
-                    if l_id is None and r_id is None:
-                        continue
-                    if l_id is not None and actual_first_point > l_id[1]:
+            points = sequence.get_points(start_point, stop, limit)
+            if not points:
+                continue
+            # Edges for each point (in the same order as points).
+            seq_edges = [[] for _ in points]
+            # {offset: [offset point for each point]}
+            offset_points = {}
+            for left, right, suicide, cond in edges:
+                if is_validate and (not right or suicide):
+                    continue
+                if left.startswith('@'):
+                    # @trigger node.
+                    name = left
+                    offset_is_from_icp = False
+                    offset = None
+                else:
+                    name, offset, _, offset_is_from_icp, _, _ = (
+                        GraphNodeParser.get_inst().parse(left))
+                # Work out the left points for all points at once.
+                if not offset:
+                    l_points = points
+                elif offset_is_from_icp:
+                    try:
+                        l_point = start_point_offset_cache[offset]
+                    except KeyError:
+                        l_point = get_point_relative(offset, start_point)
+                        start_point_offset_cache[offset] = l_point
+                    l_points = [l_point] * len(points)
+                else:
+                    try:
+                        l_points = offset_points[offset]
+                    except KeyError:
+                        l_points = [
+                            get_point_relative(offset, point)
+                            for point in points]
+                        offset_points[offset] = l_points
+                # Family closing depends on the names alone.
+                lname, rname = self._close_family_names(name, right, clf_map)
+                pre_name = self._close_family_names(right, None, clf_map)[0]
+
+                for p_edges, point, l_point in zip(
+                        seq_edges, points, l_points):
+                    if actual_first_point > l_point:
                         # Check that l_id is not earlier than start time.
-                        if (r_id is None or r_id[1] < actual_first_point or
+                        if (not right or point < actual_first_point or
                                 is_validate):
                             continue
                         # Pre-initial dependency;
                         # keep right hand node.
-                        l_id = r_id
-                        r_id = None
-                    if point not in gr_edges:
-                        gr_edges[point] = []
-                    if is_validate:
-                        gr_edges[point].append((l_id, r_id))
+                        p_edges.append((
+                            TaskID.get(pre_name, point), None, None,
+                            suicide, cond))
+                    elif is_validate:
+                        p_edges.append(((name, l_point), (right, point)))
                     else:
-                        lstr, rstr = self._close_families(l_id, r_id, clf_map)
-                        gr_edges[point].append(
-                            (lstr, rstr, None, suicide, cond))
-                # Increment the cycle point.
-                point = sequence.get_next_point_on_sequence(point)
+                        if rname:
+                            rstr = TaskID.get(rname, point)
+                        else:
+                            rstr = None
+                        p_edges.append((
+                            TaskID.get(lname, l_point), rstr, None,
+                            suicide, cond))
+            for point, p_edges in zip(points, seq_edges):
+                if p_edges:
+                    gr_edges.setdefault(point, []).extend(p_edges)
 
         del clf_map
         del start_point_offset_cache
-        del point_offset_cache
         GraphNodeParser.get_inst().clear()
         self._last_graph_raw_id = graph_raw_id
         if stop_point is None:
@@ -2034,35 +2054,23 @@ class SuiteConfig:
         return ret
 
     @staticmethod
-    def _close_families(l_id, r_id, clf_map):
-        """Turn (name, point) to 'name.point' for edge.
+    def _close_family_names(lname, rname, clf_map):
+        """Return the node names for an edge between lname and rname.
 
-        Replace close family members with family nodes if relevant.
+        Replace close family members with family names if relevant.
         """
-        lret = None
-        lname, lpoint = None, None
-        if l_id:
-            lname, lpoint = l_id
-            lret = TaskID.get(lname, lpoint)
-        rret = None
-        rname, rpoint = None, None
-        if r_id:
-            rname, rpoint = r_id
-            rret = TaskID.get(rname, rpoint)
-
+        lret, rret = lname, rname
         for fam_name, fam_members in clf_map.items():
             if lname in fam_members and rname in fam_members:
                 # l and r are both members
-                lret = TaskID.get(fam_name, lpoint)
-                rret = TaskID.get(fam_name, rpoint)
+                lret = rret = fam_name
                 break
             elif lname in fam_members:
                 # l is a member
-                lret = TaskID.get(fam_name, lpoint)
+                lret = fam_name
             elif rname in fam_members:
                 # r is a member
-                rret = TaskID.get(fam_name, rpoint)
-
+                rret = fam_name
         return lret, rret
 
     def load_graph(self):
@@ -2123,11 +2131,13 @@ class SuiteConfig:
                     msg += ' %s' % exc.args[0]
                 raise SuiteConfigError(msg)
             self.sequences.append(seq)
-            parser = GraphParser(family_map, self.parameters)
+            # Triggers are processed as they are parsed, so the parsed
+            # graph is never held in memory all at once.
+            parser = GraphParser(
+                family_map, self.parameters,
+                partial(self._proc_trigger, seq, task_triggers))
             parser.parse_graph(graph)
             self.suite_polling_tasks.update(parser.suite_state_polling_tasks)
-            self._proc_triggers(
-                parser.triggers, parser.original, seq, task_triggers)
 
         # Detect use of xtrigger names with '@' prefix (creates a task).
         overlap = set(self.taskdefs.keys()).intersection(
@@ -2136,16 +2146,14 @@ class SuiteConfig:
             LOG.error(', '.join(overlap))
             raise SuiteConfigError('task and @xtrigger names clash')
 
-    def _proc_triggers(self, triggers, original, seq, task_triggers):
-        """Define graph edges, taskdefs, and triggers, from graph sections."""
-        for right, val in triggers.items():
-            for expr, trigs in val.items():
-                lefts, suicide = trigs
-                orig = original[right][expr]
-                self.generate_edges(expr, orig, lefts, right, seq, suicide)
-                self.generate_taskdefs(orig, lefts, right, seq, suicide)
-                self.generate_triggers(
-                    expr, lefts, right, seq, suicide, task_triggers)
+    def _proc_trigger(
+        self, seq, task_triggers, right, expr, lefts, suicide, orig
+    ):
+        """Define graph edges, taskdefs, and triggers, for one trigger."""
+        self.generate_edges(expr, orig, lefts, right, seq, suicide)
+        self.generate_taskdefs(orig, lefts, right, seq, suicide)
+        self.generate_triggers(
+            expr, lefts, right, seq, suicide, task_triggers)
 
     def find_taskdefs(self, name):
         """Find TaskDef objects in family "name" or matching "name".
@@ -270,7 +270,9 @@ class SequenceBase(object, metaclass=ABCMeta):
     get_offset & set_offset (deprecated), is_on_sequence,
     get_nearest_prev_point, get_next_point,
     get_next_point_on_sequence, get_first_point, and
-    get_stop_point.
+    get_stop_point. They may override get_points, which enumerates the
+    points in a window, with something faster than stepping through
+    them one by one.
 
     They should also provide a self.__eq__ implementation
     which should return whether a SequenceBase-derived object
@@ -358,6 +360,34 @@ class SequenceBase(object, metaclass=ABCMeta):
         """Return the last point in this sequence, or None if unbounded."""
         pass
 
+    def get_points(self, start_point, stop_point=None, limit=None):
+        """Return the points of this sequence in a window.
+
+        Args:
+            start_point (PointBase):
+                Return points >= start_point.
+            stop_point (PointBase):
+                Return points <= stop_point (None for no limit).
+            limit (int):
+                Return at most this many points (None for no limit).
+                One of stop_point and limit is required for unbounded
+                sequences.
+
+        Returns:
+            list - The points, in order.
+
+        """
+        points = []
+        point = self.get_first_point(start_point)
+        while (
+            point is not None
+            and (stop_point is None or point <= stop_point)
+            and (limit is None or len(points) < limit)
+        ):
+            points.append(point)
+            point = self.get_next_point_on_sequence(point)
+        return points
+
     @abstractmethod
     def __eq__(self, other):
         # Return True if other (sequence) is equal to self.
@@ -17,6 +17,7 @@
 Integer cycling by point, interval, and sequence classes.
 """
 
+from itertools import count
 import re
 
 from cylc.flow.cycling import (
@@ -554,6 +555,32 @@ class IntegerSequence(SequenceBase):
             return self.get_next_point_on_sequence(point)
         return point
 
+    def get_points(self, start_point, stop_point=None, limit=None):
+        """Return the points of this sequence in a window.
+
+        See SequenceBase.get_points. The points are counted off with
+        integer arithmetic.
+        """
+        point = self.get_first_point(start_point)
+        if point is None or not self.i_step:
+            return super().get_points(start_point, stop_point, limit)
+        stops = [
+            int(stop) for stop in (self.p_stop, stop_point)
+            if stop is not None]
+        if stops:
+            values = range(int(point), min(stops) + 1, int(self.i_step))
+        else:
+            values = count(int(point), int(self.i_step))
+        points = []
+        for value in values:
+            if limit is not None and len(points) >= limit:
+                break
+            point = IntegerPoint(value)
+            if self.exclusions and point in self.exclusions:
+                continue
+            points.append(point)
+        return points
+
     def get_start_point(self):
         """Return the first point in this sequence, or None."""
         if self.exclusions and self.p_start in self.exclusions:
@@ -17,9 +17,10 @@
 """Date-time cycling by point, interval, and sequence classes."""
 
 from functools import lru_cache
+import math
 import re
 
-from metomi.isodatetime.data import Calendar, Duration, CALENDAR
+from metomi.isodatetime.data import Calendar, Duration, CALENDAR, TimePoint
 from metomi.isodatetime.dumpers import TimePointDumper
 from metomi.isodatetime.timezone import (
     get_local_time_zone, get_local_time_zone_format, TimeZoneFormatMode)
@@ -53,6 +54,9 @@ class SuiteSpecifics:
     """Store suite-setup-specific constants and utilities here."""
     ASSUMED_TIME_ZONE = None
     DUMP_FORMAT = None
+    # Points in DUMP_FORMAT are on a grid of whole seconds since the epoch:
+    # (grid interval in seconds, or None if unknown, a point on the grid)
+    DUMP_GRID = (None, None)
     NUM_EXPANDED_YEAR_DIGITS = None
     abbrev_util = None
     interval_parser = None
@@ -63,21 +67,44 @@ class SuiteSpecifics:
 
 class ISO8601Point(PointBase):
 
-    """A single point in an ISO8601 date time sequence."""
+    """A single point in an ISO8601 date time sequence.
+
+    The point is also held as whole seconds since the Unix epoch (in the
+    suite calendar), for comparing points without parsing their strings.
+    This is worked out on first use, or carried over from the point an
+    exact interval was added to or subtracted from (if the result can be
+    written exactly in the dump format).
+
+    The string value is unchanged, so is what gets stored or displayed.
+
+    """
 
     TYPE = CYCLER_TYPE_ISO8601
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_ISO8601
 
-    __slots__ = ('value')
+    __slots__ = ('value', '_epoch')
+
+    def __init__(self, value, epoch=None):
+        super().__init__(value)
+        self._epoch = epoch
 
     @classmethod
     def from_nonstandard_string(cls, point_string):
         """Standardise a date-time string."""
         return ISO8601Point(str(point_parse(point_string))).standardise()
 
+    @property
+    def epoch(self):
+        """Return the point in whole seconds since the Unix epoch."""
+        if self._epoch is None:
+            self._epoch = _point_epoch(self.value, CALENDAR.mode)
+        return self._epoch
+
     def add(self, other):
         """Add an Interval to self."""
-        return ISO8601Point(self._iso_point_add(self.value, other.value))
+        return ISO8601Point(
+            self._iso_point_add(self.value, other.value),
+            self._get_epoch_offset(other, 1))
 
     def __cmp__(self, other):
         # Compare other (point) to self.
@@ -87,6 +114,11 @@ class ISO8601Point(PointBase):
             return cmp(self.TYPE_SORT_KEY, other.TYPE_SORT_KEY)
         if self.value == other.value:
             return 0
+        epoch = self.epoch
+        other_epoch = other.epoch
+        if epoch != other_epoch:
+            return cmp(epoch, other_epoch)
+        # Same second, but may differ in fractions of a second.
         return self._iso_point_cmp(self.value, other.value)
 
     def standardise(self):
@@ -108,11 +140,36 @@ class ISO8601Point(PointBase):
             return ISO8601Interval(
                 self._iso_point_sub_point(self.value, other.value))
         return ISO8601Point(
-            self._iso_point_sub_interval(self.value, other.value))
+            self._iso_point_sub_interval(self.value, other.value),
+            self._get_epoch_offset(other, -1))
 
     def __hash__(self):
         return hash(self.value)
 
+    def _get_epoch_offset(self, interval, sign):
+        """Return the epoch of self plus sign * interval, if known.
+
+        Return None if the epoch of self is not yet known, or the interval
+        is not an exact number of seconds (e.g. it has years or months).
+        Also return None unless self and the interval are on the dump
+        format's grid (see SuiteSpecifics.DUMP_GRID), as the result is
+        truncated to the precision of the dump format.
+
+        """
+        if self._epoch is None:
+            return None
+        seconds = _interval_seconds(interval.value, CALENDAR.mode)
+        if seconds is None:
+            return None
+        grid, grid_epoch = SuiteSpecifics.DUMP_GRID
+        if (
+            grid is None
+            or seconds % grid
+            or (self._epoch - grid_epoch) % grid
+        ):
+            return None
+        return self._epoch + sign * seconds
+
     @staticmethod
     @lru_cache(10000)
     def _iso_point_add(point_string, interval_string):
@@ -581,6 +638,50 @@ class ISO8601Sequence(SequenceBase):
                 return ret
         return None
 
+    def get_points(self, start_point, stop_point=None, limit=None):
+        """Return the points of this sequence in a window.
+
+        See SequenceBase.get_points. For exact intervals on the dump
+        format's grid (see SuiteSpecifics.DUMP_GRID) the recurrence is
+        stepped through without re-parsing each point, and the epoch of
+        each point is counted off too. Otherwise points may be truncated
+        by the dump format, so each step is from the point as written, as
+        in get_next_point_on_sequence.
+        """
+        points = []
+        point = self.get_first_point(start_point)
+        if point is None:
+            return points
+        iso_point = point_parse(point.value)
+        grid = SuiteSpecifics.DUMP_GRID[0]
+        step = _interval_seconds(str(self.recurrence.duration), CALENDAR.mode)
+        if grid is None or step is None or step % grid:
+            step = None
+        while (
+            point is not None
+            and (stop_point is None or point <= stop_point)
+            and (limit is None or len(points) < limit)
+        ):
+            if not self.exclusions or point not in self.exclusions:
+                points.append(point)
+            if step is None:
+                iso_point = point_parse(point.value)
+            iso_point = self.recurrence.get_next(iso_point)
+            if iso_point is None:
+                break
+            epoch = None
+            if step is not None and self.recurrence.format_number != 1:
+                # (Format 1 recurrences may snap to their end point.)
+                epoch = point.epoch + step
+            next_point = ISO8601Point(str(iso_point), epoch)
+            if next_point.value == point.value:
+                raise SequenceDegenerateError(
+                    self.recurrence, SuiteSpecifics.DUMP_FORMAT,
+                    point, next_point
+                )
+            point = next_point
+        return points
+
     def get_start_point(self):
         """Return the first point in this sequence, or None."""
         for recurrence_iso_point in self.recurrence:
@@ -868,6 +969,35 @@ def init(num_expanded_year_digits=0, custom_dump_format=None, time_zone=None,
     SuiteSpecifics.abbrev_util = CylcTimeParser(
         None, None, SuiteSpecifics.iso8601_parsers
     )
+    SuiteSpecifics.DUMP_GRID = _get_dump_grid()
+
+
+def _get_dump_grid():
+    """Return the grid of points which can be written in the dump format.
+
+    Returns:
+        tuple - (grid interval in whole seconds, or None if not known,
+        epoch of a point on the grid)
+
+    """
+    # Dump a point with non-zero hours, minutes and seconds, and see which
+    # are lost when read back in.
+    hours, minutes = SuiteSpecifics.ASSUMED_TIME_ZONE
+    point = TimePoint(
+        year=2000, month_of_year=1, day_of_month=1,
+        hour_of_day=1, minute_of_hour=1, second_of_minute=1,
+        time_zone_hour=hours, time_zone_minute=minutes,
+        expanded_year_digits=SuiteSpecifics.NUM_EXPANDED_YEAR_DIGITS,
+        dump_format=SuiteSpecifics.DUMP_FORMAT)
+    try:
+        point_string = str(point)
+        lost = (point - point_parse(point_string)).get_seconds()
+    except (IsodatetimeError, ValueError):
+        return (None, None)
+    grid = {0: 1, 1: 60, 61: 3600, 3661: 86400}.get(lost)
+    if grid is None:
+        return (None, None)
+    return (grid, _point_epoch(point_string, CALENDAR.mode))
 
 
 def get_dump_format():
@@ -917,6 +1047,36 @@ def _interval_parse(interval_string):
     return SuiteSpecifics.interval_parser.parse(interval_string)
 
 
+@lru_cache(10000)
+def _interval_seconds(interval_string, _):
+    """Return the exact length of an interval in whole seconds, or None.
+
+    The calendar mode (unused) is passed in to key the cache.
+
+    """
+    interval = interval_parse(interval_string)
+    if interval.years or interval.months:
+        return None
+    seconds = interval.get_seconds()
+    if seconds != int(seconds):
+        return None
+    return int(seconds)
+
+
+@lru_cache(10000)
+def _point_epoch(point_string, _):
+    """Return a point_string in whole seconds since the Unix epoch.
+
+    The calendar mode (unused) is passed in to key the cache.
+
+    """
+    days, seconds = (
+        _point_parse(point_string) -
+        TimePoint(**CALENDAR.UNIX_EPOCH_DATE_TIME_REFERENCE_PROPERTIES)
+    ).get_days_and_seconds()
+    return int(CALENDAR.SECONDS_IN_DAY * days) + math.floor(seconds)
+
+
 def point_parse(point_string):
     """Parse a point_string into a proper TimePoint object."""
     return _point_parse(point_string).copy()
@@ -20,6 +20,7 @@
     B605: start_process_with_a_shell
     https://docs.openstack.org/developer/bandit/plugins/start_process_with_a_shell.html
 """
+import asyncio
 from shlex import split
 from subprocess import PIPE, STDOUT, DEVNULL, Popen  # nosec
 
@@ -57,3 +58,20 @@ def procopen(cmd, bufsize=0, executable=None, stdin=None, stdout=None,
                     universal_newlines, startupinfo, creationflags)
 
     return process
+
+
+async def async_procopen(cmd, stdin=None, stdout=None, stderr=None,
+                         preexec_fn=None, usesh=False, env=None):
+    """Launch a command as an asyncio subprocess.
+
+    Arguments as for procopen. Return an asyncio.subprocess.Process.
+
+    """
+    if usesh:
+        # As for Popen(shell=True).
+        if isinstance(cmd, str):
+            cmd = [cmd]
+        cmd = ['/bin/sh', '-c'] + list(cmd)
+    return await asyncio.create_subprocess_exec(  # nosec
+        *cmd, stdin=stdin, stdout=stdout, stderr=stderr,
+        preexec_fn=preexec_fn, env=env)
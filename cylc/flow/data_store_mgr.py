@@ -78,7 +78,10 @@ from cylc.flow.task_state import (
     TASK_STATUS_SUBMIT_FAILED, TASK_STATUS_RUNNING, TASK_STATUS_SUCCEEDED,
     TASK_STATUS_FAILED, TASK_STATUS_EXPIRED)
 from cylc.flow.task_state_prop import extract_group_state
-from cylc.flow.taskdef import generate_graph_parents
+from cylc.flow.taskdef import (
+    generate_graph_children,
+    generate_graph_parents
+)
 from cylc.flow.task_state import TASK_STATUSES_FINAL
 from cylc.flow.wallclock import (
     TIME_ZONE_LOCAL_INFO,
@@ -200,9 +203,52 @@ def parse_job_item(item):
 
 
 def generate_checksum(in_strings):
-    """Generate cross platform & python checksum from strings."""
+    """Generate cross platform & python checksum from strings.
+
+    The checksum is independent of the order of the strings, it is the sum of
+    the checksums of the individual strings, so it can be kept up to date as
+    strings are added and removed (see update_checksum).
+
+    """
     # can't use hash(), it's not the same across 32-64bit or python invocations
-    return zlib.adler32(''.join(sorted(in_strings)).encode()) & 0xffffffff
+    return sum(zlib.adler32(s.encode()) for s in in_strings) & 0xffffffff
+
+
+def update_checksum(checksum, old_strings, new_strings):
+    """Update a checksum from generate_checksum for changed strings.
+
+    Args:
+        checksum (int): checksum of the current strings.
+        old_strings (list): strings to remove.
+        new_strings (list): strings to add.
+
+    Return (int):
+        The checksum, as generate_checksum would return for the new strings.
+
+    """
+    return (
+        checksum
+        - sum(zlib.adler32(s.encode()) for s in old_strings)
+        + sum(zlib.adler32(s.encode()) for s in new_strings)
+    ) & 0xffffffff
+
+
+def encode_varint(value):
+    """Encode a non-negative integer as a protobuf varint."""
+    ret = bytearray()
+    while value > 0x7f:
+        ret.append((value & 0x7f) | 0x80)
+        value >>= 7
+    ret.append(value)
+    return bytes(ret)
+
+
+# Protobuf wire format key of each (embedded message) field of AllDeltas:
+# (field number << 3) | 2 (length-delimited), as a varint.
+ALL_DELTAS_FIELD_KEYS = {
+    field.name: encode_varint((field.number << 3) | 2)
+    for field in AllDeltas.DESCRIPTOR.fields
+}
 
 
 def task_mean_elapsed_time(tdef):
@@ -336,6 +382,38 @@ def create_delta_store(delta=None, workflow_id=None):
     return delta_store
 
 
+class GhostTask:
+    """A lightweight task proxy stand-in for graph window nodes.
+
+    Walking the graph window only needs the task definition and cycle point
+    of nodes outside the task pool. A full TaskProxy is only created (see
+    get_task_proxy) if the node is new to the data-store.
+
+    """
+
+    __slots__ = ['tdef', 'point', 'flow_label', 'reflow', '_itask']
+
+    def __init__(self, tdef, point, flow_label, reflow):
+        self.tdef = tdef
+        self.point = point
+        self.flow_label = flow_label
+        self.reflow = reflow
+        self._itask = None
+
+    @property
+    def graph_children(self):
+        """Return graph children, as TaskProxy.graph_children."""
+        return generate_graph_children(self.tdef, self.point)
+
+    def get_task_proxy(self):
+        """Return a TaskProxy for this node."""
+        if self._itask is None:
+            self._itask = TaskProxy(
+                self.tdef, self.point, self.flow_label,
+                submit_num=0, reflow=self.reflow)
+        return self._itask
+
+
 class DataStoreMgr:
     """Manage the workflow data store.
 
@@ -364,7 +442,8 @@ class DataStoreMgr:
         .parents (dict):
             Local store of config.get_parent_lists()
         .publish_deltas (list):
-            Collection of the latest applied deltas for publishing.
+            Collection of the latest applied deltas for publishing,
+            as serialised messages by topic.
         .schd (cylc.flow.scheduler.Scheduler):
             Workflow scheduler object.
         .workflow_id (str):
@@ -405,11 +484,25 @@ class DataStoreMgr:
             WORKFLOW: WDeltas(),
         }
         self.delta_queues = {self.workflow_id: {}}
+        # Checksums of the data-store element stamps (or edge IDs) by type,
+        # updated as deltas are applied.
+        self.checksums = {key: 0 for key in self.deltas if key != WORKFLOW}
         self.publish_deltas = []
         self.all_task_pool = set()
         self.n_window_nodes = {}
         self.n_window_edges = {}
         self.n_window_boundary_nodes = {}
+        # Ghost nodes of the graph window being generated, by ID.
+        self.ghost_tasks = {}
+        # Counted state and held status of each task proxy, with the IDs of
+        # the family proxies it counts towards, by task proxy ID.
+        self.task_state_counts = {}
+        # Running state and held totals of the family proxies, by ID, and of
+        # the workflow (i.e. over all root family proxies).
+        self.family_state_totals = {}
+        self.family_held_totals = {}
+        self.workflow_state_totals = Counter()
+        self.workflow_held_total = 0
         self.prune_trigger_nodes = {}
         self.prune_flagged_nodes = set()
         self.prune_pending = False
@@ -598,12 +691,8 @@ class DataStoreMgr:
         """Generate graph window about given origin to n-edge-distance.
 
         Args:
-            name (str):
-                Task name.
-            point (cylc.flow.cycling.PointBase):
-                PointBase derived object.
-            flow_label (str):
-                Flow label used to distinguish multiple runs.
+            itask (cylc.flow.task_proxy.TaskProxy/GhostTask):
+                Origin task proxy, or graph window node.
             edge_distance (int):
                 Graph distance from active/origin node.
             active_id (str):
@@ -682,6 +771,7 @@ class DataStoreMgr:
                 self.prune_trigger_nodes.setdefault(
                     tp_id, set()).add(active_id)
             del self.n_window_boundary_nodes[active_id]
+            self.ghost_tasks.clear()
             if self.n_window_edges[active_id]:
                 getattr(self.updated[WORKFLOW], EDGES).edges.extend(
                     self.n_window_edges[active_id])
@@ -723,12 +813,15 @@ class DataStoreMgr:
                 self.n_window_edges[active_id].add(e_id)
             if t_id in self.n_window_nodes[active_id]:
                 continue
-            self.increment_graph_window(
-                TaskProxy(
+            try:
+                ghost = self.ghost_tasks[t_id]
+            except KeyError:
+                ghost = GhostTask(
                     self.schd.config.get_taskdef(t_name),
-                    t_point, flow_label,
-                    submit_num=0, reflow=reflow),
-                edge_distance, active_id, descendant, is_parent)
+                    t_point, flow_label, reflow)
+                self.ghost_tasks[t_id] = ghost
+            self.increment_graph_window(
+                ghost, edge_distance, active_id, descendant, is_parent)
 
     def remove_pool_node(self, name, point):
         """Remove ID reference and flag isolate node/branch for pruning."""
@@ -755,7 +848,7 @@ class DataStoreMgr:
         Args:
             tp_id (str):
                 data-store task proxy ID.
-            itask (cylc.flow.task_proxy.TaskProxy):
+            itask (cylc.flow.task_proxy.TaskProxy/GhostTask):
                 Update task-node from corresponding task proxy object.
             is_parent (bool):
                 Used to determine whether to load DB state.
@@ -770,6 +863,8 @@ class DataStoreMgr:
         task_proxies = self.data[self.workflow_id][TASK_PROXIES]
         if tp_id in task_proxies or tp_id in self.added[TASK_PROXIES]:
             return
+        if isinstance(itask, GhostTask):
+            itask = itask.get_task_proxy()
 
         # Most the time the definition node will be in the store,
         # so use try/except.
@@ -847,7 +942,8 @@ class DataStoreMgr:
             )
         ).proxies.append(tp_id)
         self.generate_ghost_family(tproxy.first_parent, child_task=tp_id)
-        self.state_update_families.add(tproxy.first_parent)
+        self.task_state_counts[tp_id] = ('', False, tuple(tproxy.ancestors))
+        self.update_state_totals(tp_id, state=tproxy.state)
         self.updates_pending = True
 
     def generate_ghost_family(self, fp_id, child_fam=None, child_task=None):
@@ -1118,6 +1214,8 @@ class DataStoreMgr:
             self.deltas[TASK_PROXIES].pruned.append(tp_id)
             self.deltas[JOBS].pruned.extend(node.jobs)
             self.deltas[EDGES].pruned.extend(node.edges)
+            self.update_state_totals(tp_id, state='', is_held=False)
+            del self.task_state_counts[tp_id]
             parent_ids.add(node.first_parent)
 
         prune_ids = set()
@@ -1128,6 +1226,10 @@ class DataStoreMgr:
                 node_ids, parent_ids, checked_ids, prune_ids)
         if prune_ids:
             self.deltas[FAMILY_PROXIES].pruned.extend(prune_ids)
+            for fp_id in prune_ids:
+                self.family_state_totals.pop(fp_id, None)
+                self.family_held_totals.pop(fp_id, None)
+                self.state_update_families.discard(fp_id)
         if node_ids:
             self.updates_pending = True
 
@@ -1175,103 +1277,87 @@ class DataStoreMgr:
         if fp_id in parent_ids:
             parent_ids.remove(fp_id)
 
-    def update_family_proxies(self):
-        """Update state & summary of flagged families and ancestors.
+    def update_state_totals(self, tp_id, state=None, is_held=None):
+        """Count a change in task proxy state and/or held status.
+
+        The counts of the old state and held status are decremented, and
+        those of the new incremented, in every family proxy up the first
+        parent chain of the task (and in the workflow totals). These
+        families are then flagged for update.
 
-        Tasks whose state are updated flag their first parent, as a family
-        to be updated, by adding their ID to a set.
-        This set is iterated over here until empty, with each members child
-        families checked/updated and first parent added to the set (flagged).
-        Order doesn't matter, as every family will be checked/updated once at
-        most (as an ancestor will-be/has-been added to the set of updated
-        families).
+        Args:
+            tp_id (str):
+                data-store task proxy ID.
+            state (str, optional):
+                New task state, unchanged if None ('' is not counted).
+            is_held (bool, optional):
+                New task held status, unchanged if None.
 
         """
-        self.updated_state_families.clear()
-        while self.state_update_families:
-            self._family_ascent_point_update(
-                next(iter(self.state_update_families)))
+        try:
+            old_state, old_held, fp_ids = self.task_state_counts[tp_id]
+        except KeyError:
+            return
+        if state is None:
+            state = old_state
+        if is_held is None:
+            is_held = old_held
+        if state == old_state and is_held == old_held:
+            return
+        self.task_state_counts[tp_id] = (state, is_held, fp_ids)
+        held_change = int(is_held) - int(old_held)
+        for state_totals in (
+            [self.family_state_totals.setdefault(fp_id, Counter())
+             for fp_id in fp_ids] +
+            [self.workflow_state_totals]
+        ):
+            if old_state:
+                state_totals[old_state] -= 1
+                if not state_totals[old_state]:
+                    del state_totals[old_state]
+            if state:
+                state_totals[state] += 1
+        if held_change:
+            for fp_id in fp_ids:
+                self.family_held_totals[fp_id] = (
+                    self.family_held_totals.get(fp_id, 0) + held_change)
+            self.workflow_held_total += held_change
+        self.state_update_families.update(fp_ids)
 
-    def _family_ascent_point_update(self, fp_id):
-        """Updates the given family and children recursively.
+    def update_family_proxies(self):
+        """Update state & summary of flagged families.
 
-        First the child families that haven't been checked/updated are acted
-        on first by calling this function. This recursion ends at the family
-        first called with this function, which then adds it's first parent
-        ancestor to the set of families flagged for update.
+        Tasks whose state or held status change update the running totals
+        of all their ancestor families (see `update_state_totals`), and flag
+        those families to be updated. Here deltas are created from the
+        totals of the flagged families, without visiting their members.
 
         """
+        self.updated_state_families.clear()
         fp_added = self.added[FAMILY_PROXIES]
         fp_data = self.data[self.workflow_id][FAMILY_PROXIES]
-        if fp_id in fp_data:
-            fam_node = fp_data[fp_id]
-        elif fp_id in fp_added:
-            fam_node = fp_added[fp_id]
-        else:
+        fp_updated = self.updated[FAMILY_PROXIES]
+        for fp_id in self.state_update_families:
+            self.updated_state_families.add(fp_id)
             # TODO: Shouldn't need with event driven updates
             # as nodes will be updated before removal.
-            if fp_id in self.state_update_families:
-                self.updated_state_families.add(fp_id)
-                self.state_update_families.remove(fp_id)
-            return
-        # Gather child families, then check/update recursively
-        child_fam_nodes = [
-            n_id
-            for n_id in fam_node.child_families
-            if n_id not in self.updated_state_families
-        ]
-        for child_fam_id in child_fam_nodes:
-            self._family_ascent_point_update(child_fam_id)
-        if fp_id in self.state_update_families:
-            fp_updated = self.updated[FAMILY_PROXIES]
-            tp_data = self.data[self.workflow_id][TASK_PROXIES]
-            tp_updated = self.updated[TASK_PROXIES]
-            tp_added = self.added[TASK_PROXIES]
-            # gather child family states for count and set is_held
-            state_counter = Counter({})
-            is_held_total = 0
-            for child_id in fam_node.child_families:
-                child_node = fp_updated.get(child_id, fp_data.get(child_id))
-                if child_node is not None:
-                    is_held_total += child_node.is_held_total
-                    state_counter += Counter(dict(child_node.state_totals))
-            # Gather all child task states
-            task_states = []
-            for tp_id in fam_node.child_tasks:
-                tp_delta = tp_updated.get(tp_id)
-                tp_node = tp_added.get(tp_id, tp_data.get(tp_id))
-
-                tp_state = tp_delta
-                if tp_state is None or not tp_state.HasField('state'):
-                    tp_state = tp_node
-                if tp_state.state:
-                    task_states.append(tp_state.state)
-
-                tp_held = tp_delta
-                if tp_held is None or not tp_held.HasField('is_held'):
-                    tp_held = tp_node
-                if tp_held.is_held:
-                    is_held_total += 1
-
-            state_counter += Counter(task_states)
+            if fp_id not in fp_data and fp_id not in fp_added:
+                continue
+            state_totals = self.family_state_totals.get(fp_id, {})
+            is_held_total = self.family_held_totals.get(fp_id, 0)
             # created delta data element
             fp_delta = PbFamilyProxy(
                 id=fp_id,
                 stamp=f'{fp_id}@{time()}',
-                state=extract_group_state(state_counter.keys()),
+                state=extract_group_state(state_totals.keys()),
                 is_held=(is_held_total > 0),
                 is_held_total=is_held_total
             )
-            fp_delta.states[:] = state_counter.keys()
-            for state, state_cnt in state_counter.items():
+            fp_delta.states[:] = state_totals.keys()
+            for state, state_cnt in state_totals.items():
                 fp_delta.state_totals[state] = state_cnt
             fp_updated.setdefault(fp_id, PbFamilyProxy()).MergeFrom(fp_delta)
-            # mark as updated in case parent family is updated next
-            self.updated_state_families.add(fp_id)
-            # mark parent for update
-            if fam_node.first_parent:
-                self.state_update_families.add(fam_node.first_parent)
-            self.state_update_families.remove(fp_id)
+        self.state_update_families.clear()
 
     def set_graph_window_extent(self, n_edge_distance):
         """Set what the max edge distance will change to.
@@ -1295,26 +1381,11 @@ class DataStoreMgr:
         # new updates/deltas not applied yet
         # so need to search/use updated states if available.
         if self.updated_state_families:
-            state_counter = Counter({})
-            is_held_total = 0
-            for root_id in set(
-                    [n.id
-                     for n in data[FAMILY_PROXIES].values()
-                     if n.name == 'root'] +
-                    [n.id
-                     for n in self.added[FAMILY_PROXIES].values()
-                     if n.name == 'root']
-            ):
-                root_node = self.updated[FAMILY_PROXIES].get(
-                    root_id, data.get(root_id))
-                if root_node is not None and root_node.state:
-                    is_held_total += root_node.is_held_total
-                    state_counter += Counter(dict(root_node.state_totals))
-            w_delta.states[:] = state_counter.keys()
-            for state, state_cnt in state_counter.items():
+            w_delta.states[:] = self.workflow_state_totals.keys()
+            for state, state_cnt in self.workflow_state_totals.items():
                 w_delta.state_totals[state] = state_cnt
 
-            w_delta.is_held_total = is_held_total
+            w_delta.is_held_total = self.workflow_held_total
             delta_set = True
 
         # Set status & msg if changed.
@@ -1389,7 +1460,7 @@ class DataStoreMgr:
             tp_id, PbTaskProxy(id=tp_id))
         tp_delta.stamp = f'{tp_id}@{update_time}'
         tp_delta.state = itask.state.status
-        self.state_update_families.add(tproxy.first_parent)
+        self.update_state_totals(tp_id, state=tp_delta.state)
         # if state is final work our new task mean.
         if tp_delta.state in TASK_STATUSES_FINAL:
             elapsed_time = task_mean_elapsed_time(itask.tdef)
@@ -1421,7 +1492,7 @@ class DataStoreMgr:
                 tp_id, PbTaskProxy(id=tp_id))
             tp_delta.stamp = f'{tp_id}@{time()}'
             tp_delta.is_held = itask.state.is_held
-            self.state_update_families.add(tproxy.first_parent)
+            self.update_state_totals(tp_id, is_held=tp_delta.is_held)
             self.updates_pending = True
 
     def delta_task_output(self, itask, message):
@@ -1684,27 +1755,39 @@ class DataStoreMgr:
                     continue
                 self.deltas[key].updated.extend(elements.values())
 
-        # Apply deltas to local data-store
+        # Apply deltas to local data-store, and update checksums
         data = self.data[self.workflow_id]
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.reloaded = reloaded
+                if key not in self.checksums:
+                    apply_delta(key, delta, data)
+                    continue
+                if key == EDGES:
+                    s_att = 'id'
+                else:
+                    s_att = 'stamp'
+                elements = data[key]
+                delta_ids = {e.id for e in delta.added}
+                delta_ids.update(e.id for e in delta.updated)
+                delta_ids.update(delta.pruned)
+                old_strings = [
+                    getattr(elements[e_id], s_att)
+                    for e_id in delta_ids if e_id in elements]
                 apply_delta(key, delta, data)
+                self.checksums[key] = update_checksum(
+                    self.checksums[key],
+                    old_strings,
+                    [getattr(elements[e_id], s_att)
+                     for e_id in delta_ids if e_id in elements])
 
-        # Construct checksum on deltas for export
+        # Add checksum to deltas for export
         update_time = time()
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.time = update_time
-                if hasattr(delta, 'checksum'):
-                    if key == EDGES:
-                        s_att = 'id'
-                    else:
-                        s_att = 'stamp'
-                    delta.checksum = generate_checksum(
-                        [getattr(e, s_att)
-                         for e in data[key].values()]
-                    )
+                if key in self.checksums:
+                    delta.checksum = self.checksums[key]
 
     def clear_deltas(self):
         """Clear current deltas."""
@@ -1740,18 +1823,28 @@ class DataStoreMgr:
         return workflow_msg
 
     def get_publish_deltas(self):
-        """Return deltas for publishing."""
-        all_deltas = DELTAS_MAP[ALL_DELTAS]()
+        """Return deltas for publishing.
+
+        Each delta is serialised once. The ALL_DELTAS message is assembled
+        from the serialised deltas, as the serialisation of a message is the
+        concatenation of its serialised fields.
+
+        Returns:
+            list: [(topic (bytes), serialised message (bytes)), ...]
+
+        """
         result = []
+        all_deltas = []
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                result.append(
-                    (key.encode('utf-8'), delta, 'SerializeToString'))
-                getattr(all_deltas, key).CopyFrom(delta)
-        result.append(
-            (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
-        )
-        return deepcopy(result)
+                delta_bytes = delta.SerializeToString()
+                result.append((key.encode('utf-8'), delta_bytes))
+                all_deltas.extend((
+                    ALL_DELTAS_FIELD_KEYS[key],
+                    encode_varint(len(delta_bytes)),
+                    delta_bytes))
+        result.append((ALL_DELTAS.encode('utf-8'), b''.join(all_deltas)))
+        return result
 
     def get_data_elements(self, element_type):
         """Get elements of a given type in the form of a delta.
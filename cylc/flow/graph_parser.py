@@ -160,19 +160,26 @@ class GraphParser:
         )                                     #
         ''', re.X)
 
-    def __init__(self, family_map=None, parameters=None):
+    def __init__(self, family_map=None, parameters=None, callback=None):
         """Initializing the graph string parser.
 
         family_map (empty or None if no families) is:
             {family_name: [task member names]}
         parameters (empty or None if no parameters) is just passed on to the
         parameter expander classes (documented there).
+        callback (None for results in self.triggers and self.original) is:
+            callback(task_name, expression, [expr_task_names], suicide,
+                     original_expression)
+        for each distinct task_name and expression, called as soon as the
+        trigger is parsed.
         """
         self.family_map = family_map or {}
         self.parameters = parameters
+        self.callback = callback
         self.triggers = {}
         self.original = {}
         self.suite_state_polling_tasks = {}
+        self._done_triggers = set()
 
     def parse_graph(self, graph_string):
         """Parse the graph string for a single graph section.
@@ -186,11 +193,64 @@ class GraphParser:
            4. Split and process by pairs "left-expression => right-node":
               i. Replace families with members (any or all semantics).
              ii. Record parsed dependency information for each right-side node.
+
+        This is done line by line, in a single pass: each line goes through
+        every step, and its triggers are recorded (or passed to the callback)
+        before the next line is read. Nothing is held for the whole graph
+        except the distinct triggers.
+        """
+        graph_expander = GraphExpander(self.parameters)
+        # Parameterization can duplicate auto-triggered nodes many times.
+        lone_nodes = set()
+        for line in self._iter_full_lines(graph_string):
+            # Expand parameterized lines (or detect undefined parameters).
+            if self.__class__.REC_PARAMS.search(line):
+                lines = graph_expander.iter_expand(line)
+            else:
+                lines = [line]
+            # Process chains of dependencies as pairs: left => right.
+            for line_ in lines:
+                for left, right in self._iter_dep_pairs(line_):
+                    if left is None:
+                        if right in lone_nodes:
+                            continue
+                        lone_nodes.add(right)
+                    self._proc_dep_pair(left, right)
+
+    def _iter_full_lines(self, graph_string):
+        """Yield the checked graph lines, with incomplete lines joined.
+
+        Comments and whitespace are stripped, blank lines are skipped, and
+        lines beginning or ending with an arrow are joined.
         """
-        # Strip comments, whitespace, and blank lines.
-        non_blank_lines = []
-        bad_lines = []
-        for line in graph_string.split('\n'):
+        part_lines = []
+        for line in self._iter_non_blank_lines(graph_string):
+            if not part_lines:
+                # First line can't start with an arrow.
+                if line.startswith(ARROW):
+                    raise GraphParseError(
+                        "leading arrow: %s" % line)
+            elif not (part_lines[-1].endswith(ARROW) or
+                      line.startswith(ARROW)):
+                yield self._proc_full_line(''.join(part_lines))
+                part_lines = []
+            part_lines.append(line)
+        if part_lines:
+            if part_lines[-1].endswith(ARROW):
+                # Last line can't end with an arrow.
+                raise GraphParseError(
+                    "trailing arrow: %s" % part_lines[-1])
+            yield self._proc_full_line(''.join(part_lines))
+
+    def _iter_non_blank_lines(self, graph_string):
+        """Yield graph lines with comments and whitespace stripped."""
+        start = 0
+        while start <= len(graph_string):
+            end = graph_string.find('\n', start)
+            if end == -1:
+                end = len(graph_string)
+            line = graph_string[start:end]
+            start = end + 1
             modified_line = self.__class__.REC_COMMENT.sub('', line)
 
             # Ignore empty lines
@@ -200,125 +260,86 @@ class GraphParser:
             # Catch simple bad lines that would be accepted once
             # spaces are removed, e.g. 'foo bar => baz'
             if self.REC_GRAPH_BAD_SPACES_LINE.search(modified_line):
-                bad_lines.append(line)
-                continue
+                self._report_invalid_lines([line])
 
             # Apparently this is the fastest way to strip all whitespace!:
-            modified_line = "".join(modified_line.split())
-            non_blank_lines.append(modified_line)
+            yield "".join(modified_line.split())
 
-        # Check if there were problem lines and abort
-        if bad_lines:
-            self._report_invalid_lines(bad_lines)
+    def _proc_full_line(self, full_line):
+        """Check a full graph line and extract inter-suite triggers from it.
 
-        # Join incomplete lines (beginning or ending with an arrow).
-        full_lines = []
-        part_lines = []
-        for i, _ in enumerate(non_blank_lines):
-            this_line = non_blank_lines[i]
-            if i == 0:
-                # First line can't start with an arrow.
-                if this_line.startswith(ARROW):
-                    raise GraphParseError(
-                        "leading arrow: %s" % this_line)
-            try:
-                next_line = non_blank_lines[i + 1]
-            except IndexError:
-                next_line = ''
-                if this_line.endswith(ARROW):
-                    # Last line can't end with an arrow.
-                    raise GraphParseError(
-                        "trailing arrow: %s" % this_line)
-            part_lines.append(this_line)
-            if (this_line.endswith(ARROW) or next_line.startswith(ARROW)):
-                continue
-            full_line = ''.join(part_lines)
-
-            # Record inter-suite dependence and remove the marker notation.
-            # ("foo<SUITE::TASK:fail> => bar" becomes:fail "foo => bar").
-            repl = Replacement('\\1')
-            full_line = self.__class__.REC_SUITE_STATE.sub(repl, full_line)
-            for item in repl.match_groups:
-                l_task, r_all, r_suite, r_task, r_status = item
-                if r_status:
-                    r_status = r_status[1:]
-                else:
-                    r_status = self.__class__.TRIG_SUCCEED[1:]
-                self.suite_state_polling_tasks[l_task] = (
-                    r_suite, r_task, r_status, r_all)
-            full_lines.append(full_line)
-            part_lines = []
+        Return the line with inter-suite trigger notation removed.
+        """
+        # Record inter-suite dependence and remove the marker notation.
+        # ("foo<SUITE::TASK:fail> => bar" becomes:fail "foo => bar").
+        repl = Replacement('\\1')
+        full_line = self.__class__.REC_SUITE_STATE.sub(repl, full_line)
+        for item in repl.match_groups:
+            l_task, r_all, r_suite, r_task, r_status = item
+            if r_status:
+                r_status = r_status[1:]
+            else:
+                r_status = self.__class__.TRIG_SUCCEED[1:]
+            self.suite_state_polling_tasks[l_task] = (
+                r_suite, r_task, r_status, r_all)
 
         # Check for double-char conditional operators (a common mistake),
         # and bad node syntax (order of qualifiers).
-        bad_lines = []
-        for line in full_lines:
-            if self.__class__.OP_AND_ERR in line:
-                raise GraphParseError(
-                    "the graph AND operator is '%s': %s" % (
-                        self.__class__.OP_AND, line))
-            if self.__class__.OP_OR_ERR in line:
-                raise GraphParseError(
-                    "the graph OR operator is '%s': %s" % (
-                        self.__class__.OP_OR, line))
-            # Check node syntax. First drop all non-node characters.
-            node_str = line
-            for s in ['=>', '|', '&', '(', ')', '!']:
-                node_str = node_str.replace(s, ' ')
-            # Drop all valid @triggers, longest first to avoid sub-strings.
-            nodes = self.__class__.REC_ACTION.findall(node_str)
-            nodes.sort(key=len, reverse=True)
-            for node in nodes:
-                node_str = node_str.replace(node, '')
-            # Then drop all valid nodes, longest first to avoid sub-strings.
-            bad_lines = [node_str for node in node_str.split()
-                         if self.__class__.REC_NODE_FULL.sub('', node, 1)]
+        if self.__class__.OP_AND_ERR in full_line:
+            raise GraphParseError(
+                "the graph AND operator is '%s': %s" % (
+                    self.__class__.OP_AND, full_line))
+        if self.__class__.OP_OR_ERR in full_line:
+            raise GraphParseError(
+                "the graph OR operator is '%s': %s" % (
+                    self.__class__.OP_OR, full_line))
+        # Check node syntax. First drop all non-node characters.
+        node_str = full_line
+        for s in ['=>', '|', '&', '(', ')', '!']:
+            node_str = node_str.replace(s, ' ')
+        # Drop all valid @triggers, longest first to avoid sub-strings.
+        nodes = self.__class__.REC_ACTION.findall(node_str)
+        nodes.sort(key=len, reverse=True)
+        for node in nodes:
+            node_str = node_str.replace(node, '')
+        # Then drop all valid nodes, longest first to avoid sub-strings.
+        bad_lines = [node_str for node in node_str.split()
+                     if self.__class__.REC_NODE_FULL.sub('', node, 1)]
         if bad_lines:
             self._report_invalid_lines(bad_lines)
+        return full_line
 
-        # Expand parameterized lines (or detect undefined parameters).
-        line_set = set()
-        graph_expander = GraphExpander(self.parameters)
-        for line in full_lines:
-            if not self.__class__.REC_PARAMS.search(line):
-                line_set.add(line)
-                continue
-            for line_ in graph_expander.expand(line):
-                line_set.add(line_)
-
-        # Process chains of dependencies as pairs: left => right.
-        # Parameterization can duplicate some dependencies, so use a set.
-        pairs = set()
-        for line in line_set:
-            chain = []
-            # "foo => bar => baz" becomes [foo, bar, baz]
-            # "foo => bar_-32768 => baz" becomes [foo]
-            # "foo_-32768 => bar" becomes []
-            for node in line.split(ARROW):
-                # This can happen, e.g. "foo => => bar" produces
-                # "foo, '', bar", so we add so that later it raises
-                # an error
-                if node == '':
-                    chain.append(node)
-                    continue
-                node = self.REC_NODE_OUT_OF_RANGE.sub('', node)
-                if node == '':
-                    # For "foo => bar<err> => baz", stop at "bar<err>"
-                    break
-                else:
-                    chain.append(node)
+    def _iter_dep_pairs(self, line):
+        """Yield the dependency pairs (left, right) of a graph line.
 
-            # Auto-trigger lone nodes and initial nodes in a chain.
-            if not chain:
+        Initial nodes in a chain (and lone nodes) have a left of None.
+        """
+        chain = []
+        # "foo => bar => baz" becomes [foo, bar, baz]
+        # "foo => bar_-32768 => baz" becomes [foo]
+        # "foo_-32768 => bar" becomes []
+        for node in line.split(ARROW):
+            # This can happen, e.g. "foo => => bar" produces
+            # "foo, '', bar", so we add so that later it raises
+            # an error
+            if node == '':
+                chain.append(node)
                 continue
-            for name, offset, _ in self.__class__.REC_NODES.findall(chain[0]):
-                if not offset and not name.startswith('@'):
-                    pairs.add((None, name))
-            for i in range(0, len(chain) - 1):
-                pairs.add((chain[i], chain[i + 1]))
+            node = self.REC_NODE_OUT_OF_RANGE.sub('', node)
+            if node == '':
+                # For "foo => bar<err> => baz", stop at "bar<err>"
+                break
+            else:
+                chain.append(node)
 
-        for pair in pairs:
-            self._proc_dep_pair(pair[0], pair[1])
+        # Auto-trigger lone nodes and initial nodes in a chain.
+        if not chain:
+            return
+        for name, offset, _ in self.__class__.REC_NODES.findall(chain[0]):
+            if not offset and not name.startswith('@'):
+                yield (None, name)
+        for i in range(0, len(chain) - 1):
+            yield (chain[i], chain[i + 1])
 
     @classmethod
     def _report_invalid_lines(cls, lines):
@@ -414,6 +435,11 @@ class GraphParser:
                 if not trig and not name.startswith('@'):
                     # (Avoiding @trigger nodes.)
                     trig = self.__class__.TRIG_SUCCEED
+                    if expr == name + offset:
+                        # Lone node, no need to compile a regex for it.
+                        expr += trig
+                        n_info.append((name, offset, trig))
+                        continue
                     if offset:
                         this = r'\b%s\b%s(?!:)' % (
                             re.escape(name), re.escape(offset))
@@ -506,7 +532,11 @@ class GraphParser:
             else:
                 members = [right]
             for member in members:
-                self.triggers.setdefault(member, {})
-                self.original.setdefault(member, {})
-                self.triggers[member][expr] = (trigs, suicide)
-                self.original[member][expr] = orig_expr
+                if self.callback is None:
+                    self.triggers.setdefault(member, {})
+                    self.original.setdefault(member, {})
+                    self.triggers[member][expr] = (trigs, suicide)
+                    self.original[member][expr] = orig_expr
+                elif (member, expr) not in self._done_triggers:
+                    self._done_triggers.add((member, expr))
+                    self.callback(member, expr, trigs, suicide, orig_expr)
@@ -15,6 +15,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Write task job files."""
 
+from collections import deque
+from hashlib import sha256
+from io import StringIO
 import os
 import re
 import stat
@@ -34,17 +37,200 @@ class JobFileWriter:
 
     """Write task job files."""
 
+    # Job config items which vary from job to job, but are always written
+    # in forms which cannot change the syntax of the job script. These are
+    # only written in the sections which are not cached in templates.
+    PER_JOB_ITEMS = frozenset([
+        'dependencies', 'execution_time_limit', 'flow_label', 'job_d',
+        'job_file_path', 'namespace_hierarchy', 'submit_num', 'task_id',
+        'try_num'])
+
+    # Maximum number of cached job script templates.
+    MAX_TEMPLATES = 1000
+
+    # Maximum number of concurrent job script syntax checks.
+    MAX_SYNTAX_CHECKS = 2 * (os.cpu_count() or 1)
+
     def __init__(self):
         self.suite_env = {}
         self.job_runner_mgr = JobRunnerManager()
+        # Template keys of job scripts which passed the syntax check.
+        self.syntax_ok_keys = set()
+        # {template key: (run_d, pre-rendered sections...), ...}
+        self.templates = {}
 
     def set_suite_env(self, suite_env):
         """Configure suite environment for all job files."""
         self.suite_env.clear()
         self.suite_env.update(suite_env)
+        self.syntax_ok_keys.clear()
+        self.templates.clear()
 
     def write(self, local_job_file_path, job_conf, check_syntax=True):
         """Write each job script section in turn."""
+        exc = self.write_jobs(
+            [(local_job_file_path, job_conf)], check_syntax)[0]
+        if exc is not None:
+            raise exc
+
+    def write_jobs(self, jobs, check_syntax=True):
+        """Write job files, checking their syntax as a batch.
+
+        Only one job script is checked for each template key (see
+        get_template_key) not already known to be good. These are checked
+        concurrently.
+
+        Args:
+            jobs (list):
+                [(local_job_file_path, job_conf), ...]
+            check_syntax (bool):
+                Check job script syntax with "bash -n".
+
+        Returns:
+            list - The exception raised for each job, or None for each job
+            file written successfully.
+
+        """
+        errors = []
+        env_key = self.get_env_key()
+        keys = []
+        tmp_names = []
+        for local_job_file_path, job_conf in jobs:
+            tmp_name = os.path.expandvars(local_job_file_path + '.tmp')
+            tmp_names.append(tmp_name)
+            key = self.get_template_key(job_conf, env_key)
+            keys.append(key)
+            try:
+                self._write_tmp(tmp_name, job_conf, key)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        if check_syntax:
+            # {template key: [job index, ...]}
+            to_check = {}
+            for i, key in enumerate(keys):
+                if errors[i] is None and key not in self.syntax_ok_keys:
+                    to_check.setdefault(key, []).append(i)
+            for key, exc in self._check_syntax(
+                {key: tmp_names[indices[0]]
+                 for key, indices in to_check.items()}
+            ).items():
+                if exc is None:
+                    self.syntax_ok_keys.add(key)
+                    continue
+                errors[to_check[key][0]] = exc
+                # Bad syntax (rare): check the rest individually, so each
+                # job has its own error message.
+                for i, exc in self._check_syntax(
+                    {i: tmp_names[i] for i in to_check[key][1:]}
+                ).items():
+                    errors[i] = exc
+        for (local_job_file_path, _), tmp_name, exc in zip(
+                jobs, tmp_names, errors):
+            if exc is None:
+                # Make job file executable
+                mode = (
+                    os.stat(tmp_name).st_mode |
+                    stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                os.chmod(tmp_name, mode)
+                os.rename(tmp_name, os.path.expandvars(local_job_file_path))
+        return errors
+
+    def get_template_key(self, job_conf, env_key=None):
+        """Return a key for the template of the job script of job_conf.
+
+        Job scripts with the same key differ only in per-job values (task
+        ID, submit number, etc.). This covers the task runtime config
+        (including any broadcast overrides) and the platform, so the other
+        sections can be rendered once for each key, and only one of these
+        job scripts needs its syntax checked.
+
+        Args:
+            job_conf (dict):
+                The job config.
+            env_key (str):
+                The result of get_env_key, if already known.
+
+        """
+        if env_key is None:
+            env_key = self.get_env_key()
+        return sha256(repr((
+            env_key,
+            # Platforms are identified by name in the global config, which
+            # does not change under a running suite.
+            job_conf['platform']['name'],
+            job_conf['platform'].get('group'),
+            sorted(
+                (key, value) for key, value in job_conf.items()
+                if key != 'platform' and key not in self.PER_JOB_ITEMS),
+        )).encode()).hexdigest()
+
+    def get_env_key(self):
+        """Return a key for the environment which job scripts are written
+        in, for get_template_key."""
+        return sha256(repr((
+            sorted(self.suite_env.items()),
+            sorted(os.environ.items()),
+            cylc.flow.flags.debug,
+        )).encode()).hexdigest()
+
+    @classmethod
+    def _check_syntax(cls, tmp_names):
+        """Check the syntax of job scripts with "bash -n", concurrently.
+
+        At most MAX_SYNTAX_CHECKS checks are run at a time.
+
+        Args:
+            tmp_names (dict):
+                {key: job script path, ...}
+
+        Returns:
+            dict - {key: exception, or None if the syntax is good, ...}
+
+        """
+        procs = deque()
+        results = {}
+        for key, tmp_name in tmp_names.items():
+            if len(procs) >= cls.MAX_SYNTAX_CHECKS:
+                cls._check_syntax_result(results, *procs.popleft())
+            try:
+                procs.append((key, Popen(
+                    ['/usr/bin/env', 'bash', '-n', tmp_name],
+                    stderr=PIPE, stdin=DEVNULL)))
+            except OSError as exc:
+                # Popen has a bad habit of not telling you anything if it fails
+                # to run the executable.
+                if exc.filename is None:
+                    exc.filename = 'bash'
+                # Remove temporary file
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                results[key] = exc
+        while procs:
+            cls._check_syntax_result(results, *procs.popleft())
+        return results
+
+    @staticmethod
+    def _check_syntax_result(results, key, proc):
+        """Wait for a job script syntax check, and add its result."""
+        with proc:
+            err = proc.communicate()[1]
+        if proc.returncode:
+            # This will leave behind the temporary file,
+            # which is useful for debugging syntax errors, etc.
+            results[key] = RuntimeError(err.decode())
+        else:
+            results[key] = None
+
+    def _write_tmp(self, tmp_name, job_conf, key):
+        """Write each job script section in turn, to tmp_name.
+
+        Sections which do not depend on per-job values are rendered once
+        for each template key, see _get_template.
+        """
 
         # ########### !!!!!!!! WARNING !!!!!!!!!!! #####################
         # BE EXTREMELY WARY OF CHANGING THE ORDER OF JOB SCRIPT SECTIONS
@@ -53,26 +239,14 @@ class JobFileWriter:
         # task runtime environment setup).
         # ##############################################################
 
-        # Access to cylc must be configured before user environment so
-        # that cylc commands can be used in defining user environment
-        # variables: NEXT_CYCLE=$( cylc cycle-point --offset-hours=6 )
-        platform = job_conf['platform']
-        tmp_name = os.path.expandvars(local_job_file_path + '.tmp')
-        run_d = get_remote_suite_run_dir(platform, job_conf['suite_name'])
+        run_d, cylc_env, user_env = self._get_template(key, job_conf)
         try:
             with open(tmp_name, 'w') as handle:
                 self._write_header(handle, job_conf)
                 self._write_directives(handle, job_conf)
-                self._write_reinvocation(handle)
-                self._write_prelude(handle, job_conf)
-                self._write_suite_environment(handle, job_conf, run_d)
+                handle.write(cylc_env)
                 self._write_task_environment(handle, job_conf)
-                self._write_global_init_script(handle, job_conf)
-                # suite bin access must be before runtime environment
-                # because suite bin commands may be used in variable
-                # assignment expressions: FOO=$(command args).
-                self._write_runtime_environment(handle, job_conf)
-                self._write_script(handle, job_conf)
+                handle.write(user_env)
                 self._write_epilogue(handle, job_conf, run_d)
         except IOError as exc:
             # Remove temporary file
@@ -81,33 +255,41 @@ class JobFileWriter:
             except OSError:
                 pass
             raise exc
-        # check syntax
-        if check_syntax:
-            try:
-                with Popen(
-                        ['/usr/bin/env', 'bash', '-n', tmp_name],
-                        stderr=PIPE, stdin=DEVNULL) as proc:
-                    if proc.wait():
-                        # This will leave behind the temporary file,
-                        # which is useful for debugging syntax errors, etc.
-                        raise RuntimeError(proc.communicate()[1].decode())
-            except OSError as exc:
-                # Popen has a bad habit of not telling you anything if it fails
-                # to run the executable.
-                if exc.filename is None:
-                    exc.filename = 'bash'
-                # Remove temporary file
-                try:
-                    os.unlink(tmp_name)
-                except OSError:
-                    pass
-                raise exc
-        # Make job file executable
-        mode = (
-            os.stat(tmp_name).st_mode |
-            stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-        os.chmod(tmp_name, mode)
-        os.rename(tmp_name, os.path.expandvars(local_job_file_path))
+
+    def _get_template(self, key, job_conf):
+        """Return the pre-rendered sections of a job script.
+
+        Returns:
+            tuple - (run_d, text before task environment,
+            text after task environment)
+
+        """
+        try:
+            return self.templates[key]
+        except KeyError:
+            pass
+        # Access to cylc must be configured before user environment so
+        # that cylc commands can be used in defining user environment
+        # variables: NEXT_CYCLE=$( cylc cycle-point --offset-hours=6 )
+        platform = job_conf['platform']
+        run_d = get_remote_suite_run_dir(platform, job_conf['suite_name'])
+        with StringIO() as handle:
+            self._write_reinvocation(handle)
+            self._write_prelude(handle, job_conf)
+            self._write_suite_environment(handle, job_conf, run_d)
+            cylc_env = handle.getvalue()
+        with StringIO() as handle:
+            self._write_global_init_script(handle, job_conf)
+            # suite bin access must be before runtime environment
+            # because suite bin commands may be used in variable
+            # assignment expressions: FOO=$(command args).
+            self._write_runtime_environment(handle, job_conf)
+            self._write_script(handle, job_conf)
+            user_env = handle.getvalue()
+        if len(self.templates) >= self.MAX_TEMPLATES:
+            self.templates.clear()
+        self.templates[key] = (run_d, cylc_env, user_env)
+        return self.templates[key]
 
     @staticmethod
     def _check_script_value(value):
@@ -119,6 +119,8 @@ import shlex
 import stat
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from shutil import rmtree
 from signal import SIGKILL
 from subprocess import DEVNULL  # nosec
@@ -349,13 +351,14 @@ class JobRunnerManager():
                 ctx.get_summary_str()))
 
     def jobs_submit(self, job_log_root, job_log_dirs, remote_mode=False,
-                    utc_mode=False):
+                    utc_mode=False, max_parallel=1):
         """Submit multiple jobs.
 
         job_log_root -- The log/job/ sub-directory of the suite.
         job_log_dirs -- A list containing point/name/submit_num for task jobs.
         remote_mode -- am I running on the remote job host?
         utc_mode -- is the suite running in UTC mode?
+        max_parallel -- maximum number of jobs to submit at the same time.
 
         """
         if "$" in job_log_root:
@@ -366,23 +369,45 @@ class JobRunnerManager():
         else:
             items = self._jobs_submit_prep_by_args(job_log_root, job_log_dirs)
         now = get_current_time_string(override_use_utc=utc_mode)
-        for job_log_dir, job_runner_name, submit_opts in items:
-            job_file_path = os.path.join(
-                job_log_root, job_log_dir, JOB_LOG_JOB)
-            if not job_runner_name:
-                sys.stdout.write("%s%s|%s|1|\n" % (
-                    self.OUT_PREFIX_SUMMARY, now, job_log_dir))
-                continue
-            ret_code, out, err, job_id = self._job_submit_impl(
+        submit = partial(self._jobs_submit_item, job_log_root)
+        if max_parallel > 1 and len(items) > 1:
+            # Job submit commands mostly wait on the job runner, so can be
+            # run in threads. Results are reported in the original order.
+            with ThreadPoolExecutor(max_parallel) as executor:
+                self._jobs_submit_report(now, executor.map(submit, items))
+        else:
+            self._jobs_submit_report(now, map(submit, items))
+
+    def _jobs_submit_item(self, job_log_root, item):
+        """Helper for self.jobs_submit(), submit a job.
+
+        Return (job_log_dir, ret_code, out, err, job_id).
+
+        Errors are returned rather than raised, so that the results of all
+        the jobs are reported.
+
+        """
+        job_log_dir, job_runner_name, submit_opts = item
+        if not job_runner_name:
+            return job_log_dir, 1, None, None, ''
+        job_file_path = os.path.join(job_log_root, job_log_dir, JOB_LOG_JOB)
+        try:
+            return (job_log_dir,) + self._job_submit_impl(
                 job_file_path, job_runner_name, submit_opts)
+        except Exception:
+            return job_log_dir, 1, None, traceback.format_exc(), ''
+
+    def _jobs_submit_report(self, now, results):
+        """Helper for self.jobs_submit(), write results to STDOUT."""
+        for job_log_dir, ret_code, out, err, job_id in results:
             sys.stdout.write("%s%s|%s|%d|%s\n" % (
                 self.OUT_PREFIX_SUMMARY, now, job_log_dir, ret_code, job_id))
             for key, value in [("STDERR", err), ("STDOUT", out)]:
                 if value is None or not value.strip():
                     continue
+                if not value.endswith("\n"):
+                    value += "\n"
                 for line in value.splitlines(True):
-                    if not value.endswith("\n"):
-                        value += "\n"
                     sys.stdout.write("%s%s|%s|[%s] %s" % (
                         self.OUT_PREFIX_COMMAND, now, job_log_dir, key, line))
 
@@ -648,7 +673,8 @@ class JobRunnerManager():
         if not self.clean_env:
             # Pass the whole environment to the job submit subprocess.
             # (Note this runs on the job host).
-            env = os.environ
+            # (Copied, as jobs may be submitted concurrently.)
+            env = dict(os.environ)
         else:
             # $HOME is required by job.sh on the job host.
             env = {'HOME': os.environ.get('HOME', '')}
@@ -93,7 +93,10 @@ class WorkflowPublisher(ZMQSocketBase):
         """Publish topics.
 
         Args:
-            items (iterable): [(topic, data, serializer)]
+            items (iterable): [(topic (bytes), data (bytes)), ...]
+                Data is serialised already, e.g. see
+                DataStoreMgr.get_publish_deltas. (A serializer may be
+                given as a third item, see send_multi.)
 
         """
         try:
@@ -298,7 +298,14 @@ class GraphExpander:
         (Here the offset node must be the first in a line, and if m-1 evaluates
         to less than 0 the node will be removed to leave just "sim<m,n>").
         """
-        line_set = set()
+        return set(self.iter_expand(line))
+
+    def iter_expand(self, line):
+        """Generate the expanded lines of a graph line, one at a time.
+
+        As for "expand", but lines are generated (possibly with repeats) as
+        they are expanded, so a large expansion is never held in memory.
+        """
         used_pnames = []
         for p_group in set(REC_P_GROUP.findall(line)):
             for item in p_group.split(','):
@@ -321,16 +328,18 @@ class GraphExpander:
                 if pname not in used_pnames:
                     used_pnames.append(pname)
         used_params = [(p, self.param_cfg[p]) for p in used_pnames]
-        self._expand_graph(line, dict(used_params), used_params, line_set)
-        return line_set
+        # Map parameter values to their indices, for offset look-ups.
+        all_params = {
+            pname: (plist, {val: idx for idx, val in enumerate(plist)})
+            for pname, plist in used_params}
+        yield from self._expand_graph(line, all_params, used_params)
 
-    def _expand_graph(self, line, all_params,
-                      param_list, line_set, values=None):
-        """Expand line into line_set for any number of parameters.
+    def _expand_graph(self, line, all_params, param_list, values=None):
+        """Generate expanded lines for any number of parameters.
 
         line is a graph string line as described above in the calling method.
+        all_params is {name: (values, {value: index})} for each parameter.
         param_list is a list of tuples (name, max-val) for each parameter.
-        results is a set to hold each expanded line.
         """
         if values is None:
             values = {}
@@ -353,8 +362,8 @@ class GraphExpander:
                             param_values[pname] = offs[1:]
                     else:
                         # Index offset.
-                        plist = all_params[pname]
-                        cur_idx = plist.index(values[pname])
+                        plist, indices = all_params[pname]
+                        cur_idx = indices[values[pname]]
                         off_idx = cur_idx + int(offs)
                         if 0 <= off_idx < len(plist):
                             offval = plist[off_idx]
@@ -370,10 +379,10 @@ class GraphExpander:
                                            'defined.' % str(exc.args[0]))
                 line = line.replace('<' + p_group + '>', repl)
             if line:
-                line_set.add(line)
+                yield line
         else:
             # Recurse through index ranges.
             for param_val in param_list[0][1]:
                 values[param_list[0][0]] = param_val
-                self._expand_graph(line, all_params,
-                                   param_list[1:], line_set, values)
+                yield from self._expand_graph(
+                    line, all_params, param_list[1:], values)
@@ -34,12 +34,13 @@ class ParsecConfig:
     """Object wrapper for parsec functions."""
 
     def __init__(self, spec, upgrader=None, output_fname=None, tvars=None,
-                 validator=None):
+                 validator=None, cache_dir=None):
         self.sparse = OrderedDictWithDefaults()
         self.dense = OrderedDictWithDefaults()
         self.upgrader = upgrader
         self.tvars = tvars
         self.output_fname = output_fname
+        self.cache_dir = cache_dir
         self.spec = spec
         if validator is None:
             validator = parsec_validate
@@ -50,7 +51,8 @@ class ParsecConfig:
         validate it against the spec, and if this is not the first load,
         combine/override with the existing loaded config."""
 
-        sparse = parse(rcfile, self.output_fname, self.tvars)
+        sparse = parse(
+            rcfile, self.output_fname, self.tvars, self.cache_dir)
 
         if self.upgrader is not None:
             self.upgrader(sparse, title)
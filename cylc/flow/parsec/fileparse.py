@@ -30,7 +30,10 @@ parsec config file parsing:
       value type is known).
 """
 
+from collections.abc import Mapping
+import hashlib
 import os
+import pickle
 import re
 import sys
 
@@ -42,6 +45,7 @@ from cylc.flow import LOG
 from cylc.flow.exceptions import PluginError
 from cylc.flow.parsec.exceptions import FileParseError, ParsecError
 from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
+from cylc.flow.parsec import include
 from cylc.flow.parsec.include import inline
 from cylc.flow.parsec.util import itemstr
 
@@ -61,6 +65,12 @@ _HEADING = re.compile(
     $''',
     re.VERBOSE)
 
+# Suite run directory sub-directories, not part of the suite definition.
+CACHE_SKIP_DIRS = frozenset(['.service', 'log', 'share', 'work'])
+# Prefixes of environment variables used by Cylc and its plugins, which
+# are in the cache key (others are only checked if read by templates).
+CACHE_ENV_PREFIXES = ('CYLC_', 'ROSE_')
+
 _KEY_VALUE = re.compile(
     r'''^
     (\s*)                   # indentation
@@ -272,19 +282,27 @@ def process_plugins(fpath):
     return extra_vars
 
 
-def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
+def _add_lib_python(fdir):
+    """Allow Python modules in lib/python/ (e.g. for use by Jinja2 filters).
+    """
+    suite_lib_python = os.path.join(fdir, "lib", "python")
+    if os.path.isdir(suite_lib_python) and suite_lib_python not in sys.path:
+        sys.path.append(suite_lib_python)
+
+
+def read_and_proc(
+    fpath, template_vars=None, viewcfg=None, asedit=False, environ=None
+):
     """
     Read a cylc parsec config file (at fpath), inline any include files,
     process with Jinja2, and concatenate continuation lines.
     Jinja2 processing must be done before concatenation - it could be
     used to generate continuation lines.
+
+    If set, environ is used instead of os.environ in Jinja2 templates.
     """
     fdir = os.path.dirname(fpath)
-
-    # Allow Python modules in lib/python/ (e.g. for use by Jinja2 filters).
-    suite_lib_python = os.path.join(fdir, "lib", "python")
-    if os.path.isdir(suite_lib_python) and suite_lib_python not in sys.path:
-        sys.path.append(suite_lib_python)
+    _add_lib_python(fdir)
 
     LOG.debug('Reading file %s', fpath)
 
@@ -381,7 +399,7 @@ def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
                 raise ParsecError('Jinja2 Python package must be installed '
                                   'to process file: ' + fpath)
             flines = jinja2process(
-                flines, fdir, template_vars
+                flines, fdir, template_vars, environ
             )
 
     # concatenate continuation lines
@@ -392,16 +410,194 @@ def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
     return [fl.rstrip() for fl in flines]
 
 
-def parse(fpath, output_fname=None, template_vars=None):
-    """Parse file items line-by-line into a corresponding nested dict."""
+class _EnvironReads(Mapping):
+    """A read-only view of os.environ, recording the variables read.
+
+    Attributes:
+        reads (dict):
+            {name: value, or None if not set, ...} for each variable read.
+            None if all of the environment was read (e.g. iterated over).
+    """
+
+    def __init__(self):
+        self.reads = {}
+
+    def __getitem__(self, key):
+        value = os.environ.get(key)
+        if self.reads is not None:
+            self.reads[key] = value
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        self.reads = None
+        return iter(os.environ)
+
+    def __len__(self):
+        self.reads = None
+        return len(os.environ)
+
+
+def _get_cache_path(cache_dir, fpath, template_vars):
+    """Return the cache entry path of a file for the given template variables.
+
+    Entries are kept in a sub-directory for each file path, so old entries
+    can be removed (see _dump_cache). The entry name is a hash of
+    everything the result depends on, other than files (see
+    _get_cache_manifest) and environment variables read by templates (see
+    _EnvironReads): the file path, the template variables, the environment
+    variables used by Cylc and its plugins, and the Cylc version.
+    """
+    fpath = os.path.abspath(fpath)
+    sha = hashlib.sha256()
+    for item in (
+        __version__,
+        fpath,
+        sorted((key, repr(val)) for key, val in template_vars.items()),
+        sorted(
+            (key, val) for key, val in os.environ.items()
+            if key == 'HOME' or key.startswith(CACHE_ENV_PREFIXES)),
+    ):
+        sha.update(repr(item).encode())
+    return os.path.join(
+        cache_dir,
+        hashlib.sha256(fpath.encode()).hexdigest(),
+        sha.hexdigest())
+
+
+def _get_cache_manifest(fpath, inc_fpaths):
+    """Return {path: (mtime, size)} of the files a parse could depend on.
+
+    These are the include-files, and all files in the file's directory tree
+    (which may be used by templates), except for suite run directory
+    sub-directories (e.g. log/, work/). The directories are included too,
+    to detect added or removed files.
+    """
+    fdir = os.path.dirname(os.path.abspath(fpath))
+    fpaths = set(os.path.abspath(inc_fpath) for inc_fpath in inc_fpaths)
+    for dirpath, dirnames, filenames in os.walk(fdir):
+        if dirpath == fdir:
+            dirnames[:] = [
+                dirname for dirname in dirnames
+                if dirname not in CACHE_SKIP_DIRS]
+        fpaths.add(dirpath)
+        fpaths.update(
+            os.path.join(dirpath, filename) for filename in filenames)
+    manifest = {}
+    for fpath_ in fpaths:
+        try:
+            stat = os.stat(fpath_)
+        except OSError:
+            manifest[fpath_] = None
+        else:
+            manifest[fpath_] = (stat.st_mtime_ns, stat.st_size)
+    return manifest
+
+
+def _load_cache(cache_path):
+    """Return the processed lines and nested dict of a cached parse.
+
+    Return None if there is no valid cache entry at cache_path, or if any
+    of the files it depends on have changed.
+    """
+    try:
+        with open(cache_path, 'rb') as handle:
+            manifest, env_reads, flines, config = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        LOG.debug('Ignoring config cache %s: %s', cache_path, exc)
+        return None
+    for key, value in env_reads.items():
+        if os.environ.get(key) != value:
+            LOG.debug('Config cache %s out of date: $%s', cache_path, key)
+            return None
+    for fpath, stat in manifest.items():
+        try:
+            stat_ = os.stat(fpath)
+        except OSError:
+            stat_ = None
+        else:
+            stat_ = (stat_.st_mtime_ns, stat_.st_size)
+        if stat_ != stat:
+            LOG.debug('Config cache %s out of date: %s', cache_path, fpath)
+            return None
+    return flines, config
+
+
+def _dump_cache(cache_path, manifest, env_reads, flines, config):
+    """Write a cache entry for a parse, atomically.
+
+    This replaces any other entries for the same file.
+    """
+    cache_file_dir, cache_name = os.path.split(cache_path)
+    try:
+        os.makedirs(cache_file_dir, exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}'
+        with open(tmp_path, 'wb') as handle:
+            pickle.dump((manifest, env_reads, flines, config), handle)
+        os.replace(tmp_path, cache_path)
+        for name in os.listdir(cache_file_dir):
+            # (Leave temporary files of other processes alone.)
+            if name != cache_name and '.' not in name:
+                os.unlink(os.path.join(cache_file_dir, name))
+    except OSError as exc:
+        LOG.warning('Could not write config cache %s: %s', cache_path, exc)
+
+
+def parse(fpath, output_fname=None, template_vars=None, cache_dir=None):
+    """Parse file items line-by-line into a corresponding nested dict.
+
+    If cache_dir is set, the processed lines and nested dict are cached in
+    it, and reused for as long as the file, the files it depends on, the
+    template variables, the environment variables it depends on and the
+    Cylc version are unchanged. Only the latest entry for each file is kept.
+    """
+    environ = None
+    if cache_dir:
+        cache_path = _get_cache_path(cache_dir, fpath, template_vars or {})
+        cached = _load_cache(cache_path)
+        if cached is not None:
+            LOG.debug('Using config cache %s', cache_path)
+            flines, config = cached
+            _add_lib_python(os.path.dirname(fpath))
+            _dump_flines(flines, output_fname)
+            return config
+        # Record the file state before processing, so that changes made
+        # during processing invalidate the cache.
+        manifest = _get_cache_manifest(fpath, [])
+        environ = _EnvironReads()
 
     # read and process the file (jinja2, include-files, line continuation)
-    flines = read_and_proc(fpath, template_vars)
+    flines = read_and_proc(fpath, template_vars, environ=environ)
+    _dump_flines(flines, output_fname)
+    config = _parse_lines(flines)
+
+    if cache_dir and environ.reads is None:
+        LOG.debug(
+            'Not caching config %s: it depends on the whole environment',
+            fpath)
+    elif cache_dir:
+        for inc_fpath, stat in _get_cache_manifest(
+            fpath, include.flist
+        ).items():
+            manifest.setdefault(inc_fpath, stat)
+        _dump_cache(cache_path, manifest, environ.reads, flines, config)
+    return config
+
+
+def _dump_flines(flines, output_fname):
+    """Write processed lines to output_fname, if set."""
     if output_fname:
         with open(output_fname, 'w') as handle:
             handle.write('\n'.join(flines) + '\n')
         LOG.debug('Processed configuration dumped: %s', output_fname)
 
+
+def _parse_lines(flines):
+    """Parse processed lines into a corresponding nested dict."""
+
     nesting_level = 0
     config = OrderedDictWithDefaults()
     parents = []
@@ -137,8 +137,11 @@ def _load_jinja2_extensions():
     return jinja2_extensions
 
 
-def jinja2environment(dir_=None):
-    """Set up and return Jinja2 environment."""
+def jinja2environment(dir_=None, environ=None):
+    """Set up and return Jinja2 environment.
+
+    The environ template global is os.environ, or environ if set.
+    """
     if dir_ is None:
         dir_ = os.getcwd()
 
@@ -179,7 +182,7 @@ def jinja2environment(dir_=None):
 
     # Import SUITE HOST USER ENVIRONMENT into template:
     # (usage e.g.: {{environ['HOME']}}).
-    env.globals['environ'] = os.environ
+    env.globals['environ'] = os.environ if environ is None else environ
     env.globals['raise'] = raise_helper
     env.globals['assert'] = assert_helper
 
@@ -200,8 +203,11 @@ def get_error_location():
     return None
 
 
-def jinja2process(flines, dir_, template_vars=None):
-    """Pass configure file through Jinja2 processor."""
+def jinja2process(flines, dir_, template_vars=None, environ=None):
+    """Pass configure file through Jinja2 processor.
+
+    The environ template global is os.environ, or environ if set.
+    """
     # Load file lines into a template, excluding '#!jinja2' so that
     # '#!cylc-x.y.z' rises to the top. Callers should handle jinja2
     # TemplateSyntaxerror and TemplateError.
@@ -220,7 +226,7 @@ def jinja2process(flines, dir_, template_vars=None):
     # Convert unicode to plain str, ToDo - still needed for parsec?)
 
     try:
-        env = jinja2environment(dir_)
+        env = jinja2environment(dir_, environ)
         template = env.from_string('\n'.join(flines[1:]))
         lines = str(template.render(template_vars)).splitlines()
     except TemplateSyntaxError as exc:
@@ -199,6 +199,35 @@ def replicate(target, source):
             target[key] = val
 
 
+def overlay(base, source):
+    """Return a new pdict of source replicated over base.
+
+    The result is as for replicate(pdeepcopy(base), source), but without
+    copying: sections (nested dicts) of base not overridden in source are
+    shared with the result, and copy-on-write applies to those that are.
+    Neither base nor source are modified, but sections of the result must
+    not be modified in-place if base is still in use.
+    """
+    target = OrderedDictWithDefaults()
+    for key, val in base.items():
+        target[key] = val
+    if hasattr(source, "defaults_"):
+        target.defaults_ = pdeepcopy(source.defaults_)
+    elif hasattr(base, "defaults_"):
+        target.defaults_ = base.defaults_
+    for key, val in source.items():
+        if isinstance(val, dict):
+            if key in target:
+                target[key] = overlay(target[key], val)
+            else:
+                target[key] = overlay(OrderedDictWithDefaults(), val)
+        elif isinstance(val, list):
+            target[key] = val[:]
+        else:
+            target[key] = val
+    return target
+
+
 def pdeepcopy(source):
     """Make a deep copy of a pdict source"""
     target = OrderedDictWithDefaults()
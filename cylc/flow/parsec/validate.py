@@ -135,6 +135,13 @@ class ParsecValidator:
         )
     }
 
+    # Value types whose coerced values depend on the raw value alone, so
+    # can be coerced once for each distinct raw value.
+    CACHED_VDRS = frozenset([
+        V_BOOLEAN, V_FLOAT, V_FLOAT_LIST, V_INTEGER, V_INTEGER_LIST,
+        V_STRING, V_STRING_LIST, V_SPACELESS_STRING_LIST,
+        V_ABSOLUTE_HOST_LIST])
+
     def __init__(self):
         self.coercers = {
             self.V_BOOLEAN: self.coerce_boolean,
@@ -147,6 +154,10 @@ class ParsecValidator:
             self.V_SPACELESS_STRING_LIST: self.coerce_spaceless_str_list,
             self.V_ABSOLUTE_HOST_LIST: self.coerce_absolute_host_list
         }
+        # {id(spec): {key: (spec_item, coercer, options)}}
+        self._spec_tables = {}
+        # {value_type: {raw_value: coerced_value}}
+        self._coerce_cache = {}
 
     def validate(self, cfg_root, spec_root):
         """Validate and coerce a nested dict against a parsec spec.
@@ -165,40 +176,39 @@ class ParsecValidator:
         while queue:
             # Walk items, breadth first
             cfg, spec, keys = queue.popleft()
+            if not cfg:
+                continue
+            spec_table = self._get_spec_table(spec)
             for key, value in cfg.items():
-                if key not in spec:
-                    if '__MANY__' not in spec:
-                        raise IllegalItemError(keys, key)
-                    else:
-                        # only accept the item if its value is of the same type
-                        # as that of the __MANY__  item, i.e. dict or not-dict.
-                        val_is_dict = isinstance(value, dict)
-                        spc_is_dict = not spec['__MANY__'].is_leaf()
-                        if (
-                            keys != ['scheduling', 'graph'] and
-                            not val_is_dict and
-                            '  ' in key
-                        ):
-                            # Item names shouldn't have consecutive spaces
-                            # (GitHub #2417)
-                            raise IllegalItemError(
-                                keys, key, 'consecutive spaces')
-                        if ((val_is_dict and spc_is_dict) or
-                                (not val_is_dict and not spc_is_dict)):
-                            speckey = '__MANY__'
-                        else:
-                            raise IllegalItemError(keys, key)
+                if key in spec_table:
+                    specval, coercer, voptions = spec_table[key]
+                elif '__MANY__' not in spec_table:
+                    raise IllegalItemError(keys, key)
                 else:
-                    speckey = key
-                specval = spec[speckey]
-                if isinstance(value, dict) and not specval.is_leaf():
-                    # Item is dict, push to queue
-                    queue.append([value, specval, keys + [key]])
-                elif value is not None and specval.is_leaf():
+                    specval, coercer, voptions = spec_table['__MANY__']
+                    # only accept the item if its value is of the same type
+                    # as that of the __MANY__  item, i.e. dict or not-dict.
+                    val_is_dict = isinstance(value, dict)
+                    spc_is_dict = coercer is None
+                    if (
+                        keys != ['scheduling', 'graph'] and
+                        not val_is_dict and
+                        '  ' in key
+                    ):
+                        # Item names shouldn't have consecutive spaces
+                        # (GitHub #2417)
+                        raise IllegalItemError(
+                            keys, key, 'consecutive spaces')
+                    if val_is_dict != spc_is_dict:
+                        raise IllegalItemError(keys, key)
+                if coercer is None:
+                    if isinstance(value, dict):
+                        # Item is dict, push to queue
+                        queue.append([value, specval, keys + [key]])
+                elif value is not None:
                     # Item is value, coerce according to value type
-                    cfg[key] = self.coercers[specval.vdr](value, keys + [key])
-                    if specval.options:
-                        voptions = specval.options
+                    cfg[key] = coercer(value, keys + [key])
+                    if voptions:
                         if (isinstance(cfg[key], list) and
                                 any(val not in voptions for val in cfg[key]) or
                                 not isinstance(cfg[key], list) and
@@ -206,6 +216,71 @@ class ParsecValidator:
                             raise IllegalValueError(
                                 'option', keys + [key], cfg[key])
 
+    def _get_spec_table(self, spec):
+        """Return the validation table for the items of a spec section.
+
+        The table is compiled on first use, so the items of sections which
+        appear many times (e.g. runtime namespaces) are only looked up once.
+
+        Args:
+            spec (ConfigNode):
+                A spec section.
+
+        Returns:
+            dict - {key: (spec_item, coercer, options)}
+            Where coercer is None for sub-sections.
+
+        """
+        try:
+            return self._spec_tables[id(spec)]
+        except KeyError:
+            pass
+        spec_table = {}
+        for specval in spec:
+            if specval.is_leaf():
+                spec_table[specval.name] = (
+                    specval, self._get_coercer(specval.vdr), specval.options)
+            else:
+                spec_table[specval.name] = (specval, None, None)
+        self._spec_tables[id(spec)] = spec_table
+        return spec_table
+
+    def _get_coercer(self, vdr):
+        """Return the coercer for a value type.
+
+        Values of types in CACHED_VDRS are coerced once for each distinct
+        raw string value. (List values are copied, so they can be changed
+        without affecting other items.)
+
+        Args:
+            vdr (str):
+                A value type constant.
+
+        Returns:
+            function - coercer(value, keys)
+
+        """
+        if vdr not in self.coercers:
+            # Not an error unless there is a value to coerce.
+            return lambda value, keys: self.coercers[vdr](value, keys)
+        coercer = self.coercers[vdr]
+        if vdr not in self.CACHED_VDRS:
+            return coercer
+        cache = self._coerce_cache.setdefault(vdr, {})
+
+        def _coerce(value, keys):
+            if not isinstance(value, str):
+                return coercer(value, keys)
+            try:
+                result = cache[value]
+            except KeyError:
+                result = cache[value] = coercer(value, keys)
+            if isinstance(result, list):
+                return list(result)
+            return result
+
+        return _coerce
+
     __call__ = validate
 
     @classmethod
@@ -472,7 +547,9 @@ class ParsecValidator:
 
         # Note strip() removes leading and trailing whitespace, including
         # initial newlines on a multiline string:
-        return dedent(value).strip()
+        if '\n' in value:
+            value = dedent(value)
+        return value.strip()
 
     @classmethod
     def strip_and_unquote_list(cls, keys, value):
@@ -660,6 +737,11 @@ class CylcConfigValidator(ParsecValidator):
         )
     }
 
+    # (Xtriggers are not cached, their coerced value depends on the key.)
+    CACHED_VDRS = ParsecValidator.CACHED_VDRS | frozenset([
+        V_CYCLE_POINT, V_CYCLE_POINT_FORMAT, V_CYCLE_POINT_TIME_ZONE,
+        V_INTERVAL, V_INTERVAL_LIST, V_PARAMETER_LIST])
+
     def __init__(self):
         ParsecValidator.__init__(self)
         self.coercers.update({
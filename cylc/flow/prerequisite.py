@@ -25,6 +25,27 @@ from cylc.flow.exceptions import TriggerExpressionError
 from cylc.flow.data_messages_pb2 import PbPrerequisite, PbCondition
 
 
+# Compiled conditional expressions, shared by all prerequisites.
+# {'s[0] | s[1]': <code object>, ...}
+_COMPILED_CONDITIONS = {}
+
+
+def _compile_condition(slot_expr):
+    """Return the compiled code object for a slot expression.
+
+    Slot expressions refer to messages by index (e.g. "s[0] | s[1]") so the
+    same expression is shared by the prerequisites of a dependency at all
+    cycle points, and is only compiled once.
+
+    """
+    try:
+        return _COMPILED_CONDITIONS[slot_expr]
+    except KeyError:
+        code = compile(slot_expr, '<conditional>', 'eval')
+        _COMPILED_CONDITIONS[slot_expr] = code
+        return code
+
+
 class Prerequisite:
     """The concrete result of an abstract logical trigger expression.
 
@@ -40,10 +61,13 @@ class Prerequisite:
     # Memory optimization - constrain possible attributes to this list.
     __slots__ = ["satisfied", "_all_satisfied",
                  "target_point_strings", "start_point",
-                 "pre_initial_messages", "conditional_expression", "point"]
+                 "pre_initial_messages", "conditional_expression", "point",
+                 "_conditional_messages", "_conditional_code",
+                 "_conditional_error"]
 
     # Extracts T from "foo.T succeeded" etc.
     SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
+    SLOT_TEMPLATE = 's[%d]'
     MESSAGE_TEMPLATE = '%s.%s %s'
 
     DEP_STATE_SATISFIED = 'satisfied naturally'
@@ -74,6 +98,12 @@ class Prerequisite:
         # 'foo.1 failed & bar.1 succeeded'
         self.conditional_expression = None
 
+        # The messages of the conditional expression in slot order, and the
+        # compiled expression which evaluates them (see _compile_condition).
+        self._conditional_messages = ()
+        self._conditional_code = None
+        self._conditional_error = None
+
         # The cached state of this prerequisite:
         # * `None` (no cached state)
         # * `True` (prerequisite satisfied)
@@ -150,10 +180,20 @@ class Prerequisite:
                     expr, [self.MESSAGE_TEMPLATE % m for m in drop_these])
                 expr = simpler.get_cleaned()
             # Make a Python expression so we can eval() the logic.
-            for message in self.satisfied:
+            slot_expr = expr
+            for ind, message in enumerate(self.satisfied):
                 expr = expr.replace(self.MESSAGE_TEMPLATE % message,
                                     self.SATISFIED_TEMPLATE % message)
+                slot_expr = slot_expr.replace(self.MESSAGE_TEMPLATE % message,
+                                              self.SLOT_TEMPLATE % ind)
             self.conditional_expression = expr
+            self._conditional_messages = tuple(self.satisfied)
+            try:
+                self._conditional_code = _compile_condition(slot_expr)
+            except (SyntaxError, ValueError) as exc:
+                # Report the error on evaluation, as for eval().
+                self._conditional_code = None
+                self._conditional_error = exc
 
     def is_satisfied(self):
         """Return True if prerequisite is satisfied.
@@ -181,16 +221,18 @@ class Prerequisite:
         Does not cache the result.
 
         """
-        try:
-            res = eval(self.conditional_expression)
-        except (SyntaxError, ValueError) as exc:
-            err_msg = str(exc)
-            if str(exc).find("unexpected EOF") != -1:
+        if self._conditional_code is None:
+            err_msg = str(self._conditional_error)
+            if err_msg.find("unexpected EOF") != -1:
                 err_msg += (
                     " (could be unmatched parentheses in the graph string?)")
             raise TriggerExpressionError(
                 '"%s":\n%s' % (self.get_raw_conditional_expression(), err_msg))
-        return res
+        return eval(  # nosec (expression generated from the graph)
+            self._conditional_code,
+            {'__builtins__': {}},
+            {'s': [bool(self.satisfied[message])
+                   for message in self._conditional_messages]})
 
     def satisfy_me(self, all_task_outputs):
         """Evaluate pre-requisite against known outputs.
@@ -199,12 +241,14 @@ class Prerequisite:
 
         """
         relevant_messages = all_task_outputs & set(self.satisfied)
+        if not relevant_messages:
+            return relevant_messages
         for message in relevant_messages:
             self.satisfied[message] = self.DEP_STATE_SATISFIED
-            if self.conditional_expression is None:
-                self._all_satisfied = all(self.satisfied.values())
-            else:
-                self._all_satisfied = self._conditional_is_satisfied()
+        if self.conditional_expression is None:
+            self._all_satisfied = all(self.satisfied.values())
+        else:
+            self._all_satisfied = self._conditional_is_satisfied()
         return relevant_messages
 
     def dump(self):
@@ -17,7 +17,7 @@
 
 import sqlite3
 import traceback
-from os.path import expandvars
+from os.path import exists, expandvars
 
 from cylc.flow import LOG
 import cylc.flow.flags
@@ -165,6 +165,16 @@ class CylcSuiteDAO:
     """Data access object for the suite runtime database."""
 
     CONN_TIMEOUT = 0.2
+    # Settings for long-lived connections (see "is_persistent").
+    # WAL journaling with synchronous=NORMAL only syncs at checkpoints, so a
+    # commit may be lost on power failure, but the database stays consistent.
+    PERSISTENT_CACHED_STATEMENTS = 256
+    PERSISTENT_PRAGMAS = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "cache_size=-16384",  # KiB
+        "temp_store=MEMORY",
+    )
     DB_FILE_BASE_NAME = "db"
     MAX_TRIES = 100
     RESTART_INCOMPAT_VERSION = "8.0a2"  # Can't restart suite if <= this vers
@@ -297,16 +307,20 @@ class CylcSuiteDAO:
         ],
     }
 
-    def __init__(self, db_file_name, is_public=False):
+    def __init__(self, db_file_name, is_public=False, is_persistent=False):
         """Initialise database access object.
 
         Args:
             db_file_name (str): Path to the database file.
             is_public (bool): If True, allow retries, etc.
+            is_persistent (bool): If True, keep the connection open between
+                executions of queued items, rather than reconnecting each
+                time. The database is switched to WAL journaling.
 
         """
         self.db_file_name = expandvars(db_file_name)
         self.is_public = is_public
+        self.is_persistent = is_persistent
         self.conn = None
         self.n_tries = 0
 
@@ -361,9 +375,39 @@ class CylcSuiteDAO:
     def connect(self):
         """Connect to the database."""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_file_name, self.CONN_TIMEOUT)
+            if self.is_persistent:
+                self.conn = sqlite3.connect(
+                    self.db_file_name,
+                    self.CONN_TIMEOUT,
+                    cached_statements=self.PERSISTENT_CACHED_STATEMENTS)
+                for pragma in self.PERSISTENT_PRAGMAS:
+                    self.conn.execute("PRAGMA " + pragma)
+            else:
+                self.conn = sqlite3.connect(
+                    self.db_file_name, self.CONN_TIMEOUT)
         return self.conn
 
+    def checkpoint(self):
+        """Write the content of the WAL journal back to the database file.
+
+        Required before copying the database file of a persistent
+        connection, otherwise the copy will not contain recent changes.
+        """
+        if self.is_persistent and self.conn is not None:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def check_alive(self):
+        """Raise sqlite3.OperationalError if the database file is removed.
+
+        A long-lived connection carries on writing to a database file after
+        it has been removed (e.g. with the suite run directory), whereas a
+        new connection would fail. This ensures the suite dies either way.
+        """
+        if not exists(self.db_file_name):
+            self.close()
+            raise sqlite3.OperationalError(
+                "%s: database file has been removed" % self.db_file_name)
+
     def create_tables(self):
         """Create tables."""
         names = []
@@ -380,25 +424,62 @@ class CylcSuiteDAO:
 
     def execute_queued_items(self):
         """Execute queued items for each table."""
-        try:
+        if self.execute_stmts(self.get_queued_stmts()):
+            # Clear the queues
             for table in self.tables.values():
-                # DELETE statements may have varying number of WHERE args so we
-                # can only executemany for each identical template statement.
-                for stmt, stmt_args_list in table.delete_queues.items():
-                    self._execute_stmt(stmt, stmt_args_list)
-                # INSERT statements are uniform for each table, so all INSERT
-                # statements can be executed using a single "executemany" call.
-                if table.insert_queue:
-                    self._execute_stmt(
-                        table.get_insert_stmt(), table.insert_queue)
-                # UPDATE statements can have varying number of SET and WHERE
-                # args so we can only executemany for each identical template
-                # statement.
-                for stmt, stmt_args_list in table.update_queues.items():
-                    self._execute_stmt(stmt, stmt_args_list)
+                table.delete_queues.clear()
+                table.insert_queue.clear()
+                table.update_queues.clear()
+
+    def get_queued_stmts(self, clear=False):
+        """Return queued items for each table as a list of statements.
+
+        Args:
+            clear (bool): If True, clear the queues.
+
+        Return (list):
+            [(stmt, stmt_args_list), ...] in the order they should be
+            executed.
+
+        """
+        stmts = []
+        for table in self.tables.values():
+            # DELETE statements may have varying number of WHERE args so we
+            # can only executemany for each identical template statement.
+            stmts.extend(table.delete_queues.items())
+            # INSERT statements are uniform for each table, so all INSERT
+            # statements can be executed using a single "executemany" call.
+            if table.insert_queue:
+                stmts.append((table.get_insert_stmt(), table.insert_queue))
+            # UPDATE statements can have varying number of SET and WHERE
+            # args so we can only executemany for each identical template
+            # statement.
+            stmts.extend(table.update_queues.items())
+            if clear:
+                table.delete_queues = {}
+                table.insert_queue = []
+                table.update_queues = {}
+        return stmts
+
+    def execute_stmts(self, stmts):
+        """Execute a list of statements in a single transaction.
+
+        Args:
+            stmts (list): [(stmt, stmt_args_list), ...]
+
+        Return (bool):
+            True on success. If this is the public database, return False on
+            failure. If this is the private database, raise on failure.
+
+        """
+        if self.is_persistent and stmts:
+            self.check_alive()
+        try:
+            for stmt, stmt_args_list in stmts:
+                self._execute_stmt(stmt, stmt_args_list)
             # Connection should only be opened if we have executed something.
             if self.conn is None:
-                return
+                return True
             self.conn.commit()
         except sqlite3.Error:
             if not self.is_public:
@@ -412,27 +493,25 @@ class CylcSuiteDAO:
                     self.conn.rollback()
                 except sqlite3.Error:
                     pass
-            return
+            return False
         else:
-            # Clear the queues
-            for table in self.tables.values():
-                table.delete_queues.clear()
-                table.insert_queue.clear()
-                table.update_queues.clear()
             # Report public database retry recovery if necessary
             if self.n_tries:
                 LOG.warning(
                     "%(file)s: recovered after (%(attempt)d) attempt(s)\n" % {
                         "file": self.db_file_name, "attempt": self.n_tries})
             self.n_tries = 0
+            return True
         finally:
             # Note: This is not strictly necessary. However, if the suite run
             # directory is removed, a forced reconnection to the private
-            # database will ensure that the suite dies.
-            self.close()
+            # database will ensure that the suite dies. (Persistent
+            # connections use "check_alive" instead.)
+            if not self.is_persistent:
+                self.close()
 
     def _execute_stmt(self, stmt, stmt_args_list):
-        """Helper for "self.execute_queued_items".
+        """Helper for "self.execute_stmts".
 
         Execute a statement. If this is the public database, return True on
         success and False on failure. If this is the private database, return
@@ -642,6 +721,20 @@ class CylcSuiteDAO:
             ret[flow_label] = submit_num
         return ret
 
+    def select_submit_nums_for_restart(self, callback):
+        """Select name, cycle, flow_label, submit_num from task_states.
+
+        Invoke callback(row_idx, row) on each row.
+        """
+        # Ignore bandit false positive: B608: hardcoded_sql_expressions
+        # Not an injection, simply putting the table name in the SQL query
+        # expression as a string constant local to this module.
+        stmt = (  # nosec
+            r"SELECT name,cycle,flow_label,submit_num FROM %(name)s"
+        ) % {"name": self.TABLE_TASK_STATES}
+        for row_idx, row in enumerate(self.connect().execute(stmt)):
+            callback(row_idx, list(row))
+
     def select_xtriggers_for_restart(self, callback):
         stm = r"SELECT signature,results FROM %s" % self.TABLE_XTRIGGERS
         for row_idx, row in enumerate(self.connect().execute(stm, [])):
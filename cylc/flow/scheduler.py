@@ -77,7 +77,11 @@ from cylc.flow.platforms import (
     is_platform_with_target_in_list)
 from cylc.flow.profiler import Profiler
 from cylc.flow.resources import extract_resources
-from cylc.flow.subprocpool import SubProcPool
+from cylc.flow.subprocpool import (
+    AsyncSubProcPool,
+    SubFuncPool,
+    SubProcPool
+)
 from cylc.flow.suite_db_mgr import SuiteDatabaseManager
 from cylc.flow.suite_events import (
     SuiteEventContext, SuiteEventHandler)
@@ -219,6 +223,7 @@ class Scheduler:
     profiler: Profiler = None
     pool: TaskPool = None
     proc_pool: SubProcPool = None
+    func_pool: SubFuncPool = None
     task_job_mgr: TaskJobManager = None
     task_events_mgr: TaskEventsManager = None
     suite_event_handler: SuiteEventHandler = None
@@ -326,7 +331,9 @@ class Scheduler:
         """
         self.suite_db_mgr = SuiteDatabaseManager(
             suite_files.get_suite_srv_dir(self.suite),  # pri_d
-            os.path.join(self.suite_run_dir, 'log'))  # pub_d
+            os.path.join(self.suite_run_dir, 'log'),  # pub_d
+            glbl_cfg().get(
+                ['scheduler', 'public database write interval']))
         self.data_store_mgr = DataStoreMgr(self)
         self.broadcast_mgr = BroadcastMgr(
             self.suite_db_mgr, self.data_store_mgr)
@@ -362,11 +369,21 @@ class Scheduler:
         self.publisher = WorkflowPublisher(
             self.suite, context=self.zmq_context, barrier=self.barrier)
 
-        self.proc_pool = SubProcPool()
+        if glbl_cfg().get(['scheduler', 'process pool type']) == 'asyncio':
+            self.proc_pool = AsyncSubProcPool()
+        else:
+            self.proc_pool = SubProcPool()
         self.command_queue = Queue()
         self.message_queue = Queue()
         self.ext_trigger_queue = Queue()
         self.suite_event_handler = SuiteEventHandler(self.proc_pool)
+        func_pool_size = glbl_cfg().get(
+            ['scheduler', 'xtrigger function pool size'])
+        if func_pool_size > 0:
+            self.func_pool = SubFuncPool(
+                func_pool_size,
+                glbl_cfg().get(['scheduler', 'process pool timeout']),
+                self.suite_dir)
 
         self.xtrigger_mgr = XtriggerManager(
             self.suite,
@@ -374,6 +391,7 @@ class Scheduler:
             broadcast_mgr=self.broadcast_mgr,
             data_store_mgr=self.data_store_mgr,
             proc_pool=self.proc_pool,
+            func_pool=self.func_pool,
             suite_run_dir=self.suite_run_dir,
             suite_share_dir=self.suite_share_dir,
             suite_source_dir=self.suite_dir
@@ -692,6 +710,8 @@ class Scheduler:
             self._load_task_run_times)
         self.suite_db_mgr.pri_dao.select_task_pool_for_restart(
             self.pool.load_db_task_pool_for_restart)
+        self.suite_db_mgr.pri_dao.select_submit_nums_for_restart(
+            self.pool.load_db_submit_nums)
         self.suite_db_mgr.pri_dao.select_jobs_for_restart(
             self.data_store_mgr.insert_db_job)
         self.suite_db_mgr.pri_dao.select_task_action_timers(
@@ -957,7 +977,13 @@ class Scheduler:
         pri_dao = self.suite_db_mgr.get_pri_dao()
         pri_dao.select_suite_params(self._load_suite_params)
 
+        # Job files being written must not see the environment change, and
+        # must be handed over to tasks before they are reloaded.
+        self.task_job_mgr.wait_prep(self.suite)
         self.load_flow_file(is_reload=True)
+        if self.func_pool is not None:
+            # Import xtrigger functions afresh.
+            self.func_pool.restart()
         self.broadcast_mgr.linearized_ancestors = (
             self.config.get_linearized_ancestors())
         self.pool.set_do_reload(self.config)
@@ -1296,7 +1322,7 @@ class Scheduler:
                     "Waiting for the command process pool to empty" +
                     " for shutdown")
                 while self.proc_pool.is_not_done():
-                    sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
+                    await asyncio.sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
                     if stop_process_pool_empty_msg:
                         LOG.info(stop_process_pool_empty_msg)
                         stop_process_pool_empty_msg = None
@@ -1389,6 +1415,19 @@ class Scheduler:
         self._update_profile_info("scheduler loop dt (s)", now - tinit,
                                   amount_format="%.3f")
         self._update_cpu_usage()
+        if self.suite_db_mgr.pub_writer is not None:
+            self._update_profile_info(
+                "public database writer lag (s)",
+                self.suite_db_mgr.pub_writer.lag,
+                amount_format="%.3f")
+        self._update_profile_info(
+            "job preparation queue depth",
+            self.task_job_mgr.prep_queue_depth,
+            amount_format="%.1f")
+        self._update_profile_info(
+            "job preparation latency (s)",
+            self.task_job_mgr.prep_latency,
+            amount_format="%.3f")
         if now - self.previous_profile_point >= 60:
             # Only get this every minute.
             self.previous_profile_point = now
@@ -1417,6 +1456,8 @@ class Scheduler:
             self.process_command_queue()
             self.release_tasks()
             self.proc_pool.process()
+            if self.func_pool is not None:
+                self.func_pool.process()
 
             if self.should_process_tasks():
                 self.process_task_pool()
@@ -1459,10 +1500,12 @@ class Scheduler:
                 self.check_suite_stalled()
 
             # Sleep a bit for things to catch up.
-            # Quick sleep if there are items pending in process pool.
+            # Quick sleep if there are items pending in process pool
+            # (unless the pool doesn't rely on the main loop to progress).
             # (Should probably use quick sleep logic for other queues?)
             elapsed = time() - tinit
-            quick_mode = self.proc_pool.is_not_done()
+            quick_mode = (
+                self.proc_pool.IS_POLLED and self.proc_pool.is_not_done())
             if (elapsed >= self.INTERVAL_MAIN_LOOP or
                     quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
                 # Main loop has taken quite a bit to get through
@@ -1577,6 +1620,10 @@ class Scheduler:
             process = True
             self.task_job_mgr.task_remote_mgr.ready = False  # reset
 
+        if self.task_job_mgr.is_prep_done():
+            # Task jobs are ready for submission
+            process = True
+
         broadcast_mgr = self.task_events_mgr.broadcast_mgr
         broadcast_mgr.add_ext_triggers(self.ext_trigger_queue)
         for itask in self.pool.get_tasks():
@@ -1626,6 +1673,12 @@ class Scheduler:
                 # e.g. KeyboardInterrupt
                 self.proc_pool.terminate()
             self.proc_pool.process()
+            if isinstance(self.proc_pool, AsyncSubProcPool):
+                await self.proc_pool.join()
+        if self.func_pool is not None:
+            self.func_pool.terminate()
+        if self.task_job_mgr is not None:
+            self.task_job_mgr.close()
 
         if self.pool is not None:
             if not self.is_stalled:
@@ -76,6 +76,14 @@ def get_option_parser():
         dest="path",
         default=[]
     )
+    parser.add_option(
+        "--max-parallel",
+        help="Maximum number of jobs to submit at the same time.",
+        type="int",
+        metavar="N",
+        dest="max_parallel",
+        default=1,
+    )
     return parser
 
 
@@ -87,4 +95,5 @@ def main(parser, opts, job_log_root, *job_log_dirs):
         job_log_dirs,
         remote_mode=opts.remote_mode,
         utc_mode=opts.utc_mode,
+        max_parallel=opts.max_parallel,
     )
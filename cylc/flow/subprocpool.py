@@ -15,8 +15,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Manage queueing and pooling of subprocesses for the suite server program."""
 
+import asyncio
+from codecs import getincrementaldecoder
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
 import json
+import multiprocessing
 import os
 import select
 from signal import SIGKILL
@@ -24,11 +31,12 @@ import sys
 from tempfile import SpooledTemporaryFile
 from threading import RLock
 from time import time
-from subprocess import DEVNULL  # nosec
+import traceback
+from subprocess import DEVNULL, PIPE  # nosec
 
 from cylc.flow import LOG
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
-from cylc.flow.cylc_subproc import procopen
+from cylc.flow.cylc_subproc import async_procopen, procopen
 from cylc.flow.wallclock import get_current_time_string
 
 _XTRIG_FUNCS = {}
@@ -88,6 +96,28 @@ def run_function(func_name, json_args, json_kwargs, src_dir):
     sys.stdout.write(json.dumps(res))
 
 
+def run_function_in_worker(func_name, func_args, func_kwargs, src_dir):
+    """Run a Python function in a SubFuncPool worker process.
+
+    As run_function, but the function is called in a persistent process, so
+    the function (imported by get_func) is cached for subsequent calls. Its
+    stdout and stderr are captured, rather than written to the process's.
+
+    Return (ret_code, out, err) where "out" is the function return value as
+    a JSON string, as written to stdout by run_function.
+
+    """
+    err = StringIO()
+    try:
+        with redirect_stdout(err), redirect_stderr(err):
+            func = get_func(func_name, src_dir)
+            res = func(*func_args, **func_kwargs)
+        return 0, json.dumps(res), err.getvalue()
+    except Exception:
+        err.write(traceback.format_exc())
+        return 1, '', err.getvalue()
+
+
 class SubProcPool:
     """Manage queueing and pooling of subprocesses.
 
@@ -115,6 +145,8 @@ class SubProcPool:
     """
 
     ERR_SUITE_STOPPING = 'suite stopping, command not run'
+    # Whether "process" must be called frequently to make progress.
+    IS_POLLED = True
     JOBS_SUBMIT = 'jobs-submit'
     POLLREAD = select.POLLIN | select.POLLPRI
     RET_CODE_SUITE_STOPPING = 999
@@ -324,29 +356,45 @@ class SubProcPool:
         self.pipepoller.unregister(proc.stderr.fileno())
 
     @classmethod
-    def _run_command_init(cls, ctx, callback=None, callback_args=None):
-        """Prepare and launch shell command in ctx."""
-        try:
-            if ctx.cmd_kwargs.get('stdin_files'):
-                if len(ctx.cmd_kwargs['stdin_files']) > 1:
-                    stdin_file = cls.get_temporary_file()
-                    for file_ in ctx.cmd_kwargs['stdin_files']:
-                        if hasattr(file_, 'read'):
-                            stdin_file.write(file_.read())
-                        else:
-                            stdin_file.write(open(file_, 'rb').read())
-                    stdin_file.seek(0)
-                elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
-                    stdin_file = ctx.cmd_kwargs['stdin_files'][0]
-                else:
-                    stdin_file = open(
-                        ctx.cmd_kwargs['stdin_files'][0], 'rb')
-            elif ctx.cmd_kwargs.get('stdin_str'):
+    def _get_stdin_file(cls, ctx):
+        """Return the STDIN file for the command in ctx."""
+        if ctx.cmd_kwargs.get('stdin_files'):
+            if len(ctx.cmd_kwargs['stdin_files']) > 1:
                 stdin_file = cls.get_temporary_file()
-                stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
+                for file_ in ctx.cmd_kwargs['stdin_files']:
+                    if hasattr(file_, 'read'):
+                        stdin_file.write(file_.read())
+                    else:
+                        stdin_file.write(open(file_, 'rb').read())
                 stdin_file.seek(0)
+            elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
+                stdin_file = ctx.cmd_kwargs['stdin_files'][0]
             else:
-                stdin_file = DEVNULL
+                stdin_file = open(
+                    ctx.cmd_kwargs['stdin_files'][0], 'rb')
+        elif ctx.cmd_kwargs.get('stdin_str'):
+            stdin_file = cls.get_temporary_file()
+            stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
+            stdin_file.seek(0)
+        else:
+            stdin_file = DEVNULL
+        return stdin_file
+
+    @classmethod
+    def _run_command_init_error(cls, exc, ctx, callback, callback_args):
+        """Process failure to launch the command in ctx."""
+        if exc.filename is None:
+            exc.filename = ctx.cmd[0]
+        LOG.exception(exc)
+        ctx.ret_code = 1
+        ctx.err = str(exc)
+        cls._run_command_exit(ctx, callback, callback_args)
+
+    @classmethod
+    def _run_command_init(cls, ctx, callback=None, callback_args=None):
+        """Prepare and launch shell command in ctx."""
+        try:
+            stdin_file = cls._get_stdin_file(ctx)
             proc = procopen(
                 ctx.cmd, stdin=stdin_file, stdoutpipe=True, stderrpipe=True,
                 # Execute command as a process group leader,
@@ -357,12 +405,7 @@ class SubProcPool:
             # calls to open a shell are aggregated in cylc_subproc.procopen()
             # with logging for what is calling it and the commands given
         except (IOError, OSError) as exc:
-            if exc.filename is None:
-                exc.filename = ctx.cmd[0]
-            LOG.exception(exc)
-            ctx.ret_code = 1
-            ctx.err = str(exc)
-            cls._run_command_exit(ctx, callback, callback_args)
+            cls._run_command_init_error(exc, ctx, callback, callback_args)
             return None
         else:
             LOG.debug(ctx.cmd)
@@ -376,3 +419,310 @@ class SubProcPool:
             if not callback_args:
                 callback_args = []
             callback(ctx, *callback_args)
+
+
+class AsyncSubProcPool(SubProcPool):
+    """Manage queueing and pooling of subprocesses in the event loop.
+
+    An alternative to SubProcPool with the same interface, for use in the
+    event loop of the suite server program. Commands are launched as asyncio
+    subprocesses as soon as they are queued (if there is space in the pool),
+    their STDOUT and STDERR are read as they are written, and their callbacks
+    are called as soon as they exit. The "process" method need not be called
+    frequently; it only launches commands which were queued when no event
+    loop was running.
+
+    Call the "join" coroutine to wait for running commands to exit, e.g.
+    after "terminate".
+
+    """
+
+    IS_POLLED = False
+    # Size of reads from STDOUT/STDERR.
+    READ_SIZE = 65536
+
+    def __init__(self):
+        super().__init__()
+        self.pipepoller = None
+        # {asyncio.Task: asyncio.subprocess.Process (None if not launched)}
+        self.runnings = {}
+
+    def process(self):
+        """Launch queued commands, if there is space in the pool."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Launch on next call in the event loop.
+            return
+        stopping = self._is_stopping()
+        while self.queuings and len(self.runnings) < self.size:
+            ctx, callback, callback_args = self.queuings.popleft()
+            if stopping and ctx.cmd_key == self.JOBS_SUBMIT:
+                ctx.err = self.ERR_SUITE_STOPPING
+                ctx.ret_code = self.RET_CODE_SUITE_STOPPING
+                self._run_command_exit(ctx)
+            else:
+                task = loop.create_task(
+                    self._run_command(ctx, callback, callback_args))
+                self.runnings[task] = None
+
+    def put_command(self, ctx, callback=None, callback_args=None):
+        """Queue a new shell command to execute, and launch it if possible.
+
+        See SubProcPool.put_command.
+
+        """
+        super().put_command(ctx, callback, callback_args)
+        self.process()
+
+    def terminate(self):
+        """Drain queue, and kill remaining child processes."""
+        self.close()
+        # Drain queue
+        while self.queuings:
+            ctx = self.queuings.popleft()[0]
+            ctx.err = self.ERR_SUITE_STOPPING
+            ctx.ret_code = self.RET_CODE_SUITE_STOPPING
+            self._run_command_exit(ctx)
+        # Kill remaining processes
+        for proc in self.runnings.values():
+            if proc is not None:
+                try:
+                    os.killpg(proc.pid, SIGKILL)
+                except OSError:
+                    # must have just exited
+                    pass
+
+    async def join(self):
+        """Wait for running commands to exit."""
+        while self.runnings:
+            await asyncio.wait(list(self.runnings))
+
+    async def _run_command(self, ctx, callback, callback_args):
+        """Launch command in ctx, wait for it to exit, call its callback."""
+        task = asyncio.current_task()
+        try:
+            try:
+                proc = await async_procopen(
+                    ctx.cmd, stdin=self._get_stdin_file(ctx),
+                    stdout=PIPE, stderr=PIPE,
+                    # Execute command as a process group leader,
+                    # so we can use "os.killpg" to kill the whole group.
+                    preexec_fn=os.setpgrp,
+                    env=ctx.cmd_kwargs.get('env'),
+                    usesh=ctx.cmd_kwargs.get('shell'))
+            except (IOError, OSError) as exc:
+                self._run_command_init_error(
+                    exc, ctx, callback, callback_args)
+                return
+            LOG.debug(ctx.cmd)
+            ctx.timeout = time() + self.proc_pool_timeout
+            self.runnings[task] = proc
+            await self._proc_wait(proc, ctx)
+            self._run_command_exit(ctx, callback, callback_args)
+        except Exception as exc:
+            # Don't let an error in a callback go unreported.
+            LOG.exception(exc)
+        finally:
+            del self.runnings[task]
+            self.process()
+
+    async def _proc_wait(self, proc, ctx):
+        """Wait for proc to exit (or kill it on timeout), reading its output.
+
+        Set ret_code, out, err of ctx.
+
+        """
+        readers = asyncio.gather(
+            self._read_pipe(proc.stdout, ctx, 'out'),
+            self._read_pipe(proc.stderr, ctx, 'err'))
+        err_xtra = ''
+        try:
+            await asyncio.wait_for(proc.wait(), ctx.timeout - time())
+        except asyncio.TimeoutError:
+            try:
+                os.killpg(proc.pid, SIGKILL)  # kill process group
+            except OSError:
+                # must have just exited
+                pass
+            else:
+                err_xtra = "\nkilled on timeout (%s)" % (
+                    self.proc_pool_timeout)
+            await proc.wait()
+        await readers
+        ctx.ret_code = proc.returncode
+        if err_xtra:
+            if ctx.err is None:
+                ctx.err = ''
+            ctx.err += err_xtra
+
+    @classmethod
+    async def _read_pipe(cls, stream, ctx, attr):
+        """Append data from stream to ctx.out or ctx.err until EOF."""
+        decoder = getincrementaldecoder('utf-8')()
+        while True:
+            data = await stream.read(cls.READ_SIZE)
+            text = decoder.decode(data, final=not data)
+            if text:
+                if getattr(ctx, attr) is None:
+                    setattr(ctx, attr, '')
+                setattr(ctx, attr, getattr(ctx, attr) + text)
+            if not data:
+                return
+
+
+class SubFuncPool:
+    """Manage a pool of persistent worker processes for xtrigger functions.
+
+    An alternative to running each xtrigger function call in a new
+    "cylc function-run" process in the SubProcPool, avoiding the cost of
+    starting Python and importing the function on every call. It has the same
+    put_command/process interface as SubProcPool, for SubFuncContext objects.
+
+    The worker processes are started on first use. A worker cannot be
+    interrupted, so if a call times out, or a worker dies, all the workers
+    are killed and the pool is restarted: the calls that timed out (or were
+    running in the broken pool) are reported as failed, and the others are
+    re-queued. The pool is also restarted on suite reload (see restart).
+
+    Args:
+        size (int): number of worker processes
+        timeout (float): seconds after which a function call is killed
+        src_dir (str): suite source directory, for local xtrigger modules
+
+    """
+
+    # "spawn" (not fork) - the suite server program is multi-threaded.
+    MP_CONTEXT = 'spawn'
+
+    def __init__(self, size, timeout, src_dir):
+        self.size = size
+        self.timeout = timeout
+        self.src_dir = src_dir
+        self.closed = False
+        self.executor = None
+        self.queuings = deque()
+        self.runnings = []
+
+    def is_not_done(self):
+        """Return True if queuings or runnings not empty."""
+        return self.queuings or self.runnings
+
+    def put_command(self, ctx, callback=None, callback_args=None):
+        """Queue a new function call.
+
+        Arguments:
+            ctx (cylc.flow.subprocctx.SubFuncContext):
+                A context object containing the function call and its status.
+            callback (callable):
+                Function to call back when the function returns or on error.
+                Should have signature:
+                    callback(ctx, *callback_args) -> None
+            callback_args (list):
+                Extra arguments to the callback function.
+        """
+        if self.closed:
+            ctx.err = SubProcPool.ERR_SUITE_STOPPING
+            ctx.ret_code = SubProcPool.RET_CODE_SUITE_STOPPING
+            SubProcPool._run_command_exit(ctx, callback, callback_args)
+        else:
+            self.queuings.append([ctx, callback, callback_args])
+
+    def process(self):
+        """Process returned function calls and submit more."""
+        runnings = []
+        timed_out = []
+        is_broken = False
+        now = time()
+        for item in self.runnings:
+            future, ctx, callback, callback_args = item
+            if future.done():
+                try:
+                    ctx.ret_code, out, err = future.result()
+                except BrokenProcessPool as exc:
+                    # A worker died, e.g. the function called os._exit.
+                    is_broken = True
+                    ctx.ret_code, out, err = 1, '', str(exc)
+                except Exception as exc:
+                    # E.g. the function arguments could not be pickled.
+                    ctx.ret_code, out, err = 1, '', str(exc)
+                ctx.out = out
+                ctx.err = err
+                SubProcPool._run_command_exit(ctx, callback, callback_args)
+            elif now > ctx.timeout:
+                timed_out.append(item)
+            else:
+                runnings.append(item)
+        if timed_out or is_broken:
+            self._kill_workers()
+        if timed_out:
+            for _, ctx, callback, callback_args in timed_out:
+                ctx.ret_code = -SIGKILL
+                ctx.out = ''
+                ctx.err = "killed on timeout (%s)" % self.timeout
+                SubProcPool._run_command_exit(ctx, callback, callback_args)
+            # The other calls were killed with the pool, run them again.
+            for _, ctx, callback, callback_args in reversed(runnings):
+                self.queuings.appendleft([ctx, callback, callback_args])
+            runnings = []
+        self.runnings[:] = runnings
+        # Submit more calls, if items in queue and space in pool
+        while self.queuings and len(self.runnings) < self.size:
+            ctx, callback, callback_args = self.queuings.popleft()
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    self.size,
+                    mp_context=multiprocessing.get_context(self.MP_CONTEXT))
+            try:
+                future = self.executor.submit(
+                    run_function_in_worker, ctx.func_name, ctx.func_args,
+                    ctx.func_kwargs, self.src_dir)
+            except BrokenProcessPool as exc:
+                self._kill_workers()
+                ctx.ret_code = 1
+                ctx.err = str(exc)
+                SubProcPool._run_command_exit(ctx, callback, callback_args)
+                continue
+            LOG.debug(ctx)
+            ctx.timeout = time() + self.timeout
+            self.runnings.append([future, ctx, callback, callback_args])
+
+    def terminate(self):
+        """Drain queue, and kill the worker processes."""
+        self.closed = True
+        while self.queuings:
+            ctx = self.queuings.popleft()[0]
+            ctx.err = SubProcPool.ERR_SUITE_STOPPING
+            ctx.ret_code = SubProcPool.RET_CODE_SUITE_STOPPING
+            SubProcPool._run_command_exit(ctx)
+        self._kill_workers()
+        self.runnings.clear()
+
+    def restart(self):
+        """Kill the worker processes, so functions are imported afresh.
+
+        E.g. on suite reload, to pick up changes to xtrigger modules. Calls
+        in progress are re-queued, to run again in the new worker processes.
+        """
+        self._kill_workers()
+        for _, ctx, callback, callback_args in reversed(self.runnings):
+            self.queuings.appendleft([ctx, callback, callback_args])
+        self.runnings.clear()
+
+    def _kill_workers(self):
+        """Kill the worker processes, a new pool is started on next use."""
+        if self.executor is None:
+            return
+        for future, *_ in self.runnings:
+            future.cancel()
+        # (ProcessPoolExecutor has no public API to kill its workers.)
+        procs = getattr(self.executor, '_processes', None)
+        for proc in list((procs or {}).values()):
+            try:
+                proc.kill()
+            except (AttributeError, OSError):
+                pass
+        # Once the workers are killed, shutting down is quick, but don't
+        # wait on workers which could not be killed.
+        self.executor.shutdown(wait=procs is not None)
+        self.executor = None
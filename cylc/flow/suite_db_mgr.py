@@ -23,11 +23,16 @@ This module provides the logic to:
 * Manage existing run database files on restart.
 """
 
+from collections import deque
 import json
 import os
 import packaging.version
+from queue import Empty, SimpleQueue
 from shutil import copy, rmtree
+import sqlite3
 from tempfile import mkstemp
+from threading import Event, Lock, Thread
+from time import time
 
 
 from cylc.flow import LOG
@@ -38,6 +43,110 @@ from cylc.flow.wallclock import get_current_time_string, get_utc_mode
 from cylc.flow.exceptions import SuiteServiceFileError
 
 
+class PublicDatabaseWriter:
+    """Write to the public database in a background thread.
+
+    Batches of statements are handed over by the main loop with "put" and
+    applied at a fixed interval, all pending batches in one transaction, so
+    that a slow file system under the public database never holds up the
+    main loop.
+
+    Batches are applied in the order they were put, so the public database
+    ends up in the same state as the private database.
+    """
+
+    def __init__(self, db_file_name, interval):
+        self.dao = CylcSuiteDAO(db_file_name, is_public=True)
+        self.interval = interval
+        # Batches of statements from the main loop: (time, stmts).
+        self._queue = SimpleQueue()
+        # Batches which have been taken from the queue but not yet written.
+        self._pending = []
+        # Held whilst writing to the public database.
+        self.lock = Lock()
+        self._stopping = Event()
+        self._thread = None
+        # Main loop bookkeeping for lag calculation.
+        self._put_times = deque()
+        self._n_put = 0
+        # Only incremented by the writer thread.
+        self._n_written = 0
+
+    def start(self):
+        """Start the writer thread."""
+        self._thread = Thread(
+            target=self._run, name='public-db-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write any remaining batches, then stop the writer thread."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def put(self, stmts):
+        """Queue a batch of statements for writing (main loop)."""
+        now = time()
+        self._put_times.append(now)
+        self._n_put += 1
+        self._queue.put((now, stmts))
+
+    @property
+    def lag(self):
+        """Seconds since the oldest batch not yet written was put."""
+        n_unwritten = self._n_put - self._n_written
+        while len(self._put_times) > n_unwritten:
+            self._put_times.popleft()
+        if not self._put_times:
+            return 0.0
+        return time() - self._put_times[0]
+
+    def discard(self):
+        """Discard all unwritten batches.
+
+        Call with the lock held, e.g. before replacing the public database
+        with a copy of the private database, which already contains them.
+        """
+        self._n_written += len(self._pending) + self._drain()
+        self._pending = []
+        self.dao.n_tries = 0
+
+    def flush(self):
+        """Write all pending batches in one transaction."""
+        with self.lock:
+            self._drain()
+            if not self._pending:
+                return
+            stmts = []
+            for _, batch in self._pending:
+                for stmt, stmt_args_list in batch:
+                    if stmts and stmts[-1][0] == stmt:
+                        # Coalesce consecutive identical statements.
+                        stmts[-1] = (stmt, stmts[-1][1] + stmt_args_list)
+                    else:
+                        stmts.append((stmt, stmt_args_list))
+            if self.dao.execute_stmts(stmts):
+                self._n_written += len(self._pending)
+                self._pending = []
+
+    def _drain(self):
+        """Move batches from the queue to the pending list."""
+        n_batches = 0
+        while True:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except Empty:
+                return n_batches
+            n_batches += 1
+
+    def _run(self):
+        """Writer thread loop."""
+        while not self._stopping.wait(self.interval):
+            self.flush()
+        self.flush()
+
+
 class SuiteDatabaseManager:
     """Manage the suite runtime private and public databases."""
 
@@ -76,7 +185,19 @@ class SuiteDatabaseManager:
     TABLE_XTRIGGERS = CylcSuiteDAO.TABLE_XTRIGGERS
     TABLE_ABS_OUTPUTS = CylcSuiteDAO.TABLE_ABS_OUTPUTS
 
-    def __init__(self, pri_d=None, pub_d=None):
+    # Warn if the public database writer falls this far (secs) behind.
+    PUB_WRITER_LAG_WARNING = 60.0
+
+    def __init__(self, pri_d=None, pub_d=None, pub_write_interval=None):
+        """
+        Args:
+            pri_d (str): Private database directory.
+            pub_d (str): Public database directory.
+            pub_write_interval (float): If set, write to the public database
+                in a background thread with this interval (secs), rather
+                than in the main loop.
+
+        """
         self.pri_path = None
         if pri_d:
             self.pri_path = os.path.join(pri_d, CylcSuiteDAO.DB_FILE_BASE_NAME)
@@ -85,6 +206,9 @@ class SuiteDatabaseManager:
             self.pub_path = os.path.join(pub_d, CylcSuiteDAO.DB_FILE_BASE_NAME)
         self.pri_dao = None
         self.pub_dao = None
+        self.pub_write_interval = pub_write_interval
+        self.pub_writer = None
+        self.pub_writer_lagging = False
 
         self.db_deletes_map = {
             self.TABLE_BROADCAST_STATES: [],
@@ -109,6 +233,12 @@ class SuiteDatabaseManager:
             self.TABLE_XTRIGGERS: [],
             self.TABLE_ABS_OUTPUTS: []}
         self.db_updates_map = {}
+        # Rows last queued for the task_pool (and related) tables, by task.
+        # None means the tables have not been written yet this run.
+        self.task_pool_rows = None
+        # Rows last queued for task poll/retry timers, by task. These are
+        # cleared whenever the task_action_timers table is wiped.
+        self.task_action_timer_rows = {}
 
     def copy_pri_to_pub(self):
         """Copy content of primary database file to public database file.
@@ -125,10 +255,18 @@ class SuiteDatabaseManager:
             temp_pub_db_file_name = mkstemp(
                 prefix=self.pub_dao.DB_FILE_BASE_NAME,
                 dir=os.path.dirname(self.pub_dao.db_file_name))[1]
+            self.pri_dao.checkpoint()
             copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
+            # The public database is read by other processes (possibly on
+            # other hosts), so it should not inherit WAL journaling.
+            conn = sqlite3.connect(temp_pub_db_file_name)
+            try:
+                conn.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                conn.close()
             os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
             os.chmod(self.pub_dao.db_file_name, st_mode)
-        except (IOError, OSError):
+        except (IOError, OSError, sqlite3.Error):
             if temp_pub_db_file_name:
                 os.unlink(temp_pub_db_file_name)
             raise
@@ -186,13 +324,25 @@ class SuiteDatabaseManager:
             except OSError:
                 # Just in case the path is a directory!
                 rmtree(self.pri_path, ignore_errors=True)
-        self.pri_dao = self.get_pri_dao()
+        # Set permissions before connecting, so that the WAL journal files
+        # get the same permissions as the database file.
+        open(self.pri_path, "a").close()  # touch
         os.chmod(self.pri_path, 0o600)
+        # Keep the private database connection open for the life of the
+        # scheduler, to avoid reconnecting on every main loop iteration.
+        self.pri_dao = CylcSuiteDAO(self.pri_path, is_persistent=True)
         self.pub_dao = CylcSuiteDAO(self.pub_path, is_public=True)
         self.copy_pri_to_pub()
+        if self.pub_write_interval is not None:
+            self.pub_writer = PublicDatabaseWriter(
+                self.pub_path, self.pub_write_interval)
+            self.pub_writer.start()
 
     def on_suite_shutdown(self):
         """Close data access objects."""
+        if self.pub_writer:
+            self.pub_writer.stop()
+            self.pub_writer = None
         if self.pri_dao:
             self.pri_dao.close()
             self.pri_dao = None
@@ -231,16 +381,28 @@ class SuiteDatabaseManager:
                     self.pub_dao.add_update_item(
                         table_name, set_args, where_args)
 
-        # Previously, we used a separate thread for database writes. This has
-        # now been removed. For the private database, there is no real
-        # advantage in using a separate thread as it needs to be always in sync
-        # with what is current. For the public database, which does not need to
-        # be fully in sync, there is some advantage of using a separate
-        # thread/process, if writing to it becomes a bottleneck. At the moment,
-        # there is no evidence that this is a bottleneck, so it is better to
-        # keep the logic simple.
+        # For the private database, there is no real advantage in using a
+        # separate thread as it needs to be always in sync with what is
+        # current. The public database does not need to be fully in sync, so
+        # it can optionally be written by a separate thread, in case writing
+        # to it becomes a bottleneck (e.g. on a slow shared file system).
         self.pri_dao.execute_queued_items()
-        self.pub_dao.execute_queued_items()
+        if self.pub_writer is None:
+            self.pub_dao.execute_queued_items()
+            return
+        stmts = self.pub_dao.get_queued_stmts(clear=True)
+        if stmts:
+            self.pub_writer.put(stmts)
+        lag = self.pub_writer.lag
+        if lag > self.PUB_WRITER_LAG_WARNING:
+            if not self.pub_writer_lagging:
+                LOG.warning(
+                    f"{self.pub_path}: public database writes are"
+                    f" {lag:.1f}s behind")
+                self.pub_writer_lagging = True
+        elif self.pub_writer_lagging:
+            LOG.info(f"{self.pub_path}: public database writes caught up")
+            self.pub_writer_lagging = False
 
     def put_broadcast(self, modified_settings, is_cancel=False):
         """Put or clear broadcasts in runtime database."""
@@ -359,6 +521,8 @@ class SuiteDatabaseManager:
         """Put statements to update the task_action_timers table."""
         if task_events_mgr.event_timers_updated:
             self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            # Task poll and retry timers must be re-inserted after the wipe.
+            self.task_action_timer_rows.clear()
             for key, timer in task_events_mgr._event_timers.items():
                 key1, point, name, submit_num = key
                 self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
@@ -405,58 +569,45 @@ class SuiteDatabaseManager:
     def put_task_pool(self, pool):
         """Update various task tables for current pool, in runtime database.
 
-        Queue delete (everything) statements to wipe the tables, and queue the
-        relevant insert statements for the current tasks in the pool.
+        Rows are only queued for tasks whose pool entry, prerequisites or
+        timers have changed since the last call, and rows belonging to tasks
+        that have left the pool are deleted. The first call wipes the tables
+        and inserts rows for every task in the pool.
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
-        # No need to do:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        # Should already be done by self.put_task_event_timers above.
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+        if self.task_pool_rows is None:
+            self.db_deletes_map[self.TABLE_TASK_POOL].append({})
+            self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
+            self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+            # No need to do:
+            # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            # Should already be done by self.put_task_event_timers above.
+            prev_rows = {}
+            self.task_action_timer_rows.clear()
+        else:
+            prev_rows = self.task_pool_rows
+        self.task_pool_rows = {}
         for itask in pool.get_all_tasks():
-            # Update the task_prerequisites table:
-            for prereq in itask.state.prerequisites:
-                for (p_name, p_cycle, p_output), satisfied_state in (
-                        prereq.satisfied.items()):
-                    self.put_insert_task_prerequisites(itask, {
-                        "prereq_name": p_name,
-                        "prereq_cycle": p_cycle,
-                        "prereq_output": p_output,
-                        "satisfied": satisfied_state})
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "flow_label": itask.flow_label,
-                "status": itask.state.status,
-                "is_held": itask.state.is_held})
-            if itask.timeout is not None:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "timeout": itask.timeout})
-            if itask.poll_timer is not None:
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps("poll_timer"),
-                    "ctx": self._namedtuple2json(itask.poll_timer.ctx),
-                    "delays": json.dumps(itask.poll_timer.delays),
-                    "num": itask.poll_timer.num,
-                    "delay": itask.poll_timer.delay,
-                    "timeout": itask.poll_timer.timeout})
-            for ctx_key_1, timer in itask.try_timers.items():
-                if timer is None:
-                    continue
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps(("try_timers", ctx_key_1)),
-                    "ctx": self._namedtuple2json(timer.ctx),
-                    "delays": json.dumps(timer.delays),
-                    "num": timer.num,
-                    "delay": timer.delay,
-                    "timeout": timer.timeout})
+            key = (str(itask.point), itask.tdef.name, itask.flow_label)
+            rows = self._get_task_pool_rows(itask)
+            self.task_pool_rows[key] = rows
+            prev = prev_rows.pop(key, None)
+            if prev is None or rows[0] != prev[0]:
+                self.db_inserts_map[self.TABLE_TASK_POOL].append(rows[0])
+            if prev is None or rows[1] != prev[1]:
+                if prev is not None:
+                    self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append(
+                        {"cycle": key[0], "name": key[1]})
+                for prereq_row in rows[1]:
+                    self.put_insert_task_prerequisites(itask, dict(prereq_row))
+            if prev is None or rows[2] != prev[2]:
+                if rows[2] is not None:
+                    self.db_inserts_map[
+                        self.TABLE_TASK_TIMEOUT_TIMERS].append(rows[2])
+                elif prev is not None:
+                    self.db_deletes_map[
+                        self.TABLE_TASK_TIMEOUT_TIMERS].append(
+                            {"cycle": key[0], "name": key[1]})
+            self._put_task_action_timers(key, rows[3])
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -473,6 +624,77 @@ class SuiteDatabaseManager:
                 self.db_updates_map[self.TABLE_TASK_STATES].append(
                     (set_args, where_args))
                 itask.state.time_updated = None
+        # Anything left over has been removed from the pool since last time.
+        for (cycle, name, flow_label), rows in prev_rows.items():
+            self.db_deletes_map[self.TABLE_TASK_POOL].append(
+                {"cycle": cycle, "name": name, "flow_label": flow_label})
+            if rows[1]:
+                self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append(
+                    {"cycle": cycle, "name": name})
+            if rows[2] is not None:
+                self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append(
+                    {"cycle": cycle, "name": name})
+            self._put_task_action_timers((cycle, name, flow_label), {})
+
+    def _get_task_pool_rows(self, itask):
+        """Return the task pool related table rows for itask.
+
+        Return (tuple):
+            (task_pool row, task_prerequisites rows, task_timeout_timers row,
+            {ctx_key: task_action_timers row})
+        """
+        name = itask.tdef.name
+        cycle = str(itask.point)
+        pool_row = {
+            "name": name,
+            "cycle": cycle,
+            "flow_label": itask.flow_label,
+            "status": itask.state.status,
+            "is_held": itask.state.is_held}
+        prereq_rows = []
+        for prereq in itask.state.prerequisites:
+            for (p_name, p_cycle, p_output), satisfied_state in (
+                    prereq.satisfied.items()):
+                prereq_rows.append((
+                    ("prereq_name", p_name),
+                    ("prereq_cycle", p_cycle),
+                    ("prereq_output", p_output),
+                    ("satisfied", satisfied_state)))
+        timeout_row = None
+        if itask.timeout is not None:
+            timeout_row = {
+                "name": name,
+                "cycle": cycle,
+                "timeout": itask.timeout}
+        timer_rows = {}
+        timers = [(json.dumps("poll_timer"), itask.poll_timer)]
+        for ctx_key_1, timer in itask.try_timers.items():
+            timers.append((json.dumps(("try_timers", ctx_key_1)), timer))
+        for ctx_key, timer in timers:
+            if timer is None:
+                continue
+            timer_rows[ctx_key] = {
+                "name": name,
+                "cycle": cycle,
+                "ctx_key": ctx_key,
+                "ctx": self._namedtuple2json(timer.ctx),
+                "delays": json.dumps(timer.delays),
+                "num": timer.num,
+                "delay": timer.delay,
+                "timeout": timer.timeout}
+        return (pool_row, tuple(prereq_rows), timeout_row, timer_rows)
+
+    def _put_task_action_timers(self, key, timer_rows):
+        """Queue changes to the task_action_timers rows of a task."""
+        prev_timer_rows = self.task_action_timer_rows.pop(key, {})
+        for ctx_key, row in timer_rows.items():
+            if prev_timer_rows.get(ctx_key) != row:
+                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append(row)
+        for ctx_key in set(prev_timer_rows) - set(timer_rows):
+            self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append(
+                {"cycle": key[0], "name": key[1], "ctx_key": ctx_key})
+        if timer_rows:
+            self.task_action_timer_rows[key] = timer_rows
 
     def put_insert_task_events(self, itask, args):
         """Put INSERT statement for task_events table."""
@@ -548,6 +770,21 @@ class SuiteDatabaseManager:
 
     def recover_pub_from_pri(self):
         """Recover public database from private database."""
+        if self.pub_writer is not None:
+            # Don't wait for the writer if it is busy, try again later.
+            if not self.pub_writer.lock.acquire(blocking=False):
+                return
+            try:
+                if self.pub_writer.dao.n_tries >= self.pub_dao.MAX_TRIES:
+                    # The private database already has all unwritten items.
+                    self.pub_writer.discard()
+                    self.copy_pri_to_pub()
+                    LOG.warning(
+                        f"{self.pub_dao.db_file_name}: recovered from "
+                        f"{self.pri_dao.db_file_name}")
+            finally:
+                self.pub_writer.lock.release()
+            return
         if self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
             self.copy_pri_to_pub()
             LOG.warning(
@@ -24,6 +24,7 @@ This module provides logic to:
 * Prepare task jobs poll/kill, and manage the callbacks.
 """
 
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 import json
 import os
 from copy import deepcopy
@@ -144,6 +145,49 @@ class TaskJobManager:
         self.job_file_writer = JobFileWriter()
         self.job_runner_mgr = self.job_file_writer.job_runner_mgr
         self.task_remote_mgr = TaskRemoteMgr(suite, proc_pool)
+        # Job log directories and job files are written off the main loop.
+        # (One worker, so the job file writer is only used by one thread.
+        # The job file writer's suite environment, and the process
+        # environment, must only be changed after wait_prep.)
+        self.prep_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='job-prep')
+        # Batches being prepared: [(future, time queued, jobs), ...]
+        self.prep_batches = []
+        # Tasks in the batches being prepared.
+        self.prep_itasks = set()
+        # Tasks which failed preparation, handed over by wait_prep.
+        self.prep_bad_tasks = []
+
+    def close(self):
+        """Wait for any job preparation in progress, then stop."""
+        self.prep_pool.shutdown()
+
+    def wait_prep(self, suite):
+        """Wait for any job preparation in progress, and hand it over.
+
+        This must be done before the task pool is reloaded, so that the
+        prepared job files are copied to the reload successors of the tasks.
+        Tasks which failed preparation are returned by the next call to
+        prep_submit_task_jobs.
+        """
+        futures_wait([batch[0] for batch in self.prep_batches])
+        self.prep_bad_tasks.extend(self._process_prep_batches(suite))
+
+    @property
+    def prep_queue_depth(self):
+        """Number of task jobs being prepared off the main loop."""
+        return len(self.prep_itasks)
+
+    @property
+    def prep_latency(self):
+        """Seconds since the oldest batch still being prepared was queued."""
+        if not self.prep_batches:
+            return 0.0
+        return time() - min(batch[1] for batch in self.prep_batches)
+
+    def is_prep_done(self):
+        """Return True if a batch of task jobs has finished preparation."""
+        return any(batch[0].done() for batch in self.prep_batches)
 
     def check_task_jobs(self, suite, task_pool):
         """Check submission and execution timeout and polling timers.
@@ -202,19 +246,88 @@ class TaskJobManager:
         select command to complete. Bad host select command or error writing to
         a job file will cause a bad task - leading to submission failure.
 
+        Job log directories and job files are written in a worker thread, so
+        tasks are only prepared when this is done, in a later call (see
+        is_prep_done).
+
         Return [list, list]: list of good tasks, list of bad tasks
         """
         prepared_tasks = []
-        bad_tasks = []
+        bad_tasks = self.prep_bad_tasks + self._process_prep_batches(suite)
+        self.prep_bad_tasks = []
+        skip_tasks = set(bad_tasks) | self.prep_itasks
+        to_write = []  # [(itask, (local_job_file_path, job_conf)), ...]
         for itask in itasks:
-            prep_task = self._prep_submit_task_job(suite, itask,
-                                                   check_syntax=check_syntax)
-            if prep_task:
-                prepared_tasks.append(itask)
-            elif prep_task is False:
+            if itask.local_job_file_path or itask in skip_tasks:
+                continue
+            job = self._prep_submit_task_job(suite, itask)
+            if job:
+                to_write.append((itask, job))
+            elif job is False:
                 bad_tasks.append(itask)
+        if to_write:
+            self.prep_itasks.update(itask for itask, _ in to_write)
+            self.prep_batches.append((
+                self.prep_pool.submit(
+                    self._write_job_files, suite, to_write, check_syntax),
+                time(),
+                to_write))
+        for itask in itasks:
+            if itask.local_job_file_path:
+                prepared_tasks.append(itask)
         return [prepared_tasks, bad_tasks]
 
+    def _write_job_files(self, suite, to_write, check_syntax):
+        """Create job log directories and write job files (worker thread).
+
+        The job files are written as a batch, so their syntax can be checked
+        together.
+
+        Return a list containing the exception raised for each job, or None.
+        """
+        errors = []
+        jobs = []
+        for itask, job in to_write:
+            try:
+                self._create_job_log_path(suite, itask)
+            except OSError as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+                jobs.append(job)
+        write_errors = iter(
+            self.job_file_writer.write_jobs(jobs, check_syntax=check_syntax))
+        return [
+            next(write_errors) if exc is None else exc
+            for exc in errors]
+
+    def _process_prep_batches(self, suite):
+        """Hand over task jobs which have finished preparation.
+
+        Return a list of tasks which failed preparation.
+        """
+        bad_tasks = []
+        for batch in list(self.prep_batches):
+            future, _, to_write = batch
+            if not future.done():
+                continue
+            self.prep_batches.remove(batch)
+            try:
+                errors = future.result()
+            except Exception as exc:
+                errors = [exc] * len(to_write)
+            for (itask, (local_job_file_path, _)), exc in zip(
+                    to_write, errors):
+                self.prep_itasks.discard(itask)
+                if exc is None:
+                    itask.local_job_file_path = local_job_file_path
+                else:
+                    # Could be a bad command template, IOError, etc
+                    self._prep_submit_task_job_error(
+                        suite, itask, '(prepare job file)', exc)
+                    bad_tasks.append(itask)
+        return bad_tasks
+
     def submit_task_jobs(self, suite, itasks, curve_auth,
                          client_pub_key_dir, is_simulation=False):
         """Prepare and submit task jobs.
@@ -353,6 +466,10 @@ class TaskJobManager:
             for path in itask.platform[
                     'job submission executable paths'] + SYSPATH:
                 cmd.append(f"--path={path}")
+            if itask.platform['job submission parallelism'] > 1:
+                cmd.append(
+                    '--max-parallel='
+                    f"{itask.platform['job submission parallelism']}")
             cmd.append('--')
             cmd.append(
                 get_remote_suite_run_job_dir(
@@ -843,15 +960,13 @@ class TaskJobManager:
                 itask, CRITICAL, self.task_events_mgr.EVENT_SUBMIT_FAILED,
                 ctx.timestamp)
 
-    def _prep_submit_task_job(self, suite, itask, check_syntax=True):
+    def _prep_submit_task_job(self, suite, itask):
         """Prepare a task job submission.
 
-        Return itask on a good preparation.
+        Return (local_job_file_path, job_conf) on a good preparation, for
+        the job file to be written by the caller.
 
         """
-        if itask.local_job_file_path:
-            return itask
-
         # Handle broadcasts
         overrides = self.task_events_mgr.broadcast_mgr.get_broadcast(
             itask.identity)
@@ -956,16 +1071,13 @@ class TaskJobManager:
 
             local_job_file_path = get_task_job_job_log(
                 suite, itask.point, itask.tdef.name, itask.submit_num)
-            self.job_file_writer.write(local_job_file_path, job_conf,
-                                       check_syntax=check_syntax)
         except Exception as exc:
             # Could be a bad command template, IOError, etc
             self._prep_submit_task_job_error(
                 suite, itask, '(prepare job file)', exc)
             return False
-        itask.local_job_file_path = local_job_file_path
 
-        return itask
+        return local_job_file_path, job_conf
 
     def _prep_submit_task_job_error(self, suite, itask, action, exc):
         """Helper for self._prep_submit_task_job. On error."""
@@ -1004,7 +1116,7 @@ class TaskJobManager:
         scripts = self._get_job_scripts(itask, rtconfig)
 
         # Location of job file, etc
-        self._create_job_log_path(suite, itask)
+        # (The job log directory is created with the job file.)
         job_d = get_task_job_id(
             itask.point, itask.tdef.name, itask.submit_num)
         job_file_path = get_remote_suite_run_job_dir(
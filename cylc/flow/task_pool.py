@@ -19,6 +19,7 @@
 """
 
 from fnmatch import fnmatchcase
+from functools import partial
 from string import ascii_letters
 import json
 from time import time
@@ -168,6 +169,16 @@ class TaskPool:
         self.queues = {}
         self.assign_queues()
 
+        # Incremental bookkeeping for get_ready_tasks (main pool only):
+        # Tasks whose readiness to run may have changed, by identity.
+        self.ready_check_tasks = {}
+        # Tasks waiting on the wall clock, to be re-checked every time.
+        self.ready_clock_tasks = {}
+        # Queued tasks by queue, in the order they were queued.
+        self.queued_tasks = {}
+        # IDs of active tasks by queue, for queue limits.
+        self.active_task_ids = {}
+
         self.pool_list = []
         self.rhpool_list = []
         self.pool_changed = False
@@ -175,7 +186,19 @@ class TaskPool:
 
         self.is_held = False
         self.hold_point = None
-        self.abs_outputs_done = set()
+        # Completed outputs with absolute triggers, indexed by task name:
+        # {name: {(name, point_string, output), ...}}.
+        self.abs_outputs_done = {}
+        # All task proxies in the pool and runahead pool, indexed by name:
+        # {name: {identity: itask}}.
+        self.tasks_by_name = {}
+
+        # Index of the task_states table submit numbers, to save a DB query
+        # on every spawn: {point: {name: {flow_label: submit_num}}}.
+        # Points before submit_nums_min_point are evicted as the pool moves
+        # on, lookups for those go to the DB (None: nothing evicted yet).
+        self.submit_nums = {}
+        self.submit_nums_min_point = None
 
         self.stop_task_id = None
         self.stop_task_finished = False
@@ -226,10 +249,13 @@ class TaskPool:
         self.runahead_pool.setdefault(itask.point, OrderedDict())
         self.runahead_pool[itask.point][itask.identity] = itask
         self.rhpool_changed = True
+        self.tasks_by_name.setdefault(
+            itask.tdef.name, {})[itask.identity] = itask
 
         # add row to "task_states" table
         if is_new:
             # add row to "task_states" table:
+            self._index_submit_num(itask)
             self.suite_db_mgr.put_insert_task_states(itask, {
                 "time_created": get_current_time_string(),
                 "time_updated": get_current_time_string(),
@@ -358,9 +384,77 @@ class TaskPool:
                     released = True
         return released
 
+    def load_db_submit_nums(self, row_idx, row):
+        """Load the submit number index from the DB task_states table.
+
+        Only points at or after the earliest point in the (restarted) pool
+        are indexed.
+        """
+        if row_idx == 0:
+            points = list(self.pool) + list(self.runahead_pool)
+            if points:
+                self.submit_nums_min_point = min(points)
+        name, cycle, flow_label, submit_num = row
+        try:
+            point = get_point(cycle)
+        except PointParsingError:
+            # Not indexed, will be looked up in the DB if ever needed.
+            return
+        if (
+                self.submit_nums_min_point is None
+                or point >= self.submit_nums_min_point
+        ):
+            self.submit_nums.setdefault(point, {}).setdefault(name, {})[
+                flow_label] = submit_num
+
+    def _index_submit_num(self, itask):
+        """Record the current submit number of itask in the index."""
+        if (
+                self.submit_nums_min_point is None
+                or itask.point >= self.submit_nums_min_point
+        ):
+            self.submit_nums.setdefault(itask.point, {}).setdefault(
+                itask.tdef.name, {})[itask.flow_label] = itask.submit_num
+
+    def _get_submit_nums(self, name, point):
+        """Return submit numbers of name.point by flow label.
+
+        Return (dict):
+            {flow_label: submit_num, ...} of previous instances of name.point.
+        """
+        if (
+                self.submit_nums_min_point is not None
+                and point < self.submit_nums_min_point
+        ):
+            # Evicted from the index.
+            return self.suite_db_mgr.pri_dao.select_submit_nums(
+                name, str(point))
+        try:
+            return self.submit_nums[point][name]
+        except KeyError:
+            return {}
+
+    def _evict_submit_nums(self):
+        """Evict points before the earliest point in the pool from the index.
+        """
+        points = list(self.pool) + list(self.runahead_pool)
+        if not points:
+            return
+        min_point = min(points)
+        if (
+                self.submit_nums_min_point is not None
+                and min_point <= self.submit_nums_min_point
+        ):
+            return
+        self.submit_nums_min_point = min_point
+        for point in list(self.submit_nums):
+            if point < min_point:
+                del self.submit_nums[point]
+
     def load_abs_outputs_for_restart(self, row_idx, row):
         cycle, name, output = row
-        self.abs_outputs_done.add((name, cycle, output))
+        self.abs_outputs_done.setdefault(name, set()).add(
+            (name, cycle, output))
 
     def load_db_task_pool_for_restart(self, row_idx, row):
         """Load tasks from DB task pool/states/jobs tables, to runahead pool.
@@ -532,6 +626,8 @@ class TaskPool:
         self.pool.setdefault(itask.point, {})
         self.pool[itask.point][itask.identity] = itask
         self.pool_changed = True
+        itask.state.on_change = partial(self._on_task_state_change, itask)
+        self._on_task_state_change(itask)
         LOG.debug("[%s] -released to the task pool", itask)
 
         # The following two could be called in separate places,
@@ -591,9 +687,17 @@ class TaskPool:
                 # In main pool: remove from pool and queues.
                 if not self.pool[itask.point]:
                     del self.pool[itask.point]
+                    self._evict_submit_nums()
                 self.pool_changed = True
                 if itask.tdef.name in self.myq:  # A reload can remove a task
                     del self.queues[self.myq[itask.tdef.name]][itask.identity]
+                itask.state.on_change = None
+                self.ready_check_tasks.pop(itask.identity, None)
+                self.ready_clock_tasks.pop(itask.identity, None)
+                for queued_tasks in self.queued_tasks.values():
+                    queued_tasks.pop(itask.identity, None)
+                for active_task_ids in self.active_task_ids.values():
+                    active_task_ids.discard(itask.identity)
                 if itask.tdef.max_future_prereq_offset is not None:
                     self.set_max_future_offset()
         else:
@@ -602,12 +706,18 @@ class TaskPool:
                 del self.runahead_pool[itask.point]
             self.rhpool_changed = True
 
+        tasks = self.tasks_by_name.get(itask.tdef.name, {})
+        tasks.pop(itask.identity, None)
+        if not tasks:
+            self.tasks_by_name.pop(itask.tdef.name, None)
+
         # Notify the data-store manager of their removal
         # (the manager uses window boundary tracking for pruning).
         self.data_store_mgr.remove_pool_node(itask.tdef.name, itask.point)
         # Event-driven final update of task_states table.
         # TODO: same for datastore (still updated by scheduler loop)
         self.suite_db_mgr.put_update_task_state(itask)
+        self._index_submit_num(itask)
         LOG.debug("[%s] -%s", itask, msg)
         del itask
 
@@ -678,56 +788,67 @@ class TaskPool:
         after use so that two manual trigger ops are required to submit
         an initially unqueued task that is queue-limited.
 
+        Only tasks whose state has changed since the last call (see
+        "_on_task_state_change"), or which are waiting on the wall clock,
+        are checked for readiness.
+
         Return the tasks that are dequeued.
 
         """
         ready_tasks = []
         qconfig = self.config.cfg['scheduling']['queues']
 
-        for queue in self.queues:
-            # 1) queue unqueued tasks that are ready to run or manually forced
-            for itask in list(self.queues[queue].values()):
-                if not itask.state(TASK_STATUS_QUEUED):
-                    # only need to check that unqueued tasks are ready
-                    check_items = itask.is_ready()
-                    # use this periodic checking point for data-store delta
-                    # creation, some items aren't event driven (i.e. clock).
-                    if itask.tdef.clocktrigger_offset is not None:
-                        self.data_store_mgr.delta_task_clock_trigger(
-                            itask, check_items)
-                    if all(check_items):
-                        # queue the task
-                        itask.state.reset(TASK_STATUS_QUEUED)
-                        itask.reset_manual_trigger()
-                        # move the task to the back of the queue
-                        self.queues[queue][itask.identity] = \
-                            self.queues[queue].pop(itask.identity)
-                        self.data_store_mgr.delta_task_state(itask)
-
-            # 2) submit queued tasks if manually forced or not queue-limited
-            n_active = 0
-            n_release = 0
+        # 1) queue unqueued tasks that are ready to run or manually forced
+        check_tasks = self.ready_check_tasks
+        self.ready_check_tasks = {}
+        check_tasks.update(self.ready_clock_tasks)
+        for itask in check_tasks.values():
+            if itask.state(TASK_STATUS_QUEUED):
+                # only need to check that unqueued tasks are ready
+                continue
+            check_items = itask.is_ready()
+            # use this periodic checking point for data-store delta
+            # creation, some items aren't event driven (i.e. clock).
+            if itask.tdef.clocktrigger_offset is not None:
+                self.data_store_mgr.delta_task_clock_trigger(
+                    itask, check_items)
+            if all(check_items):
+                self.ready_clock_tasks.pop(itask.identity, None)
+                # queue the task
+                itask.state.reset(TASK_STATUS_QUEUED)
+                itask.reset_manual_trigger()
+                # move the task to the back of the queue
+                try:
+                    queue_tasks = self.queues[self._get_queue(itask)]
+                    queue_tasks[itask.identity] = queue_tasks.pop(
+                        itask.identity)
+                except KeyError:
+                    pass
+                self.data_store_mgr.delta_task_state(itask)
+            elif not itask.state.is_held and (
+                    itask.tdef.clocktrigger_offset is not None
+                    or itask.state.status in itask.try_timers
+            ):
+                # waiting on the clock, check again next time
+                self.ready_clock_tasks[itask.identity] = itask
+            else:
+                # waiting on an event
+                self.ready_clock_tasks.pop(itask.identity, None)
+        # (Queuing a task changes its state, which re-adds it to the check
+        # list, but queued tasks are skipped above.)
+
+        # 2) submit queued tasks if manually forced or not queue-limited
+        for queue, queued_tasks in self.queued_tasks.items():
+            if not queued_tasks:
+                continue
             n_limit = qconfig[queue]['limit']
-            tasks = list(self.queues[queue].values())
-
-            # 2.1) count active tasks and compare to queue limit
+            # 2.1) compare active tasks to queue limit
+            n_release = 0
             if n_limit:
-                for itask in tasks:
-                    if itask.state(
-                            TASK_STATUS_PREPARING,
-                            TASK_STATUS_SUBMITTED,
-                            TASK_STATUS_RUNNING,
-                            is_held=False
-                    ):
-                        n_active += 1
-                n_release = n_limit - n_active
+                n_release = n_limit - len(self.active_task_ids[queue])
 
             # 2.2) release queued tasks if not limited or if manually forced
-            for itask in tasks:
-                if not itask.state(TASK_STATUS_QUEUED):
-                    # (Excludes tasks remaining TASK_STATUS_PREPARING because
-                    # job submission has been stopped with 'cylc shutdown').
-                    continue
+            for itask in list(queued_tasks.values()):
                 if itask.manual_trigger or not n_limit or n_release > 0:
                     # manual release, or no limit, or not currently limited
                     n_release -= 1
@@ -740,6 +861,47 @@ class TaskPool:
 
         return ready_tasks
 
+    def _get_queue(self, itask):
+        """Return the name of the internal queue of itask."""
+        try:
+            return self.myq[itask.tdef.name]
+        except KeyError:
+            return self.config.Q_DEFAULT
+
+    def _on_task_state_change(self, itask):
+        """Update get_ready_tasks bookkeeping for itask in the main pool.
+
+        Called when the status, hold flag, prerequisites or triggers of the
+        task change.
+        """
+        queue = self._get_queue(itask)
+        if itask.state(TASK_STATUS_QUEUED):
+            self.queued_tasks.setdefault(queue, OrderedDict()).setdefault(
+                itask.identity, itask)
+        else:
+            self.queued_tasks.get(queue, {}).pop(itask.identity, None)
+            self.ready_check_tasks[itask.identity] = itask
+        active_task_ids = self.active_task_ids.setdefault(queue, set())
+        if itask.state(
+                TASK_STATUS_PREPARING,
+                TASK_STATUS_SUBMITTED,
+                TASK_STATUS_RUNNING,
+                is_held=False
+        ):
+            active_task_ids.add(itask.identity)
+        else:
+            active_task_ids.discard(itask.identity)
+
+    def _reset_ready_tracking(self):
+        """Rebuild get_ready_tasks bookkeeping, e.g. after queue changes."""
+        self.ready_check_tasks.clear()
+        self.ready_clock_tasks.clear()
+        self.queued_tasks.clear()
+        self.active_task_ids.clear()
+        for itask_id_map in self.queues.values():
+            for itask in itask_id_map.values():
+                self._on_task_state_change(itask)
+
     def get_min_point(self):
         """Return the minimum cycle point currently in the pool."""
         cycles = list(self.pool)
@@ -811,6 +973,7 @@ class TaskPool:
                 new_queues.setdefault(key, OrderedDict())
                 new_queues[key][id_] = itask
         self.queues = new_queues
+        self._reset_ready_tracking()
 
     def reload_taskdefs(self):
         """Reload the definitions of task proxies in the pool.
@@ -1086,8 +1249,8 @@ class TaskPool:
         suicide = []
         for c_name, c_point, is_abs in children:
             if is_abs:
-                self.abs_outputs_done.add((itask.tdef.name,
-                                          str(itask.point), output))
+                self.abs_outputs_done.setdefault(itask.tdef.name, set()).add(
+                    (itask.tdef.name, str(itask.point), output))
                 self.suite_db_mgr.put_insert_abs_output(
                     str(itask.point), itask.tdef.name, output)
                 self.suite_db_mgr.process_queued_ops()
@@ -1102,7 +1265,7 @@ class TaskPool:
             if c_task is not None:
                 # Update downstream prerequisites directly.
                 if is_abs:
-                    tasks, _ = self.filter_task_proxies([c_name])
+                    tasks = list(self.tasks_by_name.get(c_name, {}).values())
                 else:
                     tasks = [c_task]
                 for t in tasks:
@@ -1149,6 +1312,7 @@ class TaskPool:
             return
         itask.flow_label = self.flow_label_mgr.merge_labels(
             itask.flow_label, flab2)
+        self._index_submit_num(itask)
         self.suite_db_mgr.put_insert_task_states(itask, {
             "status": itask.state.status,
             "flow_label": itask.flow_label})
@@ -1195,7 +1359,7 @@ class TaskPool:
             return None
 
         # Get submit number by flow label {flow_label: submit_num, ...}
-        snums = self.suite_db_mgr.pri_dao.select_submit_nums(name, str(point))
+        snums = self._get_submit_nums(name, point)
         try:
             submit_num = max(snums.values())
         except ValueError:
@@ -1243,9 +1407,13 @@ class TaskPool:
                 self.data_store_mgr.delta_task_held(itask)
 
         # Attempt to satisfy any absolute triggers now.
-        # TODO: consider doing this only for tasks with absolute prerequisites.
-        if itask.state.prerequisites_are_not_all_satisfied():
-            itask.state.satisfy_me(self.abs_outputs_done)
+        abs_triggers = taskdef.get_abs_triggers(point)
+        if abs_triggers and itask.state.prerequisites_are_not_all_satisfied():
+            abs_outputs = set()
+            for name in {trigger.task_name for trigger in abs_triggers}:
+                abs_outputs.update(self.abs_outputs_done.get(name, ()))
+            if abs_outputs:
+                itask.state.satisfy_me(abs_outputs)
 
         if parent_id is not None:
             msg = "(" + parent_id + ") spawned %s.%s flow(%s)"
@@ -190,6 +190,10 @@ class TaskState:
             Has the status been updated since previous update?
         .kill_failed (boolean):
             Has a job kill attempt failed since previous status change?
+        .on_change (callable):
+            Called with no arguments when the status, hold flag,
+            prerequisites or triggers change in a way that may affect the
+            readiness of the task to run (or None).
         .outputs (cylc.flow.task_outputs.TaskOutputs):
             Known outputs of the task.
         .prerequisites (list<cylc.flow.prerequisite.Prerequisite>):
@@ -215,6 +219,7 @@ class TaskState:
         "identity",
         "is_updated",
         "kill_failed",
+        "on_change",
         "outputs",
         "prerequisites",
         "status",
@@ -231,6 +236,7 @@ class TaskState:
         self.is_held = is_held
         self.is_updated = False
         self.time_updated = None
+        self.on_change = None
 
         self._is_satisfied = None
         self._suicide_is_satisfied = None
@@ -294,11 +300,30 @@ class TaskState:
 
     def satisfy_me(self, all_task_outputs):
         """Attempt to get my prerequisites satisfied."""
+        changed = False
         for prereqs in [self.prerequisites, self.suicide_prerequisites]:
             for prereq in prereqs:
                 if prereq.satisfy_me(all_task_outputs):
                     self._is_satisfied = None
                     self._suicide_is_satisfied = None
+                    changed = True
+        if changed:
+            self._changed()
+
+    def satisfy_external_trigger(self, trig):
+        """Set an external trigger satisfied."""
+        self.external_triggers[trig] = True
+        self._changed()
+
+    def satisfy_xtrigger(self, label):
+        """Set an xtrigger satisfied."""
+        self.xtriggers[label] = True
+        self._changed()
+
+    def _changed(self):
+        """Notify the "on_change" callback, if any."""
+        if self.on_change is not None:
+            self.on_change()
 
     def xtriggers_all_satisfied(self):
         """Return True if all xtriggers are satisfied."""
@@ -340,12 +365,14 @@ class TaskState:
         for prereq in self.prerequisites:
             prereq.set_satisfied()
         self._is_satisfied = None
+        self._changed()
 
     def set_prerequisites_not_satisfied(self):
         """Reset prerequisites."""
         for prereq in self.prerequisites:
             prereq.set_not_satisfied()
         self._is_satisfied = None
+        self._changed()
 
     def prerequisites_dump(self, list_prereqs=False):
         """Dump prerequisites."""
@@ -407,6 +434,7 @@ class TaskState:
         self.time_updated = get_current_time_string()
         self.is_updated = True
         LOG.debug("[%s] -%s => %s", self.identity, prev_message, str(self))
+        self._changed()
 
         if is_held:
             # only reset task outputs if not setting task to held
@@ -16,7 +16,7 @@
 
 """Task definition."""
 
-from collections import deque
+from collections import OrderedDict, deque
 
 from cylc.flow.exceptions import TaskDefError
 from cylc.flow.task_id import TaskID
@@ -24,7 +24,51 @@ from cylc.flow.task_state import TASK_OUTPUT_SUCCEEDED
 from cylc.flow import LOG
 
 
+def _get_cached(cache, func, tdef, point):
+    """Return func(tdef, point) from an LRU cache.
+
+    Args:
+        cache (collections.OrderedDict): {point: result, ...}
+        func (callable): Function to call on a cache miss.
+        tdef (TaskDef): The task definition.
+        point (cylc.flow.cycling.PointBase): The cycle point.
+
+    Return (object): The cached result, do not modify it.
+
+    """
+    try:
+        cache.move_to_end(point)
+        return cache[point]
+    except KeyError:
+        pass
+    result = func(tdef, point)
+    cache[point] = result
+    if len(cache) > tdef.MAX_LEN_GRAPH_CACHE:
+        cache.popitem(last=False)
+    return result
+
+
 def generate_graph_children(tdef, point):
+    """Determine graph children of this task (for spawning).
+
+    The result is cached on the task definition, do not modify it.
+
+    """
+    return _get_cached(
+        tdef.graph_children_cache, _generate_graph_children, tdef, point)
+
+
+def generate_graph_parents(tdef, point):
+    """Determine graph parents of this task.
+
+    The result is cached on the task definition, do not modify it.
+
+    """
+    return _get_cached(
+        tdef.graph_parents_cache, _generate_graph_parents, tdef, point)
+
+
+def _generate_graph_children(tdef, point):
     """Determine graph children of this task (for spawning)."""
     graph_children = {}
     for seq, dout in tdef.graph_children.items():
@@ -62,7 +106,7 @@ def generate_graph_children(tdef, point):
     return graph_children
 
 
-def generate_graph_parents(tdef, point):
+def _generate_graph_parents(tdef, point):
     """Determine graph parents of this task."""
     graph_parents = {}
     for seq, ups in tdef.graph_parents.items():
@@ -108,10 +152,13 @@ class TaskDef:
         "suite_polling_cfg", "clocktrigger_offset", "expiration_offset",
         "namespace_hierarchy", "dependencies", "outputs", "param_var",
         "graph_children", "graph_parents",
+        "graph_children_cache", "graph_parents_cache",
         "external_triggers", "xtrig_labels", "name", "elapsed_times"]
 
     # Store the elapsed times for a maximum of 10 cycles
     MAX_LEN_ELAPSED_TIMES = 10
+    # Cache graph children and parents for a maximum of 1000 cycle points
+    MAX_LEN_GRAPH_CACHE = 1000
     ERR_PREFIX_TASK_NOT_ON_SEQUENCE = "Invalid cycle point for task: "
 
     def __init__(self, name, rtcfg, run_mode, start_point):
@@ -137,6 +184,10 @@ class TaskDef:
         self.outputs = set()
         self.graph_children = {}
         self.graph_parents = {}
+        # Results of generate_graph_children/parents, {point: result}.
+        # (A reload creates new task definitions, with empty caches.)
+        self.graph_children_cache = OrderedDict()
+        self.graph_parents_cache = OrderedDict()
         self.param_var = {}
         self.external_triggers = []
         self.xtrig_labels = {}  # {sequence: [labels]}
@@ -155,6 +206,7 @@ class TaskDef:
         self.graph_children.setdefault(
             sequence, {}).setdefault(
                 trigger.output, []).append((taskname, trigger))
+        self.clear_graph_cache()
 
     # graph_parents not currently used, but might be soon:
     def add_graph_parent(self, trigger, parent, sequence):
@@ -166,6 +218,7 @@ class TaskDef:
         if sequence not in self.graph_parents:
             self.graph_parents[sequence] = set()
         self.graph_parents[sequence].add((parent, trigger))
+        self.clear_graph_cache()
 
     def add_dependency(self, dependency, sequence):
         """Add a dependency to a named sequence.
@@ -194,6 +247,12 @@ class TaskDef:
         """Add a sequence."""
         if sequence not in self.sequences:
             self.sequences.append(sequence)
+            self.clear_graph_cache()
+
+    def clear_graph_cache(self):
+        """Clear cached graph children and parents."""
+        self.graph_children_cache.clear()
+        self.graph_parents_cache.clear()
 
     def describe(self):
         """Return title and description of the current task."""
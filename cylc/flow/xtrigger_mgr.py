@@ -28,7 +28,7 @@ from cylc.flow.xtriggers.wall_clock import wall_clock
 from cylc.flow.subprocctx import SubFuncContext
 from cylc.flow.broadcast_mgr import BroadcastMgr
 from cylc.flow.data_store_mgr import DataStoreMgr
-from cylc.flow.subprocpool import SubProcPool
+from cylc.flow.subprocpool import SubFuncPool, SubProcPool
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.subprocpool import get_func
 
@@ -81,6 +81,10 @@ class XtriggerManager:
 
     Once a trigger is satisfied, remember it until the cleanup cutoff point.
 
+    Function contexts are rendered once for each label and cycle point (or
+    task, if the function args depend on the task name or ID), and tasks
+    waiting on the same signature are all satisfied together.
+
     Clock triggers are treated separately and called synchronously in the main
     process, because they are guaranteed to be quick (but they are still
     managed uniquely - i.e. many tasks depending on the same clock trigger
@@ -92,6 +96,8 @@ class XtriggerManager:
         user (str): suite owner
         broadcast_mgr (BroadcastMgr): the Broadcast Manager
         proc_pool (SubProcPool): pool of Subprocesses
+        func_pool (SubFuncPool): pool of worker processes for xtrigger
+            functions (optional, else the proc_pool is used)
         suite_run_dir (str): suite run directory
         suite_share_dir (str): suite share directory
         suite_source_dir (str): suite source directory
@@ -106,6 +112,7 @@ class XtriggerManager:
         broadcast_mgr: BroadcastMgr = None,
         data_store_mgr: DataStoreMgr = None,
         proc_pool: SubProcPool = None,
+        func_pool: SubFuncPool = None,
         suite_run_dir: str = None,
         suite_share_dir: str = None,
         suite_source_dir: str = None,
@@ -117,9 +124,19 @@ class XtriggerManager:
         # Satisfied triggers and their function results, by signature.
         self.sat_xtrig = {}
         # Signatures of active functions (waiting on callback).
-        self.active = []
+        self.active = set()
         # All trigger and clock signatures in the current task pool.
-        self.all_xtrig = []
+        self.all_xtrig = set()
+        # Tasks waiting on unsatisfied xtriggers in the current task pool:
+        # {signature: (function context, [(itask, label), ...]), ...}
+        # (Clock triggers by (signature, point), as they are evaluated for
+        # each cycle point.)
+        self.waiting = {}
+        # Rendered function contexts and their signatures:
+        # {(label, point or task ID): (ctx, signature), ...}
+        self._xtrigs = {}
+        # Labels whose function args depend on the task name or ID.
+        self._per_task_labels = {}
 
         self.pflag = False
 
@@ -134,6 +151,7 @@ class XtriggerManager:
             TMPL_DEBUG_MODE: cylc.flow.flags.debug
         }
         self.proc_pool = proc_pool
+        self.func_pool = func_pool
         self.broadcast_mgr = broadcast_mgr
         self.data_store_mgr = data_store_mgr
         self.suite_source_dir = suite_source_dir
@@ -177,6 +195,7 @@ class XtriggerManager:
         """
         self.validate_xtrigger(fctx.func_name, fdir)
         self.functx_map[label] = fctx
+        self._forget_label(label)
         # Check any string templates in the function arg values (note this
         # won't catch bad task-specific values - which are added dynamically).
         for argv in fctx.func_args + list(fctx.func_kwargs.values()):
@@ -191,6 +210,14 @@ class XtriggerManager:
 
     def mutate_trig(self, label, kwargs):
         self.functx_map[label].func_kwargs.update(kwargs)
+        self._forget_label(label)
+
+    def _forget_label(self, label: str):
+        """Forget rendered function contexts of a changed xtrigger label."""
+        self._per_task_labels.pop(label, None)
+        for key in list(self._xtrigs):
+            if key[0] == label:
+                del self._xtrigs[key]
 
     def load_xtrigger_for_restart(self, row_idx: int, row: Tuple[str, str]):
         """Load satisfied xtrigger results from suite DB.
@@ -231,17 +258,67 @@ class XtriggerManager:
         for label, satisfied in itask.state.xtriggers.items():
             if unsat_only and satisfied:
                 continue
-            ctx = self.get_xtrig_ctx(itask, label)
-            sig = ctx.get_signature()
+            ctx, sig = self._get_xtrig(itask, label)
             if sigs_only:
                 res.append(sig)
             else:
                 res.append((label, sig, ctx, satisfied))
         return res
 
+    def _get_xtrig(self, itask: TaskProxy, label: str, prev_xtrigs=None):
+        """Return the (cached) function context and signature of an xtrigger.
+
+        Args:
+            itask (TaskProxy): task proxy
+            label (str): xtrigger label
+            prev_xtrigs (dict): previously rendered contexts to reuse, if
+                not already cached
+        Returns:
+            Tuple[SubFuncContext, str]: function context and signature
+        """
+        try:
+            per_task = self._per_task_labels[label]
+        except KeyError:
+            fctx = self.functx_map[label]
+            per_task = self._per_task_labels[label] = any(
+                match in (TMPL_TASK_NAME, TMPL_TASK_IDENT)
+                for argv in fctx.func_args + list(fctx.func_kwargs.values())
+                if isinstance(argv, str)
+                for match in RE_STR_TMPL.findall(argv))
+        if per_task:
+            key = (label, itask.identity)
+        else:
+            key = (label, str(itask.point))
+        try:
+            return self._xtrigs[key]
+        except KeyError:
+            pass
+        if prev_xtrigs is not None and key in prev_xtrigs:
+            self._xtrigs[key] = prev_xtrigs[key]
+        else:
+            ctx = self._render_xtrig_ctx(itask, label)
+            self._xtrigs[key] = (ctx, ctx.get_signature())
+        return self._xtrigs[key]
+
     def get_xtrig_ctx(self, itask: TaskProxy, label: str) -> SubFuncContext:
         """Get a real function context from the template.
 
+        The context is shared by all tasks with the same xtrigger at the same
+        cycle point, so must not be modified.
+
+        Args:
+            itask (TaskProxy): task proxy
+            label (str): xtrigger label
+        Returns:
+            SubFuncContext: function context
+        """
+        return self._get_xtrig(itask, label)[0]
+
+    def _render_xtrig_ctx(
+        self, itask: TaskProxy, label: str
+    ) -> SubFuncContext:
+        """Render a real function context from the template.
+
         Args:
             itask (TaskProxy): task proxy
             label (str): xtrigger label
@@ -275,41 +352,82 @@ class XtriggerManager:
         ctx.update_command(self.suite_source_dir)
         return ctx
 
+    @staticmethod
+    def _add_waiting(waiting, itask, label, sig, ctx):
+        """Add a task waiting on an unsatisfied xtrigger to an index.
+
+        Args:
+            waiting (dict): the index, see self.waiting
+            itask (TaskProxy): task proxy
+            label (str): xtrigger label
+            sig (str): xtrigger signature
+            ctx (SubFuncContext): function context
+        """
+        if sig.startswith("wall_clock"):
+            key = (sig, str(itask.point))
+        else:
+            key = sig
+        try:
+            waiting[key][1].append((itask, label))
+        except KeyError:
+            waiting[key] = (ctx, [(itask, label)])
+
     def satisfy_xtriggers(self, itask: TaskProxy):
         """Attempt to satisfy itask's xtriggers.
 
         Args:
             itask (TaskProxy): TaskProxy
         """
+        waiting = {}
         for label, sig, ctx, _ in self._get_xtrigs(itask, unsat_only=True):
-            if sig.startswith("wall_clock"):
+            self._add_waiting(waiting, itask, label, sig, ctx)
+        self._satisfy_waiting(waiting)
+
+    def _satisfy_waiting(self, waiting):
+        """Attempt to satisfy xtriggers, for all tasks waiting on each.
+
+        Args:
+            waiting (dict): tasks waiting on xtriggers, see self.waiting
+        """
+        for key, (ctx, itask_labels) in waiting.items():
+            if isinstance(key, tuple):
                 # Special case: synchronous clock check.
-                if 'absolute_as_seconds' not in ctx.func_kwargs:
-                    ctx.func_kwargs.update(
-                        {
-                            'point_as_seconds': itask.get_point_as_seconds()
-                        }
-                    )
-                if wall_clock(*ctx.func_args, **ctx.func_kwargs):
-                    itask.state.xtriggers[label] = True
+                sig = key[0]
+                kwargs = ctx.func_kwargs
+                if 'absolute_as_seconds' not in kwargs:
+                    kwargs = dict(
+                        kwargs,
+                        point_as_seconds=(
+                            itask_labels[0][0].get_point_as_seconds()))
+                if wall_clock(*ctx.func_args, **kwargs):
                     self.sat_xtrig[sig] = {}
                     self.data_store_mgr.delta_task_xtrigger(sig, True)
-                    LOG.info('xtrigger satisfied: %s = %s', label, sig)
+                    for itask, label in itask_labels:
+                        itask.state.satisfy_xtrigger(label)
+                        LOG.info('xtrigger satisfied: %s = %s', label, sig)
                 continue
             # General case: asynchronous xtrigger function call.
+            sig = key
             if sig in self.sat_xtrig:
-
-                if not itask.state.xtriggers[label]:
-                    itask.state.xtriggers[label] = True
+                # Satisfy all waiting tasks, broadcasting the function
+                # results to each label and cycle point at once.
+                names = {}  # {(label, point): [name, ...], ...}
+                for itask, label in itask_labels:
+                    if not itask.state.xtriggers[label]:
+                        itask.state.satisfy_xtrigger(label)
+                        names.setdefault(
+                            (label, str(itask.point)), []
+                        ).append(itask.tdef.name)
+                for (label, point), tdef_names in names.items():
                     res = {}
-                    for key, val in self.sat_xtrig[sig].items():
-                        res["%s_%s" % (label, key)] = val
+                    for res_key, val in self.sat_xtrig[sig].items():
+                        res["%s_%s" % (label, res_key)] = val
                     if res:
-                        xtrigger_env = [{'environment': {key: val}} for
-                                        key, val in res.items()]
+                        xtrigger_env = [{'environment': {res_key: val}} for
+                                        res_key, val in res.items()]
                         self.broadcast_mgr.put_broadcast(
-                            [str(ctx.point)],
-                            [itask.tdef.name],
+                            [point],
+                            tdef_names,
                             xtrigger_env
                         )
                 continue
@@ -322,18 +440,30 @@ class XtriggerManager:
                 continue
             self.t_next_call[sig] = now + ctx.intvl
             # Queue to the process pool, and record as active.
-            self.active.append(sig)
-            self.proc_pool.put_command(ctx, self.callback)
+            self.active.add(sig)
+            if self.func_pool is not None:
+                self.func_pool.put_command(ctx, self.callback)
+            else:
+                self.proc_pool.put_command(ctx, self.callback)
 
     def collate(self, itasks: List[TaskProxy]):
-        """Get list of all current xtrigger signatures.
+        """Get all current xtrigger signatures, and index the tasks waiting
+        on each unsatisfied xtrigger.
 
         Args:
             itasks (List[TaskProxy]): list of TaskProxy's
         """
-        self.all_xtrig = []
+        self.all_xtrig = set()
+        self.waiting = {}
+        # (Rendered contexts not used by the current task pool are dropped.)
+        prev_xtrigs = self._xtrigs
+        self._xtrigs = {}
         for itask in itasks:
-            self.all_xtrig += self._get_xtrigs(itask, sigs_only=True)
+            for label, satisfied in itask.state.xtriggers.items():
+                ctx, sig = self._get_xtrig(itask, label, prev_xtrigs)
+                self.all_xtrig.add(sig)
+                if not satisfied:
+                    self._add_waiting(self.waiting, itask, label, sig, ctx)
 
     def callback(self, ctx: SubFuncContext):
         """Callback for asynchronous xtrigger functions.
@@ -347,6 +477,8 @@ class XtriggerManager:
         """
         LOG.debug(ctx)
         sig = ctx.get_signature()
+        if sig not in self.active:
+            raise ValueError(f'{sig} is not active')
         self.active.remove(sig)
         try:
             satisfied, results = json.loads(ctx.out)
@@ -366,6 +498,4 @@ class XtriggerManager:
             itasks (List[TaskProxy]): list of TaskProxy's
         """
         self.collate(itasks)
-        for itask in itasks:
-            if itask.state.xtriggers:
-                self.satisfy_xtriggers(itask)
+        self._satisfy_waiting(self.waiting)
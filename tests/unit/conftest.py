@@ -25,6 +25,50 @@ from cylc.flow.cycling.loader import (
 from cylc.flow.parsec.config import ParsecConfig
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark',
+        action='store_true',
+        default=False,
+        help='Run the benchmarks (tests marked "benchmark").'
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'benchmark: slow benchmark, only run with "--benchmark"'
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless run with "--benchmark"."""
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='benchmark, run with "--benchmark"')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the results recorded by benchmarks.
+
+    Benchmarks record their results with the "record_property" fixture,
+    under the name "benchmark".
+    """
+    results = [
+        value
+        for report in terminalreporter.stats.get('passed', [])
+        for name, value in report.user_properties
+        if name == 'benchmark'
+    ]
+    if results:
+        terminalreporter.section('benchmarks')
+        for result in results:
+            terminalreporter.write_line(result)
+
+
 @pytest.fixture
 def cycling_mode(monkeypatch):
     """Set the Cylc cycling mode and return its value."""
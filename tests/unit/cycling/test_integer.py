@@ -175,6 +175,29 @@ class TestIntegerSequence(unittest.TestCase):
         sequence2.set_offset(IntegerInterval('-P1'))
         self.assertNotEqual(sequence1, sequence2)
 
+    def test_get_points(self):
+        """Test points in a window are the same as if stepped through."""
+        for sequence_string, start, stop, limit in [
+                ('R/P1!(2,3,7)', 1, 10, None),
+                ('R/P1!(2,3,7)', 3, None, 4),
+                ('R/1/P3', 2, 8, None),
+                ('R/1/P3', 2, 100, 2),
+                ('R/P2', 1, None, 5),
+                ('R1', 1, None, 5),
+                ('P1 ! P2', 1, 10, None)]:
+            sequence = IntegerSequence(sequence_string, 1, 10)
+            start = IntegerPoint(start)
+            if stop is not None:
+                stop = IntegerPoint(stop)
+            expected = []
+            point = sequence.get_first_point(start)
+            while (point and (stop is None or point <= stop) and
+                    (limit is None or len(expected) < limit)):
+                expected.append(point)
+                point = sequence.get_next_point_on_sequence(point)
+            self.assertEqual(
+                sequence.get_points(start, stop, limit), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -16,6 +16,7 @@
 
 import unittest
 from datetime import datetime
+from unittest import mock
 
 from cylc.flow.cycling.iso8601 import init, ISO8601Sequence, ISO8601Point,\
     ISO8601Interval, ingest_time
@@ -527,6 +528,64 @@ class TestISO8601Sequence(unittest.TestCase):
         self.assertFalse(
             sequence.is_on_sequence(ISO8601Point('20100809T0005')))
 
+    def test_get_points(self):
+        """Test points in a window are the same as if stepped through."""
+        init(time_zone='Z')
+        for args, start, stop, limit in [
+                (('PT1H!20000101T02Z', '20000101T00Z'),
+                 '20000101T00Z', '20000102T00Z', None),
+                (('PT6H', '20000101T00Z', '20000103T00Z'),
+                 '20000101T01Z', None, 100),
+                (('P1M', '20000131T00Z'),
+                 '20000101T00Z', '20010101T00Z', None),
+                (('R/20000101T00Z/P1D', '20000101T00Z', '20000110T00Z'),
+                 '20000105T00Z', None, 3),
+                (('R5/20000101T00Z/20000102T00Z', '20000101T00Z'),
+                 '20000101T00Z', '20000103T00Z', None),
+                (('R1', '20000101T00Z'),
+                 '20000101T00Z', None, 10)]:
+            sequence = ISO8601Sequence(*args)
+            start = ISO8601Point(start)
+            if stop is not None:
+                stop = ISO8601Point(stop)
+            expected = []
+            point = sequence.get_first_point(start)
+            while (point and (stop is None or point <= stop) and
+                    (limit is None or len(expected) < limit)):
+                expected.append(point)
+                point = sequence.get_next_point_on_sequence(point)
+            points = sequence.get_points(start, stop, limit)
+            self.assertEqual([str(p) for p in points],
+                             [str(p) for p in expected])
+            # the epochs which were counted off are right
+            self.assertEqual(
+                [p.epoch for p in points],
+                [ISO8601Point(p.value).epoch for p in points])
+
+    def test_get_points_dump_format(self):
+        """Test points in a window are the same as if stepped through, for
+        intervals truncated by the dump format."""
+        init(time_zone='Z', custom_dump_format='CCYYMMDDThhZ')
+        start = ISO8601Point('20110101T00Z')
+        for interval, values in [
+                ('PT90M', ['00', '01', '02', '03']),
+                ('PT150M', ['00', '02', '04', '06']),
+                ('PT3H', ['00', '03', '06', '09'])]:
+            sequence = ISO8601Sequence(
+                'R/20110101T00Z/%s' % interval, '20110101T00Z')
+            expected = [start]
+            for _ in range(3):
+                expected.append(
+                    sequence.get_next_point_on_sequence(expected[-1]))
+            self.assertEqual([str(p) for p in expected],
+                             ['20110101T%sZ' % value for value in values])
+            points = sequence.get_points(start, limit=4)
+            self.assertEqual([str(p) for p in points],
+                             [str(p) for p in expected])
+            self.assertEqual(
+                [p.epoch for p in points],
+                [ISO8601Point(p.value).epoch for p in points])
+
 
 class TestRelativeCyclePoint(unittest.TestCase):
     """Contains unit tests for cycle point relative to current time."""
@@ -779,5 +838,86 @@ class TestRelativeCyclePoint(unittest.TestCase):
         self.assertEqual("19951231T0630", output)
 
 
+class TestISO8601Point(unittest.TestCase):
+    """Contains unit tests for the ISO8601Point class."""
+
+    def setUp(self):
+        init(time_zone='Z')
+
+    def tearDown(self):
+        init(time_zone='Z', cycling_mode='gregorian')
+
+    def test_epoch(self):
+        """Test points are held as seconds since the Unix epoch."""
+        self.assertEqual(ISO8601Point('19700101T0000Z').epoch, 0)
+        self.assertEqual(ISO8601Point('20200101T0600+06').epoch, 1577836800)
+        self.assertEqual(ISO8601Point('19691231T235959.5Z').epoch, -1)
+        init(time_zone='Z', cycling_mode='360day')
+        self.assertEqual(ISO8601Point('19710101T0000Z').epoch, 360 * 86400)
+
+    def test_epoch_arithmetic(self):
+        """Test the epoch is carried over by exact intervals only."""
+        point = ISO8601Point('20200101T0000Z')
+        # not known until needed
+        self.assertIsNone((point + ISO8601Interval('PT6H'))._epoch)
+        epoch = point.epoch
+        for interval, expected in [
+            ('PT6H', epoch + 6 * 3600),
+            ('-P1DT1M', epoch - 86400 - 60),
+            ('P1W', epoch + 7 * 86400),
+            ('P1M', None),
+            ('PT0.5S', None),
+        ]:
+            new_point = point + ISO8601Interval(interval)
+            self.assertEqual(new_point._epoch, expected)
+            if expected is not None:
+                self.assertEqual(
+                    ISO8601Point(new_point.value).epoch, expected)
+        self.assertEqual(
+            (point - ISO8601Interval('PT1H'))._epoch, epoch - 3600)
+        # not on the grid of the (default) dump format
+        point = ISO8601Point('20200101T0000.5Z')
+        point.epoch
+        self.assertIsNone((point + ISO8601Interval('PT1H'))._epoch)
+
+    def test_epoch_arithmetic_dump_format(self):
+        """Test the epoch is not carried over if the result is truncated by
+        the dump format."""
+        init(time_zone='Z', custom_dump_format='CCYYMMDDThhZ')
+        point = ISO8601Point('20100101T00Z')
+        point.epoch
+        for _ in range(3):
+            point += ISO8601Interval('PT40M')
+            self.assertIsNone(point._epoch)
+        self.assertEqual(point.value, '20100101T00Z')
+        self.assertLess(point, ISO8601Point('20100101T01Z'))
+        point.epoch
+        point += ISO8601Interval('PT6H')
+        self.assertEqual(point._epoch, point.epoch)
+        self.assertEqual(point.epoch, ISO8601Point('20100101T06Z').epoch)
+
+    def test_cmp(self):
+        """Test points are compared by epoch without parsing."""
+        points = [
+            ISO8601Point(value)
+            for value in [
+                '20200101T0000Z', '20191231T0000-06', '20200101T0000.5Z',
+                '20200101T0000.25Z', '20200101T0000+01']]
+        for point in points:
+            point.epoch
+        with mock.patch(
+            'cylc.flow.cycling.iso8601.point_parse'
+        ) as point_parse:
+            self.assertEqual(min(points), points[1])
+            self.assertEqual(points[0], ISO8601Point('20200101T0000Z'))
+            self.assertNotEqual(points[0], points[1])
+            point_parse.assert_not_called()
+        # points in the same second are compared in full
+        self.assertLess(points[3], points[2])
+        self.assertGreater(points[3], points[0])
+        self.assertEqual(
+            sorted(points), [points[i] for i in (1, 4, 0, 3, 2)])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,8 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from glob import glob
+import os
 import tempfile
 import unittest
+from unittest import mock
 
 from cylc.flow.parsec.exceptions import IncludeFileNotFoundError, Jinja2Error
 from cylc.flow.parsec.fileparse import *
@@ -498,6 +501,118 @@ class TestFileparse(unittest.TestCase):
                 assert exc.line_num == 4
                 assert exc.line == '[[[subsection1]]]'
 
+    def test_parse_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            suite_dir = os.path.join(tmp_dir, 'suite')
+            os.makedirs(os.path.join(suite_dir, 'log'))
+            fpath = os.path.join(suite_dir, 'flow.cylc')
+            inc_fpath = os.path.join(tmp_dir, 'inc.cylc')
+            output_fname = os.path.join(tmp_dir, 'flow.cylc.processed')
+            with open(fpath, 'w') as handle:
+                handle.write(
+                    '#!jinja2\n[a]\nb={{ name }}\n%include "../inc.cylc"\n')
+            with open(inc_fpath, 'w') as handle:
+                handle.write('c=d\n')
+
+            def cached_parse(name, expect_hit):
+                with mock.patch(
+                    'cylc.flow.parsec.fileparse.read_and_proc',
+                    wraps=read_and_proc
+                ) as mock_read_and_proc:
+                    config = parse(
+                        fpath, output_fname, {'name': name}, cache_dir)
+                self.assertEqual(not mock_read_and_proc.called, expect_hit)
+                with open(output_fname) as handle:
+                    self.assertEqual(
+                        handle.read(), '[a]\nb=%s\nc=d\n' % name)
+                os.unlink(output_fname)
+                return config
+
+            config = cached_parse('x', False)
+            self.assertEqual(config, {'a': {'b': 'x', 'c': 'd'}})
+            self.assertEqual(cached_parse('x', True), config)
+            # template variables are in the cache key
+            cached_parse('y', False)
+            cached_parse('y', True)
+            # only the latest entry for each file is kept
+            cache_file_dir, = glob(os.path.join(cache_dir, '*'))
+            self.assertEqual(len(os.listdir(cache_file_dir)), 1)
+            cached_parse('x', False)
+            # run directory files are not checked
+            with open(os.path.join(suite_dir, 'log', 'foo'), 'w') as handle:
+                handle.write('foo')
+            cached_parse('x', True)
+            # changes to suite directory or include files are detected
+            with open(os.path.join(suite_dir, 'foo'), 'w') as handle:
+                handle.write('foo')
+            cached_parse('x', False)
+            cached_parse('x', True)
+            with open(inc_fpath, 'w') as handle:
+                handle.write('c=dd\n')
+            with mock.patch(
+                'cylc.flow.parsec.fileparse.read_and_proc',
+                wraps=read_and_proc
+            ) as mock_read_and_proc:
+                self.assertEqual(
+                    parse(fpath, None, {'name': 'x'}, cache_dir),
+                    {'a': {'b': 'x', 'c': 'dd'}})
+            mock_read_and_proc.assert_called_once()
+            # a corrupt cache entry is ignored
+            for name in os.listdir(cache_file_dir):
+                with open(os.path.join(cache_file_dir, name), 'w') as handle:
+                    handle.write('junk')
+            self.assertEqual(
+                parse(fpath, None, {'name': 'x'}, cache_dir),
+                {'a': {'b': 'x', 'c': 'dd'}})
+
+    def test_parse_cache_environ(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            suite_dir = os.path.join(tmp_dir, 'suite')
+            os.makedirs(suite_dir)
+            fpath = os.path.join(suite_dir, 'flow.cylc')
+            with open(fpath, 'w') as handle:
+                handle.write(
+                    '#!jinja2\n[a]\nb={{ environ["FOO"] }}\n'
+                    'c={{ environ.get("BAR", "bar") }}\n')
+
+            def cached_parse(expect_hit):
+                with mock.patch(
+                    'cylc.flow.parsec.fileparse.read_and_proc',
+                    wraps=read_and_proc
+                ) as mock_read_and_proc:
+                    config = parse(fpath, None, {}, cache_dir)
+                self.assertEqual(not mock_read_and_proc.called, expect_hit)
+                return config
+
+            with mock.patch.dict(
+                os.environ, {'FOO': 'foo', 'SSH_TTY': '/dev/pts/1'}
+            ):
+                self.assertEqual(
+                    cached_parse(False), {'a': {'b': 'foo', 'c': 'bar'}})
+                # other variables (e.g. per-session ones) are not checked
+                os.environ['SSH_TTY'] = '/dev/pts/2'
+                cached_parse(True)
+                # variables read by templates are, even if not set
+                os.environ['BAR'] = 'baz'
+                self.assertEqual(
+                    cached_parse(False), {'a': {'b': 'foo', 'c': 'baz'}})
+                cached_parse(True)
+                os.environ['FOO'] = 'qux'
+                self.assertEqual(
+                    cached_parse(False), {'a': {'b': 'qux', 'c': 'baz'}})
+                # as are variables used by Cylc and its plugins
+                os.environ['CYLC_FOO'] = 'foo'
+                cached_parse(False)
+
+            # templates which read all of the environment are not cached
+            with open(fpath, 'w') as handle:
+                handle.write(
+                    '#!jinja2\n[a]\nb={{ environ | length > 0 }}\n')
+            self.assertEqual(cached_parse(False), {'a': {'b': 'True'}})
+            cached_parse(False)
+
 
 if __name__ == '__main__':
     unittest.main()
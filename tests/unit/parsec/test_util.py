@@ -116,6 +116,35 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(str(source_2), str(target_2))
         self.assertEqual(str(source_3), str(target_3))
 
+    # --- overlay
+
+    def test_overlay(self):
+        base = OrderedDictWithDefaults()
+        base["script"] = "true"
+        base["environment"] = OrderedDictWithDefaults()
+        base["environment"]["FOO"] = "foo"
+        base["directives"] = OrderedDictWithDefaults()
+        base["directives"]["-l"] = "walltime=60"
+        source = OrderedDictWithDefaults()
+        source["environment"] = OrderedDictWithDefaults()
+        source["environment"]["BAR"] = "bar"
+        source["inherit"] = ["FAM"]
+        source["events"] = OrderedDictWithDefaults()
+        source["events"]["handlers"] = ["echo"]
+
+        expected = pdeepcopy(base)
+        replicate(expected, source)
+        target = overlay(base, source)
+        self.assertEqual(str(expected), str(target))
+        # base and source are not modified
+        self.assertEqual(list(base["environment"]), ["FOO"])
+        self.assertEqual(list(base), ["script", "environment", "directives"])
+        # unchanged sections are shared, changed sections are copied
+        self.assertIs(target["directives"], base["directives"])
+        self.assertIsNot(target["environment"], base["environment"])
+        self.assertIsNot(target["events"], source["events"])
+        self.assertIsNot(target["inherit"], source["inherit"])
+
     # --- pdeepcopy
 
     def test_pdeepcopy(self):
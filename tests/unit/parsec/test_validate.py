@@ -15,6 +15,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Unit Tests for cylc.flow.parsec.validate.ParsecValidator.coerce methods."""
 
+from time import perf_counter
+from unittest.mock import Mock
+
 import pytest
 
 from cylc.flow.parsec.config import ConfigNode as Conf
@@ -22,7 +25,7 @@ from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
 from cylc.flow.parsec.exceptions import IllegalValueError
 from cylc.flow.parsec.validate import (
     CylcConfigValidator as VDR, DurationFloat, ListValueError,
-    IllegalItemError, ParsecValidator, parsec_validate)
+    IllegalItemError, ParsecValidator, cylc_config_validate, parsec_validate)
 
 
 @pytest.fixture
@@ -660,3 +663,69 @@ def test_type_help_examples():
                 except Exception:
                     raise Exception(
                         f'Example "{example}" failed for type "{vdr}"')
+
+
+def test_coerce_cache():
+    """Test values are coerced once for each distinct raw value."""
+    with Conf('base') as spec:
+        with Conf('<section>'):
+            Conf('ints', VDR.V_INTEGER_LIST)
+            Conf('interval', VDR.V_INTERVAL)
+            Conf('xtrigger', VDR.V_XTRIGGER)
+    validator = VDR()
+    validator.coercers = {
+        key: Mock(wraps=coercer)
+        for key, coercer in validator.coercers.items()}
+    cfg = {
+        name: {
+            'ints': '1, 2',
+            'interval': 'PT1M',
+            'xtrigger': 'wall_clock():PT1M'}
+        for name in ['a', 'b', 'c']}
+    validator.validate(cfg, spec)
+    assert cfg['a']['ints'] == cfg['c']['ints'] == [1, 2]
+    # list values are not shared
+    assert cfg['a']['ints'] is not cfg['c']['ints']
+    assert cfg['c']['interval'] == DurationFloat(60)
+    assert validator.coercers[VDR.V_INTEGER_LIST].call_count == 1
+    assert validator.coercers[VDR.V_INTERVAL].call_count == 1
+    # xtriggers are labelled by key, so are not cached
+    assert validator.coercers[VDR.V_XTRIGGER].call_count == 3
+    assert cfg['c']['xtrigger'].label == 'xtrigger'
+    # bad values are still reported with the right keys
+    cfg = {'a': {'interval': 'PT1M'}, 'b': {'interval': 'bad'}}
+    with pytest.raises(IllegalValueError) as exc:
+        validator.validate(cfg, spec)
+    assert exc.value.keys == ['b', 'interval']
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_tasks', [1000, 10000])
+def test_validate_benchmark(n_tasks, record_property):
+    """Benchmark validation of a suite with many runtime namespaces."""
+    from cylc.flow.cfgspec.suite import SPEC
+    cfg = {
+        'scheduling': {
+            'initial cycle point': '20200101T00Z',
+            'graph': {'P1D': ' => '.join(
+                'foo%d' % i for i in range(n_tasks))}},
+        'runtime': {
+            'root': {
+                'script': 'echo "hello"',
+                'execution retry delays': '3*PT10M',
+                'execution time limit': 'PT1H'},
+            'FAM': {'inherit': 'root'}}}
+    for i in range(n_tasks):
+        cfg['runtime']['foo%d' % i] = {
+            'inherit': 'FAM',
+            'script': 'run-foo %d' % i,
+            'execution retry delays': 'PT1M, PT5M, 3*PT10M',
+            'submission retry delays': 'PT1M',
+            'execution time limit': 'PT%dM' % (i % 10 + 1),
+            'environment': {'N': str(i), 'NAME': 'foo'},
+            'outputs': {'x': 'x'}}
+    start = perf_counter()
+    cylc_config_validate(cfg, SPEC)
+    elapsed = perf_counter() - start
+    assert cfg['runtime']['foo1']['execution time limit'] == 120.0
+    record_property('benchmark', f'{n_tasks} tasks: {elapsed:.2f}s')
@@ -16,13 +16,18 @@
 
 import pytest
 import logging
+from time import perf_counter
+import tracemalloc
 from unittest.mock import Mock
 from tempfile import NamedTemporaryFile
 
 from cylc.flow import CYLC_LOG
+from cylc.flow.c3mro import C3
 from cylc.flow.config import SuiteConfig
 from cylc.flow.cycling import loader
 from cylc.flow.exceptions import SuiteConfigError
+from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
+from cylc.flow.parsec.util import replicate
 from cylc.flow.suite_files import SuiteFiles
 from cylc.flow.wallclock import get_utc_mode, set_utc_mode
 
@@ -545,3 +550,122 @@ def test_check_circular(opt, monkeypatch, caplog, tmp_path):
         assert msg in caplog.text
     else:
         SuiteConfig__assert_err_raised()
+
+
+def make_runtime_config(n_tasks):
+    """Return a mock config with n_tasks tasks, ready for inheritance.
+
+    Tasks are in families of 100, which inherit from "TOP", and also
+    inherit from "MIX".
+    """
+    def namespace(**items):
+        ns = OrderedDictWithDefaults()
+        for key, val in items.items():
+            if isinstance(val, dict):
+                val = namespace(**val)
+            ns[key] = val
+        return ns
+
+    runtime = OrderedDictWithDefaults()
+    runtime['root'] = namespace(
+        script='echo $FOO',
+        environment={'FOO': 'foo'},
+        directives={'-l': 'walltime=60'})
+    runtime['TOP'] = namespace(environment={'TOP': 'top'})
+    runtime['MIX'] = namespace(
+        events={'handlers': ['echo']}, environment={'FOO': 'mix'})
+    parents = {'root': [], 'TOP': ['root'], 'MIX': ['root']}
+    for ind in range(n_tasks):
+        family = f'FAM{ind // 100}'
+        if family not in runtime:
+            runtime[family] = namespace(
+                inherit=['TOP'], environment={'FAM': family})
+            parents[family] = ['TOP']
+        runtime[f'foo{ind}'] = namespace(
+            inherit=[family, 'MIX'], environment={'N': str(ind)})
+        parents[f'foo{ind}'] = [family, 'MIX']
+    c3 = C3(parents)
+    config = Mock()
+    config.cfg = {'runtime': runtime}
+    config.runtime = {
+        'linearized ancestors': {name: c3.mro(name) for name in runtime}}
+    return config
+
+
+def test_compute_inheritance():
+    """Test inheritance is the same as replicating each ancestor."""
+    config = make_runtime_config(250)
+    expected = {}
+    for name, ancestors in config.runtime['linearized ancestors'].items():
+        expected[name] = OrderedDictWithDefaults()
+        for ancestor in reversed(ancestors):
+            replicate(expected[name], config.cfg['runtime'][ancestor])
+    SuiteConfig.compute_inheritance(config)
+    runtime = config.cfg['runtime']
+    assert list(runtime) == list(expected)
+    for name, result in runtime.items():
+        assert str(result) == str(expected[name])
+    assert runtime['foo249']['environment'] == {
+        'FOO': 'mix', 'TOP': 'top', 'FAM': 'FAM2', 'N': '249'}
+    # sections not overridden are shared
+    assert runtime['foo0']['directives'] is runtime['foo249']['directives']
+    assert runtime['foo0']['environment'] is not runtime['foo1']['environment']
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_tasks', [1000, 10000])
+def test_compute_inheritance_benchmark(n_tasks, record_property):
+    """Benchmark runtime inheritance for suites of 1k and 10k tasks."""
+    config = make_runtime_config(n_tasks)
+    tracemalloc.start()
+    start = perf_counter()
+    SuiteConfig.compute_inheritance(config)
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert len(config.cfg['runtime']) == n_tasks + n_tasks // 100 + 3
+    record_property(
+        'benchmark',
+        f'{n_tasks} tasks: inheritance time {elapsed * 1e3:.0f}ms,'
+        f' peak memory {peak >> 10}KiB')
+
+
+def test_get_graph_raw(tmp_path):
+    """Test graph edges for offsets, pre-initial and closed families."""
+    flow_file = tmp_path / SuiteFiles.FLOW_FILE
+    flow_file.write_text('''
+[scheduling]
+    cycling mode = integer
+    initial cycle point = 1
+    final cycle point = 4
+    [[graph]]
+        R1 = "install => foo"
+        P1 = "foo[-P1] => foo => FAM:succeed-all => bar"
+        R/2/P2 = "bar[^] => baz"
+[runtime]
+    [[FAM]]
+    [[a, b]]
+        inherit = FAM
+    [[install, foo, bar, baz]]
+    ''')
+    config = SuiteConfig(suite='graph', fpath=flow_file)
+    assert config.get_graph_raw('2', '3', ungroup_all=True) == [
+        ('a.2', 'bar.2', None, False, False),
+        ('a.3', 'bar.3', None, False, False),
+        ('b.2', 'bar.2', None, False, False),
+        ('b.3', 'bar.3', None, False, False),
+        ('bar.2', 'baz.2', None, False, False),
+        # pre-initial dependency, only the right hand node is kept
+        ('foo.2', None, None, False, False),
+        ('foo.2', 'a.2', None, False, False),
+        ('foo.2', 'b.2', None, False, False),
+        ('foo.2', 'foo.3', None, False, False),
+        ('foo.3', 'a.3', None, False, False),
+        ('foo.3', 'b.3', None, False, False),
+    ]
+    # the first "number of cycle points" points of each sequence
+    edges = config.get_graph_raw('1', None, group_all=True)
+    assert ('FAM.3', 'bar.3', None, False, False) in edges
+    assert ('bar.1', 'baz.2', None, False, False) in edges
+    assert ('install.1', 'foo.1', None, False, False) in edges
+    assert not any(edge[1] == 'a.1' for edge in edges)
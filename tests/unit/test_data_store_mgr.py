@@ -14,7 +14,34 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from cylc.flow.data_store_mgr import task_mean_elapsed_time, parse_job_item
+from time import perf_counter
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from google.protobuf.internal.encoder import _VarintBytes
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint, IntegerSequence
+from cylc.flow.data_messages_pb2 import AllDeltas, PbFamily, PbTask
+from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    EDGES,
+    FAMILIES,
+    FAMILY_PROXIES,
+    TASK_PROXIES,
+    TASKS,
+    DataStoreMgr,
+    GhostTask,
+    encode_varint,
+    generate_checksum,
+    parse_job_item,
+    task_mean_elapsed_time,
+    update_checksum,
+)
+from cylc.flow.task_proxy import TaskProxy
+from cylc.flow.task_trigger import TaskTrigger
+from cylc.flow.taskdef import TaskDef
 
 
 def int_id():
@@ -46,3 +73,253 @@ def test_parse_job_item():
     assert name, None == (point, (tpoint, tname, tsub_num))
     tpoint, tname, tsub_num = parse_job_item(f'{name}')
     assert name, None == (None, (tpoint, tname, tsub_num))
+
+
+def test_update_checksum():
+    """Test checksums are order independent and can be updated."""
+    checksum = generate_checksum(['a', 'b', 'c'])
+    assert generate_checksum(['c', 'a', 'b']) == checksum
+    assert generate_checksum([]) == 0
+    assert update_checksum(checksum, ['b'], ['d', 'e']) == (
+        generate_checksum(['a', 'c', 'd', 'e']))
+    assert update_checksum(checksum, ['a', 'b', 'c'], []) == 0
+
+
+def make_data_store_mgr(n_families):
+    """Return a data store manager with n_families family elements."""
+    data_store_mgr = DataStoreMgr(SimpleNamespace(owner='me', suite='foo'))
+    for ind in range(n_families):
+        f_id = f'me|foo|f{ind}'
+        data_store_mgr.added[FAMILIES][f_id] = PbFamily(
+            id=f_id, stamp=f'{f_id}@0')
+    data_store_mgr.apply_deltas()
+    data_store_mgr.clear_deltas()
+    return data_store_mgr
+
+
+def test_apply_deltas_checksum():
+    """Test checksums are kept up to date with the data store."""
+    data_store_mgr = make_data_store_mgr(10)
+    families = data_store_mgr.data[data_store_mgr.workflow_id][FAMILIES]
+
+    def store_checksum():
+        return generate_checksum(f.stamp for f in families.values())
+
+    assert data_store_mgr.checksums[FAMILIES] == store_checksum()
+    data_store_mgr.updated[FAMILIES]['me|foo|f1'] = PbFamily(
+        id='me|foo|f1', stamp='me|foo|f1@1')
+    data_store_mgr.added[FAMILIES]['me|foo|new'] = PbFamily(
+        id='me|foo|new', stamp='me|foo|new@1')
+    data_store_mgr.deltas[FAMILIES].pruned.extend(['me|foo|f2', 'me|foo|x'])
+    data_store_mgr.apply_deltas()
+    assert len(families) == 10
+    assert families['me|foo|f1'].stamp == 'me|foo|f1@1'
+    assert data_store_mgr.checksums[FAMILIES] == store_checksum()
+    assert data_store_mgr.deltas[FAMILIES].checksum == store_checksum()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_families', [1000, 30000])
+def test_apply_deltas_benchmark(n_families, record_property):
+    """Benchmark applying a one element delta to data stores of any size."""
+    data_store_mgr = make_data_store_mgr(n_families)
+    n_deltas = 100
+    elapsed = 0
+    for ind in range(n_deltas):
+        data_store_mgr.updated[FAMILIES]['me|foo|f0'] = PbFamily(
+            id='me|foo|f0', stamp=f'me|foo|f0@{ind}')
+        start = perf_counter()
+        data_store_mgr.apply_deltas()
+        elapsed += perf_counter() - start
+        data_store_mgr.clear_deltas()
+    families = data_store_mgr.data[data_store_mgr.workflow_id][FAMILIES]
+    assert data_store_mgr.checksums[FAMILIES] == generate_checksum(
+        f.stamp for f in families.values())
+    record_property(
+        'benchmark',
+        f'{n_families} families: mean apply_deltas time'
+        f' {elapsed / n_deltas * 1e6:.1f}us')
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 300, 2 ** 32])
+def test_encode_varint(value):
+    """Test protobuf varint encoding."""
+    assert _VarintBytes(value) == encode_varint(value)
+
+
+def test_get_publish_deltas():
+    """Test the deltas are serialised once, including in ALL_DELTAS."""
+    data_store_mgr = make_data_store_mgr(0)
+    for ind in range(200):
+        f_id = f'me|foo|f{ind}'
+        data_store_mgr.added[FAMILIES][f_id] = PbFamily(
+            id=f_id, stamp=f'{f_id}@0')
+    data_store_mgr.deltas[EDGES].pruned.append('me|foo|e0')
+    data_store_mgr.apply_deltas()
+    publish_deltas = data_store_mgr.get_publish_deltas()
+    assert [topic for topic, _ in publish_deltas] == [
+        EDGES.encode(), FAMILIES.encode(), ALL_DELTAS.encode()]
+    expected = AllDeltas()
+    for topic, delta_bytes in publish_deltas[:-1]:
+        delta = data_store_mgr.deltas[topic.decode()]
+        assert delta_bytes == delta.SerializeToString()
+        getattr(expected, topic.decode()).CopyFrom(delta)
+    assert AllDeltas.FromString(publish_deltas[-1][1]) == expected
+
+
+@pytest.fixture
+def window_data_store_mgr(cycling_mode):
+    """Return a data store manager, and a function to create pool tasks.
+
+    Graph: "P1 = x[-P1] => x => y0 & y1 & ... & y9 => z"
+
+    """
+    cycling_mode(integer=True)
+    seq = IntegerSequence('P1', 1)
+    tdefs = {
+        name: TaskDef(name, {}, 'live', IntegerPoint(1))
+        for name in ['x', 'z'] + [f'y{ind}' for ind in range(10)]}
+    edges = [('x', 'x', '-P1')]
+    for ind in range(10):
+        edges.extend([('x', f'y{ind}', None), (f'y{ind}', 'z', None)])
+    for parent, child, offset in edges:
+        trigger = TaskTrigger(parent, offset, 'succeeded')
+        tdefs[parent].add_graph_child(trigger, child, seq)
+        tdefs[child].add_graph_parent(trigger, parent, seq)
+    for tdef in tdefs.values():
+        tdef.add_sequence(seq)
+    data_store_mgr = DataStoreMgr(SimpleNamespace(
+        owner='me', suite='foo',
+        config=SimpleNamespace(get_taskdef=tdefs.get)))
+    data = data_store_mgr.data[data_store_mgr.workflow_id]
+    data[FAMILIES]['me|foo|root'] = PbFamily(
+        id='me|foo|root', name='root', depth=0)
+    data_store_mgr.ancestors['root'] = ['root']
+    for name in tdefs:
+        data[TASKS][f'me|foo|{name}'] = PbTask(
+            id=f'me|foo|{name}', name=name, depth=1, namespace=[name])
+        data_store_mgr.ancestors[name] = [name, 'root']
+
+    def _make_itask(point):
+        return TaskProxy(tdefs['x'], IntegerPoint(point), 'a')
+
+    return data_store_mgr, _make_itask
+
+
+def test_increment_graph_window(window_data_store_mgr):
+    """Test ghost nodes are created without a TaskProxy where possible."""
+    data_store_mgr, make_itask = window_data_store_mgr
+    data_store_mgr.n_edge_distance = 2
+    with patch.object(
+        GhostTask, 'get_task_proxy', autospec=True,
+        side_effect=GhostTask.get_task_proxy
+    ) as get_task_proxy:
+        data_store_mgr.increment_graph_window(make_itask(2))
+    task_proxies = data_store_mgr.added[TASK_PROXIES]
+    assert set(task_proxies) == {
+        f'me|foo|{point}|{name}'
+        for point, name in [(1, 'x'), (2, 'x'), (3, 'x'), (4, 'x'), (2, 'z')]
+        + [(point, f'y{ind}') for point in (1, 2, 3) for ind in range(10)]}
+    # one TaskProxy per new node (not the pool node)
+    assert get_task_proxy.call_count == len(task_proxies) - 1
+    assert data_store_mgr.ghost_tasks == {}
+    assert len(data_store_mgr.added[EDGES]) == 43
+
+    # the nodes are in the store: no new task proxies are needed
+    data_store_mgr.apply_deltas()
+    data_store_mgr.clear_deltas()
+    get_task_proxy.reset_mock()
+    with patch.object(
+        GhostTask, 'get_task_proxy', autospec=True,
+        side_effect=GhostTask.get_task_proxy
+    ) as get_task_proxy:
+        data_store_mgr.increment_graph_window(make_itask(2))
+    get_task_proxy.assert_not_called()
+
+
+def test_update_family_proxies(window_data_store_mgr):
+    """Test family state totals are counted as task states change."""
+    data_store_mgr, make_itask = window_data_store_mgr
+    # put the y tasks in family "YS"
+    data = data_store_mgr.data[data_store_mgr.workflow_id]
+    data[FAMILIES]['me|foo|YS'] = PbFamily(
+        id='me|foo|YS', name='YS', depth=1)
+    data_store_mgr.ancestors['YS'] = ['YS', 'root']
+    for ind in range(10):
+        data_store_mgr.ancestors[f'y{ind}'] = [f'y{ind}', 'YS', 'root']
+    data_store_mgr.increment_graph_window(make_itask(2))
+    data_store_mgr.update_family_proxies()
+
+    def totals():
+        """Return the updated family proxy and workflow state totals."""
+        fp_updated = data_store_mgr.updated[FAMILY_PROXIES]
+        return (
+            {
+                fp_id: (dict(fp_delta.state_totals), fp_delta.is_held_total)
+                for fp_id, fp_delta in fp_updated.items()
+                if fp_id.endswith('|2|YS') or fp_id.endswith('|2|root')
+            },
+            dict(data_store_mgr.workflow_state_totals),
+            data_store_mgr.workflow_held_total)
+
+    tp_states = [
+        tproxy.state
+        for tproxy in data_store_mgr.added[TASK_PROXIES].values()]
+    assert totals() == (
+        {
+            'me|foo|2|YS': ({'waiting': 10}, 0),
+            'me|foo|2|root': ({'waiting': 11}, 0),
+        },
+        {state: tp_states.count(state) for state in tp_states},
+        0)
+    assert data_store_mgr.state_update_families == set()
+
+    # one task changes: only its ancestors are flagged and updated
+    itask = SimpleNamespace(
+        tdef=SimpleNamespace(name='y0'),
+        point=IntegerPoint(2),
+        state=SimpleNamespace(status='running', is_held=True))
+    data_store_mgr.delta_task_state(itask)
+    data_store_mgr.delta_task_held(itask)
+    assert data_store_mgr.state_update_families == {
+        'me|foo|2|YS', 'me|foo|2|root'}
+    data_store_mgr.update_family_proxies()
+    fam_totals, workflow_totals, workflow_held_total = totals()
+    assert fam_totals == {
+        'me|foo|2|YS': ({'waiting': 9, 'running': 1}, 1),
+        'me|foo|2|root': ({'waiting': 10, 'running': 1}, 1),
+    }
+    assert workflow_totals['running'] == 1
+    assert workflow_held_total == 1
+
+    # repeated updates are not counted twice
+    data_store_mgr.delta_task_state(itask)
+    data_store_mgr.delta_task_held(itask)
+    data_store_mgr.update_family_proxies()
+    assert totals()[0] == fam_totals
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_edge_distance', [1, 2, 3, 4])
+def test_increment_graph_window_benchmark(
+    window_data_store_mgr, n_edge_distance, record_property
+):
+    """Benchmark graph window generation for n-edge distances 1 to 4."""
+    data_store_mgr, make_itask = window_data_store_mgr
+    data_store_mgr.n_edge_distance = n_edge_distance
+    n_points = 20
+    itasks = [make_itask(point) for point in range(1, n_points + 1)]
+    tracemalloc.start()
+    start = perf_counter()
+    for itask in itasks:
+        data_store_mgr.increment_graph_window(itask)
+        data_store_mgr.apply_deltas()
+        data_store_mgr.clear_deltas()
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    record_property(
+        'benchmark',
+        f'n={n_edge_distance}: mean graph window time'
+        f' {elapsed / n_points * 1000:.2f}ms,'
+        f' peak memory {peak / 1024:.0f}KiB')
@@ -14,8 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from time import perf_counter
+import tracemalloc
 import unittest
 
+import pytest
+
 from cylc.flow.exceptions import GraphParseError, ParamExpandError
 from cylc.flow.graph_parser import GraphParser
 
@@ -499,6 +503,81 @@ class TestGraphParser(unittest.TestCase):
         }
         self.assertEqual(gp.triggers, triggers)
 
+    def test_callback(self):
+        """Test triggers are passed to the callback as they are parsed."""
+        graph = """
+            foo<m> => bar<m> & baz
+            bar<m-1> => bar<m>
+            FAM:succeed-all => qux
+            foo<m> => bar<m>
+        """
+        params = {'m': [0, 1, 2]}
+        templates = {'m': '_m%(m)s'}
+        family_map = {'FAM': ['f1', 'f2']}
+        gp = GraphParser(family_map, (params, templates))
+        gp.parse_graph(graph)
+        results = []
+        gp_cb = GraphParser(
+            family_map, (params, templates),
+            lambda *args: results.append(args))
+        gp_cb.parse_graph(graph)
+        self.assertEqual(gp_cb.triggers, {})
+        self.assertEqual(gp_cb.original, {})
+        # each trigger is passed on once only
+        self.assertEqual(
+            len(results), len({(right, expr) for right, expr, *_ in results}))
+        self.assertEqual(
+            {(right, expr): (trigs, suicide)
+             for right, expr, trigs, suicide, _ in results},
+            {(right, expr): val
+             for right, exprs in gp.triggers.items()
+             for expr, val in exprs.items()})
+        self.assertEqual(
+            {(right, expr): orig for right, expr, _, _, orig in results},
+            {(right, expr): orig
+             for right, exprs in gp.original.items()
+             for expr, orig in exprs.items()})
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_edges', [10000, 100000])
+def test_parse_graph_benchmark(n_edges, record_property):
+    """Benchmark graph parsing time and peak memory."""
+    n_values = n_edges // 10
+    params = {'m': list(range(n_values))}
+    templates = {'m': '_m%(m)s'}
+    # 10 edges per parameter value.
+    graph = '\n'.join(
+        [
+            'foo<m-1> => foo<m> => bar<m> => baz<m> => qux<m>',
+            'qux<m> => a<m> & b<m>',
+            'a<m> | b<m> => c<m>',
+        ] +
+        ['pre%d => mid%d => post%d' % (i, i, i) for i in range(n_values)])
+    triggers = set()
+
+    def parse():
+        triggers.clear()
+        GraphParser(
+            parameters=(params, templates),
+            callback=lambda right, expr, *_: triggers.add((right, expr))
+        ).parse_graph(graph)
+
+    start = perf_counter()
+    parse()
+    elapsed = perf_counter() - start
+    # (tracing slows things down, so measure memory separately)
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert ('c_m%d' % (n_values - 1), 'a_m%d:succeed|b_m%d:succeed' % (
+        n_values - 1, n_values - 1)) in triggers
+    record_property(
+        'benchmark',
+        f'{n_edges} edges: {elapsed:.2f}s, '
+        f'peak memory {peak / 1024 ** 2:.1f}MB')
+
 
 if __name__ == "__main__":
     unittest.main()
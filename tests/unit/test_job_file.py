@@ -21,6 +21,7 @@ import io
 import os
 import pytest
 from tempfile import TemporaryFile, NamedTemporaryFile
+from time import perf_counter
 from unittest import mock
 
 from cylc.flow import __version__
@@ -154,6 +155,167 @@ def test_write(mocked_get_remote_suite_run_dir, fixture_get_platform):
         assert(fake_file.getvalue() == expected)
 
 
+def _get_job(job_dir, task_id, script, platform, **kwargs):
+    """Return a (local_job_file_path, job_conf) tuple for write_jobs."""
+    job_conf = {
+        "platform": platform,
+        "task_id": task_id,
+        "suite_name": "farm_noises",
+        "work_d": "farm_noises/work_d",
+        "remote_suite_d": "remote/suite/dir",
+        "uuid_str": "neigh",
+        "environment": {},
+        "directives": {},
+        "job_d": f"1/{task_id}/01",
+        "try_num": 1,
+        "flow_label": "aZ",
+        "param_var": {},
+        "execution_time_limit": None,
+        "namespace_hierarchy": ["root", task_id],
+        "dependencies": [],
+        "init-script": "",
+        "env-script": "",
+        "err-script": "",
+        "pre-script": "",
+        "script": script,
+        "post-script": "",
+        "exit-script": "",
+    }
+    job_conf.update(kwargs)
+    return str(job_dir / task_id), job_conf
+
+
+@mock.patch.dict(
+    "os.environ", {'CYLC_SUITE_DEF_PATH': 'cylc/suite/def/path'})
+@mock.patch("cylc.flow.job_file.get_remote_suite_run_dir")
+def test_write_jobs(
+    mocked_get_remote_suite_run_dir, fixture_get_platform, tmp_path
+):
+    """Test job files are written and syntax checked as a batch."""
+    mocked_get_remote_suite_run_dir.return_value = "run/dir"
+    platform = fixture_get_platform()
+    jobs = [
+        _get_job(tmp_path, 'foo', 'echo hello', platform),
+        _get_job(tmp_path, 'bar', 'echo hello', platform),
+        _get_job(tmp_path, 'baz', 'if', platform),
+        _get_job(tmp_path, 'qux', 'if', platform),
+    ]
+    writer = JobFileWriter()
+    with mock.patch(
+        "cylc.flow.job_file.Popen", wraps=cylc.flow.job_file.Popen
+    ) as mocked_popen:
+        errors = writer.write_jobs(jobs)
+    # one check for each good job script, one check for each bad job script
+    assert mocked_popen.call_count == 3
+    assert errors[:2] == [None, None]
+    assert all(isinstance(exc, RuntimeError) for exc in errors[2:])
+    for task_id in ('foo', 'bar'):
+        assert os.access(tmp_path / task_id, os.X_OK)
+    # bad job scripts are left behind for debugging
+    for task_id in ('baz', 'qux'):
+        assert not (tmp_path / task_id).exists()
+        assert (tmp_path / f'{task_id}.tmp').exists()
+
+    # good job scripts do not need to be checked again
+    with mock.patch("cylc.flow.job_file.Popen") as mocked_popen:
+        assert writer.write_jobs(
+            [_get_job(tmp_path, 'pub', 'echo hello', platform)]) == [None]
+    mocked_popen.assert_not_called()
+    with pytest.raises(RuntimeError):
+        writer.write(*_get_job(tmp_path, 'quux', 'if', platform))
+
+
+@mock.patch.dict(
+    "os.environ", {'CYLC_SUITE_DEF_PATH': 'cylc/suite/def/path'})
+@mock.patch("cylc.flow.job_file.get_remote_suite_run_dir")
+def test_write_jobs_max_syntax_checks(
+    mocked_get_remote_suite_run_dir, fixture_get_platform, tmp_path,
+    monkeypatch
+):
+    """Test the number of concurrent syntax checks is limited."""
+    mocked_get_remote_suite_run_dir.return_value = "run/dir"
+    monkeypatch.setattr(JobFileWriter, 'MAX_SYNTAX_CHECKS', 2)
+    platform = fixture_get_platform()
+    jobs = [
+        _get_job(tmp_path, f'foo{i}', f'echo {i}', platform)
+        for i in range(5)]
+    popen = cylc.flow.job_file.Popen
+    procs = []
+    n_running = []
+
+    def _popen(*args, **kwargs):
+        procs.append(popen(*args, **kwargs))
+        n_running.append(
+            sum(1 for proc in procs if proc.returncode is None))
+        return procs[-1]
+
+    with mock.patch("cylc.flow.job_file.Popen", side_effect=_popen):
+        assert JobFileWriter().write_jobs(jobs) == [None] * 5
+    assert n_running == [1, 2, 2, 2, 2]
+
+
+@mock.patch.dict(
+    "os.environ", {'CYLC_SUITE_DEF_PATH': 'cylc/suite/def/path'})
+@mock.patch("cylc.flow.job_file.get_remote_suite_run_dir")
+def test_write_jobs_templates(
+    mocked_get_remote_suite_run_dir, fixture_get_platform, tmp_path
+):
+    """Test invariant job script sections are rendered once per template."""
+    mocked_get_remote_suite_run_dir.return_value = "run/dir"
+    platform = fixture_get_platform()
+    writer = JobFileWriter()
+    jobs = [
+        _get_job(tmp_path, 'foo', 'echo $X', platform, try_num=1),
+        _get_job(tmp_path, 'bar', 'echo $X', platform, try_num=2),
+        # e.g. a broadcast
+        _get_job(
+            tmp_path, 'baz', 'echo $X', platform, environment={'X': 'x'}),
+    ]
+    with mock.patch.object(
+        writer, '_write_runtime_environment',
+        wraps=writer._write_runtime_environment
+    ) as mocked_write:
+        assert writer.write_jobs(jobs, check_syntax=False) == [None] * 3
+    assert mocked_write.call_count == 2
+    assert len(writer.templates) == 2
+    assert 'X="x"' not in (tmp_path / 'foo').read_text()
+    assert 'CYLC_TASK_TRY_NUMBER=2' in (tmp_path / 'bar').read_text()
+    assert 'X="x"' in (tmp_path / 'baz').read_text()
+    assert mocked_get_remote_suite_run_dir.call_count == 2
+    writer.set_suite_env({'CYLC_SUITE_NAME': 'farm_noises'})
+    assert not writer.templates
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_jobs', [1000, 10000])
+@mock.patch.dict(
+    "os.environ", {'CYLC_SUITE_DEF_PATH': 'cylc/suite/def/path'})
+@mock.patch("cylc.flow.job_file.get_remote_suite_run_dir")
+def test_write_jobs_benchmark(
+    mocked_get_remote_suite_run_dir, fixture_get_platform, tmp_path,
+    n_jobs, record_property
+):
+    """Benchmark writing the job files of many tasks."""
+    mocked_get_remote_suite_run_dir.return_value = "run/dir"
+    platform = fixture_get_platform()
+    writer = JobFileWriter()
+    writer.set_suite_env({'CYLC_SUITE_NAME': 'farm_noises'})
+    jobs = [
+        _get_job(
+            tmp_path, f'foo{i % 10}.{i}', f'run-foo {i % 10}', platform,
+            environment={
+                f'VAR{j}': f'~/foo/%(i)s/{j}' for j in range(20)},
+            param_var={'i': i % 10},
+            dependencies=[f'bar{i % 10}.{i}'])
+        for i in range(n_jobs)]
+    start = perf_counter()
+    errors = writer.write_jobs(jobs)
+    elapsed = perf_counter() - start
+    assert errors == [None] * n_jobs
+    assert len(writer.templates) == len(writer.syntax_ok_keys) == 10
+    record_property('benchmark', f'{n_jobs} job files: {elapsed:.2f}s')
+
+
 @pytest.mark.parametrize(
     'job_conf,expected',
     [
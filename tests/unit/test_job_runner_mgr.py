@@ -0,0 +1,113 @@
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import re
+from threading import Lock
+from time import sleep
+
+import pytest
+
+from cylc.flow.job_runner_mgr import JobRunnerManager
+
+
+class SlowJobRunnerHandler:
+    """A job runner whose submit command takes a while."""
+
+    REC_ID_FROM_SUBMIT_OUT = re.compile(r'\A(?P<id>\d+)\Z')
+
+    def __init__(self):
+        self.lock = Lock()
+        self.n_running = 0
+        self.max_running = 0
+
+    def submit(self, job_file_path, submit_opts):
+        with self.lock:
+            self.n_running += 1
+            self.max_running = max(self.max_running, self.n_running)
+        sleep(0.1)
+        with self.lock:
+            self.n_running -= 1
+        # the job ID is the cycle point
+        return 0, job_file_path.split('/')[-4], ''
+
+
+@pytest.fixture
+def job_log_root(tmp_path, monkeypatch):
+    """Return the job log root of 8 jobs on the "slow" job runner."""
+    monkeypatch.setitem(
+        JobRunnerManager._INSTANCES, 'slow', SlowJobRunnerHandler())
+    job_log_root = tmp_path / 'log' / 'job'
+    for point in range(1, 9):
+        job_log_dir = job_log_root / str(point) / 'foo' / '01'
+        job_log_dir.mkdir(parents=True)
+        (job_log_dir / 'job').write_text(
+            f'{JobRunnerManager.LINE_PREFIX_JOB_RUNNER_NAME}slow\n')
+    # a job with no job runner
+    job_log_dir = job_log_root / '9' / 'foo' / '01'
+    job_log_dir.mkdir(parents=True)
+    (job_log_dir / 'job').write_text('')
+    return job_log_root
+
+
+@pytest.mark.parametrize('max_parallel', [1, 4])
+def test_jobs_submit(job_log_root, max_parallel, capsys):
+    """Test jobs are submitted concurrently, up to the limit."""
+    job_log_dirs = [f'{point}/foo/01' for point in range(1, 10)]
+    JobRunnerManager(env=[]).jobs_submit(
+        str(job_log_root), job_log_dirs, max_parallel=max_parallel)
+    assert JobRunnerManager._INSTANCES['slow'].max_running == max_parallel
+    # results are reported in the original order
+    summary = [
+        line.split('|', 1)[1]
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith(JobRunnerManager.OUT_PREFIX_SUMMARY)]
+    assert summary == [
+        f'{point}/foo/01|0|{point}' for point in range(1, 9)
+    ] + ['9/foo/01|1|']
+    assert (job_log_root / '1' / 'foo' / '01' / 'job.status').read_text(
+    ).startswith(
+        f'{JobRunnerManager.CYLC_JOB_RUNNER_NAME}=slow\n'
+        f'{JobRunnerManager.CYLC_JOB_ID}=1\n')
+
+
+@pytest.mark.parametrize('max_parallel', [1, 4])
+def test_jobs_submit_error(job_log_root, max_parallel, capsys, monkeypatch):
+    """Test all jobs are reported if a job submission raises."""
+    handler = JobRunnerManager._INSTANCES['slow']
+    submit = handler.submit
+
+    def _submit(job_file_path, submit_opts):
+        if job_file_path.split('/')[-4] == '3':
+            raise OSError('oops')
+        return submit(job_file_path, submit_opts)
+
+    monkeypatch.setattr(handler, 'submit', _submit)
+    job_log_dirs = [f'{point}/foo/01' for point in range(1, 10)]
+    JobRunnerManager(env=[]).jobs_submit(
+        str(job_log_root), job_log_dirs, max_parallel=max_parallel)
+    out = capsys.readouterr().out.splitlines()
+    summary = [
+        line.split('|', 1)[1]
+        for line in out
+        if line.startswith(JobRunnerManager.OUT_PREFIX_SUMMARY)]
+    assert summary == [
+        f'{point}/foo/01|1|' if point == 3 else f'{point}/foo/01|0|{point}'
+        for point in range(1, 9)
+    ] + ['9/foo/01|1|']
+    assert any(
+        line.startswith(JobRunnerManager.OUT_PREFIX_COMMAND)
+        and line.endswith('|3/foo/01|[STDERR] OSError: oops')
+        for line in out)
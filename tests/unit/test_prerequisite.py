@@ -0,0 +1,89 @@
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.exceptions import TriggerExpressionError
+from cylc.flow import prerequisite
+from cylc.flow.prerequisite import Prerequisite
+
+
+def make_prereq(point, expr='(a.%(p)s succeeded | b.%(p)s succeeded) & '
+                'c.%(p)s succeeded'):
+    """Return a conditional prerequisite on a, b and c at point."""
+    prereq = Prerequisite(IntegerPoint(point))
+    for name in ('a', 'b', 'c'):
+        prereq.add(name, point, 'succeeded')
+    prereq.set_condition(expr % {'p': point})
+    return prereq
+
+
+def test_conditional_is_satisfied(cycling_mode):
+    """Test conditional expressions are evaluated correctly."""
+    cycling_mode(integer=True)
+    prereq = make_prereq(1)
+    assert not prereq.is_satisfied()
+    assert prereq.satisfy_me({('a', '1', 'succeeded')}) == {
+        ('a', '1', 'succeeded')}
+    assert not prereq.is_satisfied()
+    prereq.satisfy_me({('c', '1', 'succeeded'), ('x', '1', 'succeeded')})
+    assert prereq.is_satisfied()
+    prereq.set_not_satisfied()
+    assert not prereq.is_satisfied()
+    prereq.set_satisfied()
+    assert prereq.is_satisfied()
+    assert prereq.get_raw_conditional_expression() == (
+        '(a.1 succeeded | b.1 succeeded) & c.1 succeeded')
+
+
+def test_conditional_compiled_once(cycling_mode):
+    """Test expressions are compiled once and evaluated once per call."""
+    cycling_mode(integer=True)
+    prerequisite._COMPILED_CONDITIONS.clear()
+    with mock.patch(
+        'cylc.flow.prerequisite.compile', create=True, wraps=compile
+    ) as mock_compile:
+        prereqs = [make_prereq(point) for point in range(1, 4)]
+    # the same dependency at different cycle points shares the compiled code
+    assert mock_compile.call_count == 1
+    assert len({id(p._conditional_code) for p in prereqs}) == 1
+
+    prereq = prereqs[0]
+    with mock.patch.object(
+        Prerequisite, '_conditional_is_satisfied', autospec=True,
+        side_effect=Prerequisite._conditional_is_satisfied
+    ) as evaluate:
+        prereq.satisfy_me({
+            ('a', '1', 'succeeded'),
+            ('b', '1', 'succeeded'),
+            ('c', '1', 'succeeded')})
+        assert evaluate.call_count == 1
+        prereq.satisfy_me({('x', '1', 'succeeded')})
+        assert evaluate.call_count == 1
+    assert prereq.is_satisfied()
+    assert not prereqs[1].is_satisfied()
+
+
+def test_conditional_syntax_error(cycling_mode):
+    """Test bad expressions raise TriggerExpressionError on evaluation."""
+    cycling_mode(integer=True)
+    prereq = make_prereq(1, '(a.%(p)s succeeded | b.%(p)s succeeded')
+    with pytest.raises(TriggerExpressionError) as exc:
+        prereq.is_satisfied()
+    assert 'a.1 succeeded | b.1 succeeded' in str(exc.value)
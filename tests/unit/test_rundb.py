@@ -17,8 +17,11 @@
 import contextlib
 import os
 import sqlite3
+from time import perf_counter
 import unittest
 
+import pytest
+
 from tempfile import mktemp
 from unittest import mock
 
@@ -126,5 +129,67 @@ def test_remove_columns():
         assert data == [('PUB',)]
 
 
+def test_persistent_connection(tmp_path):
+    """Test a persistent connection is reused and uses WAL journaling."""
+    db_file = str(tmp_path / 'db')
+    dao = CylcSuiteDAO(db_file, is_persistent=True)
+    conn = dao.connect()
+    for i in range(3):
+        dao.add_insert_item(CylcSuiteDAO.TABLE_SUITE_PARAMS, [str(i), i])
+        dao.execute_queued_items()
+        assert dao.conn is conn
+    assert conn.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+    dao.checkpoint()
+    assert os.path.getsize(db_file + '-wal') == 0
+    dao.close()
+
+
+def test_persistent_connection_file_removed(tmp_path):
+    """Test a persistent connection notices removal of the database."""
+    db_file = str(tmp_path / 'db')
+    dao = CylcSuiteDAO(db_file, is_persistent=True)
+    os.unlink(db_file)
+    # nothing to write, nothing to check
+    dao.execute_queued_items()
+    dao.add_insert_item(CylcSuiteDAO.TABLE_SUITE_PARAMS, ['a', 1])
+    with pytest.raises(sqlite3.OperationalError, match='has been removed'):
+        dao.execute_queued_items()
+    assert dao.conn is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('n_rows', [1000, 10000])
+def test_flush_latency(tmp_path, n_rows, record_property):
+    """Benchmark flushing queued rows with and without reconnecting.
+
+    Reports the mean latency of a flush for each connection mode.
+    """
+    n_flushes = 5
+    results = {}
+    for is_persistent in (False, True):
+        dao = CylcSuiteDAO(
+            str(tmp_path / f'db-{is_persistent}'),
+            is_persistent=is_persistent)
+        elapsed = 0
+        for flush in range(n_flushes):
+            for row in range(n_rows):
+                dao.add_insert_item(
+                    CylcSuiteDAO.TABLE_TASK_POOL,
+                    [str(row), 'foo', str(flush), 'waiting', 0])
+            start = perf_counter()
+            dao.execute_queued_items()
+            elapsed += perf_counter() - start
+        assert dao.connect().execute(
+            'SELECT COUNT(*) FROM task_pool').fetchone() == (
+                n_rows * n_flushes,)
+        dao.close()
+        results[is_persistent] = elapsed / n_flushes
+    record_property(
+        'benchmark',
+        f'{n_rows} rows: mean flush latency'
+        f' {results[False] * 1000:.2f}ms (reconnect),'
+        f' {results[True] * 1000:.2f}ms (persistent)')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,14 +14,21 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+import json
+import os
 from tempfile import NamedTemporaryFile, SpooledTemporaryFile, TemporaryFile,\
     TemporaryDirectory
+from time import sleep, time
 import unittest
 
 from pathlib import Path
 
-from cylc.flow.subprocctx import SubProcContext
-from cylc.flow.subprocpool import SubProcPool, _XTRIG_FUNCS, get_func
+import pytest
+
+from cylc.flow.subprocctx import SubFuncContext, SubProcContext
+from cylc.flow.subprocpool import (
+    AsyncSubProcPool, SubFuncPool, SubProcPool, _XTRIG_FUNCS, get_func)
 
 
 class TestSubProcPool(unittest.TestCase):
@@ -195,5 +202,185 @@ class TestSubProcPool(unittest.TestCase):
                 get_func("the_sword", temp_dir)
 
 
+@pytest.fixture
+def async_pool(mock_glbl_cfg):
+    """Return an AsyncSubProcPool of size 2, with a 5 second timeout."""
+    mock_glbl_cfg(
+        'cylc.flow.subprocpool.glbl_cfg',
+        '''
+            [scheduler]
+                process pool size = 2
+        '''
+    )
+    pool = AsyncSubProcPool()
+    pool.proc_pool_timeout = 5
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_async_pool(async_pool):
+    """Test commands run, and call back on exit, without calling process."""
+    done = []
+
+    def callback(ctx, label):
+        done.append((label, ctx.ret_code, ctx.out, ctx.err))
+
+    async_pool.put_command(
+        SubProcContext('x', ['bash', '-c', 'sleep 0.5; echo slow']),
+        callback, ['slow'])
+    async_pool.put_command(
+        SubProcContext('x', 'echo 喵; echo err >&2; exit 3', shell=True),
+        callback, ['fast'])
+    async_pool.put_command(
+        SubProcContext('x', ['cat'], stdin_str='queued'), callback, ['cat'])
+    # pool size 2: the third command is queued
+    assert len(async_pool.runnings) == 2
+    assert len(async_pool.queuings) == 1
+    await async_pool.join()
+    assert not async_pool.is_not_done()
+    assert done == [
+        ('fast', 3, '喵\n', 'err\n'),
+        ('cat', 0, 'queued', None),
+        ('slow', 0, 'slow\n', None)]
+
+
+@pytest.mark.asyncio
+async def test_async_pool_timeout_and_terminate(async_pool):
+    """Test commands are killed on timeout, and on terminate."""
+    done = []
+    async_pool.proc_pool_timeout = 0.2
+    async_pool.put_command(
+        SubProcContext('x', ['sleep', '10']), done.append)
+    start = time()
+    await async_pool.join()
+    assert time() - start < 5
+    assert done[0].ret_code == -9
+    assert 'killed on timeout' in done[0].err
+
+    async_pool.proc_pool_timeout = 10
+    async_pool.put_command(
+        SubProcContext('x', ['sleep', '10']), done.append)
+    await asyncio.sleep(0.1)
+    async_pool.terminate()
+    await async_pool.join()
+    assert done[1].ret_code == -9
+    # no more commands after terminate
+    async_pool.put_command(SubProcContext('x', ['true']), done.append)
+    assert done[2].ret_code == AsyncSubProcPool.RET_CODE_SUITE_STOPPING
+
+
+@pytest.mark.asyncio
+async def test_async_pool_launch_error(async_pool):
+    """Test failure to launch a command."""
+    done = []
+    async_pool.put_command(
+        SubProcContext('x', ['no-such-command-xyz']), done.append)
+    await async_pool.join()
+    assert done[0].ret_code == 1
+    assert 'No such file' in done[0].err
+
+
+@pytest.fixture
+def func_pool(tmp_path):
+    """Return a SubFuncPool of size 2, with local xtrigger functions."""
+    lib_dir = tmp_path / 'lib' / 'python'
+    lib_dir.mkdir(parents=True)
+    for name, body in [
+        ('echo', 'print("noise"); return True, {"x": x, "pid": os.getpid()}'),
+        ('snooze', 'time.sleep(x); return True, {}'),
+        ('crash', 'os._exit(1)'),
+    ]:
+        (lib_dir / f'{name}.py').write_text(
+            f'import os\nimport time\ndef {name}(x):\n    {body}\n')
+    pool = SubFuncPool(2, 10, str(tmp_path))
+    yield pool
+    pool.terminate()
+
+
+def run_func_pool(pool, timeout=20):
+    """Process the pool until it is done."""
+    start = time()
+    while pool.is_not_done():
+        assert time() - start < timeout
+        pool.process()
+        sleep(0.05)
+
+
+def test_func_pool(func_pool):
+    """Test functions are called in persistent worker processes."""
+    done = []
+    for x in range(4):
+        func_pool.put_command(
+            SubFuncContext('echo', 'echo', [x], {}), done.append)
+    run_func_pool(func_pool)
+    assert sorted(ctx.func_args[0] for ctx in done) == [0, 1, 2, 3]
+    pids = set()
+    for ctx in done:
+        assert ctx.ret_code == 0
+        assert ctx.err == 'noise\n'
+        satisfied, results = json.loads(ctx.out)
+        assert satisfied and results['x'] == ctx.func_args[0]
+        pids.add(results['pid'])
+    # 4 calls, 2 workers
+    assert len(pids) <= 2
+    assert os.getpid() not in pids
+
+
+def test_func_pool_crash_and_timeout(func_pool):
+    """Test a crashed or timed out function does not break the pool."""
+    done = []
+    func_pool.put_command(
+        SubFuncContext('crash', 'crash', [0], {}), done.append)
+    run_func_pool(func_pool)
+    assert done[0].ret_code == 1
+
+    # start both workers before reducing the timeout
+    for x in range(2):
+        func_pool.put_command(
+            SubFuncContext('echo', 'echo', [x], {}), done.append)
+    run_func_pool(func_pool)
+    done = []
+    func_pool.timeout = 2
+    func_pool.put_command(
+        SubFuncContext('snooze', 'snooze', [30], {}), done.append)
+    func_pool.put_command(
+        SubFuncContext('echo', 'echo', [1], {}), done.append)
+    run_func_pool(func_pool)
+    assert len(done) == 2
+    results = {ctx.func_name: ctx for ctx in done}
+    assert results['snooze'].ret_code == -9
+    assert 'killed on timeout' in results['snooze'].err
+    assert results['echo'].ret_code == 0
+
+
+def test_func_pool_restart(func_pool, tmp_path):
+    """Test functions are imported afresh when the pool is restarted."""
+    done = []
+    func_pool.put_command(
+        SubFuncContext('echo', 'echo', [1], {}), done.append)
+    run_func_pool(func_pool)
+    (tmp_path / 'lib' / 'python' / 'echo.py').write_text(
+        'def echo(x):\n    return True, {"x": x, "new": True}\n')
+    # a cached function is still used
+    func_pool.put_command(
+        SubFuncContext('echo', 'echo', [2], {}), done.append)
+    run_func_pool(func_pool)
+    assert 'new' not in json.loads(done[1].out)[1]
+
+    # calls in progress are run again after the restart
+    func_pool.put_command(
+        SubFuncContext('snooze', 'snooze', [1], {}), done.append)
+    func_pool.put_command(
+        SubFuncContext('echo', 'echo', [3], {}), done.append)
+    func_pool.process()
+    func_pool.restart()
+    assert not func_pool.runnings
+    assert len(func_pool.queuings) == 2
+    run_func_pool(func_pool)
+    assert [ctx.ret_code for ctx in done[2:]] == [0, 0]
+    results = {ctx.func_name: ctx for ctx in done[2:]}
+    assert json.loads(results['echo'].out)[1]['new']
+
+
 if __name__ == '__main__':
     unittest.main()
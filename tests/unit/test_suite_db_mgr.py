@@ -0,0 +1,195 @@
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from cylc.flow.rundb import CylcSuiteDAO
+from cylc.flow.suite_db_mgr import PublicDatabaseWriter, SuiteDatabaseManager
+
+
+def make_itask(name, point):
+    """Return a minimal task proxy stand-in for put_task_pool."""
+    return SimpleNamespace(
+        tdef=SimpleNamespace(name=name),
+        point=point,
+        flow_label='x',
+        submit_num=0,
+        timeout=None,
+        poll_timer=None,
+        try_timers={},
+        get_try_num=lambda: 1,
+        state=SimpleNamespace(
+            status='waiting',
+            is_held=False,
+            time_updated=None,
+            prerequisites=[
+                SimpleNamespace(satisfied={
+                    ('up', str(point), 'succeeded'): False})]))
+
+
+@pytest.fixture
+def db_mgr(tmp_path):
+    """Return a suite DB manager writing to a temporary private DB."""
+    db_mgr = SuiteDatabaseManager(tmp_path)
+    db_mgr.pri_dao = db_mgr.get_pri_dao()
+    db_mgr.pub_dao = CylcSuiteDAO(str(tmp_path / 'pub'))
+    yield db_mgr
+    db_mgr.on_suite_shutdown()
+
+
+def n_queued(db_mgr):
+    """Return the number of queued task pool statements."""
+    return sum(
+        len(db_mgr.db_deletes_map[table]) + len(db_mgr.db_inserts_map[table])
+        for table in (
+            db_mgr.TABLE_TASK_POOL,
+            db_mgr.TABLE_TASK_PREREQUISITES,
+            db_mgr.TABLE_TASK_TIMEOUT_TIMERS,
+            db_mgr.TABLE_TASK_ACTION_TIMERS))
+
+
+def select(db_mgr, stmt):
+    """Return the result of a query on the private DB."""
+    return list(db_mgr.pri_dao.connect().execute(stmt))
+
+
+def select_pool(db_mgr):
+    """Return the task_pool and task_prerequisites table content."""
+    return (
+        sorted(select(db_mgr, 'SELECT cycle, name, status FROM task_pool')),
+        sorted(select(
+            db_mgr, 'SELECT cycle, name, satisfied FROM task_prerequisites')))
+
+
+@pytest.mark.parametrize('n_tasks', [10, 1000])
+def test_put_task_pool_writes_changes_only(db_mgr, n_tasks):
+    """Test write volume is proportional to changes, not pool size."""
+    itasks = [make_itask('foo', point) for point in range(n_tasks)]
+    pool = SimpleNamespace(get_all_tasks=lambda: itasks)
+
+    # first flush writes everything
+    db_mgr.put_task_pool(pool)
+    assert n_queued(db_mgr) >= 2 * n_tasks
+    db_mgr.process_queued_ops()
+
+    # nothing changed, nothing written
+    db_mgr.put_task_pool(pool)
+    assert n_queued(db_mgr) == 0
+
+    # one state change, one prerequisite change, one removal
+    itasks[0].state.status = 'running'
+    itasks[1].state.prerequisites[0].satisfied[
+        ('up', '1', 'succeeded')] = 'satisfied naturally'
+    itasks.pop()
+    db_mgr.put_task_pool(pool)
+    assert n_queued(db_mgr) == 5
+    db_mgr.process_queued_ops()
+
+    task_pool, prereqs = select_pool(db_mgr)
+    assert len(task_pool) == n_tasks - 1
+    assert ('0', 'foo', 'running') in task_pool
+    assert len(prereqs) == n_tasks - 1
+    assert ('1', 'foo', 'satisfied naturally') in prereqs
+
+
+def test_put_task_pool_timers(db_mgr):
+    """Test timeout and action timer rows are added and removed."""
+    itask = make_itask('foo', 1)
+    pool = SimpleNamespace(get_all_tasks=lambda: [itask])
+    db_mgr.put_task_pool(pool)
+    db_mgr.process_queued_ops()
+
+    itask.timeout = 10.0
+    itask.poll_timer = SimpleNamespace(
+        ctx=None, delays=[1.0], num=0, delay=None, timeout=None)
+    db_mgr.put_task_pool(pool)
+    db_mgr.process_queued_ops()
+    assert select(db_mgr, 'SELECT timeout FROM task_timeout_timers') == [
+        (10.0,)]
+    assert select(db_mgr, 'SELECT ctx_key FROM task_action_timers') == [
+        ('"poll_timer"',)]
+
+    # a wipe of the task_action_timers table forces re-insertion
+    db_mgr.put_task_event_timers(SimpleNamespace(
+        event_timers_updated=True, _event_timers={}))
+    db_mgr.put_task_pool(pool)
+    db_mgr.process_queued_ops()
+    assert select(db_mgr, 'SELECT ctx_key FROM task_action_timers') == [
+        ('"poll_timer"',)]
+
+    itask.timeout = None
+    itask.poll_timer = None
+    db_mgr.put_task_pool(pool)
+    db_mgr.process_queued_ops()
+    assert select(db_mgr, 'SELECT * FROM task_timeout_timers') == []
+    assert select(db_mgr, 'SELECT * FROM task_action_timers') == []
+
+
+def test_public_database_writer(tmp_path):
+    """Test the public DB is written by the background writer."""
+    db_mgr = SuiteDatabaseManager(tmp_path, tmp_path / 'log', 0.01)
+    (tmp_path / 'log').mkdir()
+    db_mgr.on_suite_start(False)
+    writer = db_mgr.pub_writer
+    assert writer is not None
+    itasks = [make_itask('foo', point) for point in range(3)]
+    pool = SimpleNamespace(get_all_tasks=lambda: itasks)
+    db_mgr.put_task_pool(pool)
+    db_mgr.process_queued_ops()
+    itasks.pop(0)
+    db_mgr.put_task_pool(pool)
+    db_mgr.process_queued_ops()
+    # main loop queues are empty, writes are handed to the writer
+    assert db_mgr.pub_dao.get_queued_stmts() == []
+    db_mgr.on_suite_shutdown()
+    assert writer.lag == 0.0
+    pub_dao = CylcSuiteDAO(str(tmp_path / 'log' / 'db'), is_public=True)
+    try:
+        assert sorted(pub_dao.connect().execute(
+            'SELECT cycle FROM task_pool')) == [('1',), ('2',)]
+        # the public DB does not inherit WAL journaling from the private DB
+        assert pub_dao.connect().execute(
+            'PRAGMA journal_mode').fetchone() == ('delete',)
+    finally:
+        pub_dao.close()
+
+
+def test_public_database_writer_coalesce(tmp_path):
+    """Test batches are applied in order, in one transaction."""
+    dao = CylcSuiteDAO(str(tmp_path / 'db'))
+    dao.close()
+    writer = PublicDatabaseWriter(str(tmp_path / 'db'), 1)
+    insert = dao.tables[dao.TABLE_SUITE_PARAMS].get_insert_stmt()
+    delete = 'DELETE FROM suite_params'
+    writer.put([(insert, [['a', 1]])])
+    writer.put([(insert, [['b', 2]])])
+    writer.put([(delete, [[]]), (insert, [['c', 3]])])
+    assert writer.lag > 0
+    with mock.patch.object(
+        writer.dao, 'execute_stmts', wraps=writer.dao.execute_stmts
+    ) as execute_stmts:
+        writer.flush()
+    execute_stmts.assert_called_once_with([
+        (insert, [['a', 1], ['b', 2]]),
+        (delete, [[]]),
+        (insert, [['c', 3]])])
+    assert writer.lag == 0.0
+    assert list(dao.connect().execute('SELECT * FROM suite_params')) == [
+        ('c', '3')]
+    dao.close()
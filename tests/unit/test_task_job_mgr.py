@@ -0,0 +1,100 @@
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Event, Timer
+from unittest.mock import Mock
+
+import pytest
+
+from cylc.flow.task_job_mgr import TaskJobManager
+
+
+@pytest.fixture
+def task_job_mgr(monkeypatch):
+    """Return a task job manager whose job file writes wait for an event.
+
+    Job files of tasks named "bad" fail to write.
+    """
+    task_job_mgr = TaskJobManager('suite', Mock(), Mock(), Mock(), Mock())
+    task_job_mgr.write_event = Event()
+    monkeypatch.setattr(
+        task_job_mgr, '_prep_submit_task_job',
+        Mock(side_effect=lambda suite, itask: (
+            f'{itask.identity}/job', {'task_id': itask.identity})))
+    monkeypatch.setattr(task_job_mgr, '_prep_submit_task_job_error', Mock())
+    monkeypatch.setattr(
+        TaskJobManager, '_create_job_log_path', Mock())
+
+    def _write_jobs(jobs, check_syntax=True):
+        task_job_mgr.write_event.wait()
+        return [
+            IOError('bad') if job_conf['task_id'] == 'bad' else None
+            for _, job_conf in jobs]
+
+    monkeypatch.setattr(
+        task_job_mgr.job_file_writer, 'write_jobs', _write_jobs)
+    yield task_job_mgr
+    task_job_mgr.write_event.set()
+    task_job_mgr.close()
+
+
+def test_prep_submit_task_jobs(task_job_mgr):
+    """Test job files are written off the main loop."""
+    itasks = [
+        Mock(identity=name, local_job_file_path=None)
+        for name in ('foo', 'bar', 'bad')]
+    assert task_job_mgr.prep_submit_task_jobs('suite', itasks) == [[], []]
+    assert task_job_mgr.prep_queue_depth == 3
+    assert task_job_mgr.prep_latency > 0
+    assert not task_job_mgr.is_prep_done()
+
+    # tasks being prepared are not prepared again
+    assert task_job_mgr.prep_submit_task_jobs('suite', itasks) == [[], []]
+    assert task_job_mgr._prep_submit_task_job.call_count == 3
+
+    task_job_mgr.write_event.set()
+    task_job_mgr.prep_batches[0][0].result()
+    assert task_job_mgr.is_prep_done()
+    assert task_job_mgr.prep_submit_task_jobs('suite', itasks) == [
+        itasks[:2], itasks[2:]]
+    assert itasks[0].local_job_file_path == 'foo/job'
+    assert task_job_mgr.prep_queue_depth == 0
+    assert task_job_mgr.prep_latency == 0
+    task_job_mgr._prep_submit_task_job_error.assert_called_once()
+    assert task_job_mgr._prep_submit_task_job.call_count == 3
+
+
+def test_wait_prep(task_job_mgr):
+    """Test job preparation is handed over before a reload."""
+    itasks = [
+        Mock(identity=name, local_job_file_path=None)
+        for name in ('foo', 'bad')]
+    task_job_mgr.prep_submit_task_jobs('suite', itasks)
+    Timer(0.2, task_job_mgr.write_event.set).start()
+    task_job_mgr.wait_prep('suite')
+    assert not task_job_mgr.prep_batches
+    assert task_job_mgr.prep_queue_depth == 0
+    assert itasks[0].local_job_file_path == 'foo/job'
+    task_job_mgr._prep_submit_task_job_error.assert_called_once()
+
+    # reload successors (see TaskProxy.copy_to_reload_successor)
+    successors = [
+        Mock(identity=itask.identity,
+             local_job_file_path=itask.local_job_file_path)
+        for itask in itasks]
+    assert task_job_mgr.prep_submit_task_jobs('suite', successors[:1]) == [
+        successors[:1], itasks[1:]]
+    assert task_job_mgr._prep_submit_task_job.call_count == 2
@@ -0,0 +1,187 @@
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint, IntegerSequence
+from cylc.flow.task_pool import TaskPool
+from cylc.flow.task_proxy import TaskProxy
+from cylc.flow.task_state import (
+    TASK_STATUS_PREPARING,
+    TASK_STATUS_QUEUED,
+    TASK_STATUS_SUCCEEDED,
+    TaskState,
+)
+from cylc.flow.task_trigger import Dependency, TaskTrigger
+from cylc.flow.taskdef import TaskDef
+
+
+@pytest.fixture
+def task_pool(cycling_mode):
+    """Return a task pool with mocked config and managers."""
+    cycling_mode(integer=True)
+    config = Mock()
+    config.cfg = {'scheduling': {'queues': {}}}
+    return TaskPool(config, Mock(), Mock(), Mock())
+
+
+def make_itask(name, point, flow_label='a', submit_num=0):
+    """Return a minimal task proxy stand-in."""
+    return SimpleNamespace(
+        tdef=SimpleNamespace(name=name),
+        point=IntegerPoint(point),
+        flow_label=flow_label,
+        submit_num=submit_num)
+
+
+def test_submit_nums_index(task_pool):
+    """Test submit numbers are looked up in memory, not in the DB."""
+    task_pool._index_submit_num(make_itask('foo', 1))
+    task_pool._index_submit_num(make_itask('foo', 1, 'b', 3))
+    task_pool._index_submit_num(make_itask('foo', 2, 'a', 1))
+    assert task_pool._get_submit_nums('foo', IntegerPoint(1)) == {
+        'a': 0, 'b': 3}
+    assert task_pool._get_submit_nums('foo', IntegerPoint(2)) == {'a': 1}
+    assert task_pool._get_submit_nums('bar', IntegerPoint(1)) == {}
+    assert task_pool._get_submit_nums('foo', IntegerPoint(3)) == {}
+    task_pool.suite_db_mgr.pri_dao.select_submit_nums.assert_not_called()
+
+
+def test_submit_nums_eviction(task_pool):
+    """Test points before the pool are evicted, and then looked up in DB."""
+    for point in range(1, 4):
+        task_pool._index_submit_num(make_itask('foo', point))
+    task_pool.pool = {IntegerPoint(2): {}}
+    task_pool.runahead_pool = {IntegerPoint(3): {}}
+    task_pool._evict_submit_nums()
+    assert set(task_pool.submit_nums) == {IntegerPoint(2), IntegerPoint(3)}
+
+    select_submit_nums = task_pool.suite_db_mgr.pri_dao.select_submit_nums
+    select_submit_nums.return_value = {'a': 5}
+    assert task_pool._get_submit_nums('foo', IntegerPoint(1)) == {'a': 5}
+    select_submit_nums.assert_called_once_with('foo', '1')
+    # evicted points are not re-indexed
+    task_pool._index_submit_num(make_itask('foo', 1))
+    assert IntegerPoint(1) not in task_pool.submit_nums
+
+
+def test_load_db_submit_nums(task_pool):
+    """Test the index is warmed from the DB on restart."""
+    task_pool.runahead_pool = {IntegerPoint(2): {}}
+    for row_idx, row in enumerate([
+        ['foo', '1', 'a', 1],
+        ['foo', '2', 'a', 2],
+        ['foo', '2', 'b', 3],
+        ['bar', '3', 'a', 1],
+    ]):
+        task_pool.load_db_submit_nums(row_idx, row)
+    assert task_pool.submit_nums == {
+        IntegerPoint(2): {'foo': {'a': 2, 'b': 3}},
+        IntegerPoint(3): {'bar': {'a': 1}}}
+    assert task_pool.submit_nums_min_point == IntegerPoint(2)
+
+
+@pytest.fixture
+def queue_pool(cycling_mode):
+    """Return a task pool with one queue, and a function to add tasks."""
+    cycling_mode(integer=True)
+    config = Mock()
+    config.Q_DEFAULT = 'default'
+    config.cfg = {
+        'scheduling': {'queues': {'default': {'limit': 2, 'members': []}}}}
+    task_pool = TaskPool(config, Mock(), Mock(), Mock())
+    tdef = TaskDef('foo', {}, 'live', IntegerPoint(1))
+    tdef.add_sequence(IntegerSequence('R/1/P1', 1))
+
+    def _add_task(point, is_held=False):
+        itask = TaskProxy(
+            tdef, IntegerPoint(point), 'a', is_held=is_held, reflow=False)
+        task_pool.add_to_runahead_pool(itask)
+        task_pool.release_runahead_task(itask)
+        return itask
+
+    return task_pool, _add_task
+
+
+def test_get_ready_tasks_queue_limit(queue_pool):
+    """Test queue limits are applied using the active task counters."""
+    task_pool, add_task = queue_pool
+    itasks = [add_task(point) for point in range(1, 5)]
+    ready = task_pool.get_ready_tasks()
+    assert ready == itasks[:2]
+    assert all(itask.state(TASK_STATUS_QUEUED) for itask in itasks)
+    for itask in ready:
+        itask.state.reset(TASK_STATUS_PREPARING)
+    assert task_pool.get_ready_tasks() == []
+    itasks[0].state.reset(TASK_STATUS_SUCCEEDED)
+    assert task_pool.get_ready_tasks() == [itasks[2]]
+    task_pool.remove(itasks[1])
+    assert task_pool.get_ready_tasks() == [itasks[2], itasks[3]]
+
+
+def test_get_ready_tasks_event_driven(queue_pool, monkeypatch):
+    """Test only tasks whose state has changed are checked."""
+    task_pool, add_task = queue_pool
+    itask = add_task(1, is_held=True)
+    is_ready = Mock(wraps=itask.is_ready)
+    monkeypatch.setattr(TaskProxy, 'is_ready', lambda self: is_ready())
+    assert task_pool.get_ready_tasks() == []
+    assert is_ready.call_count == 1
+    # nothing has changed, nothing to check
+    assert task_pool.get_ready_tasks() == []
+    assert is_ready.call_count == 1
+    # release the task
+    itask.state.reset(is_held=False)
+    assert task_pool.get_ready_tasks() == [itask]
+    assert is_ready.call_count == 2
+
+
+@pytest.fixture
+def abs_pool(task_pool, monkeypatch):
+    """Return a task pool for the graph "R1 = foo; P1 = foo[1] => bar"."""
+    bar = TaskDef('bar', {}, 'live', IntegerPoint(1))
+    seq = IntegerSequence('P1', 1)
+    bar.add_sequence(seq)
+    trigger = TaskTrigger('foo', '1', 'succeeded', offset_is_absolute=True)
+    bar.add_dependency(Dependency([trigger], [trigger], False), seq)
+    task_pool.config.get_taskdef.return_value = bar
+    task_pool.config.start_point = IntegerPoint(1)
+    task_pool.stop_point = None
+    monkeypatch.setattr(task_pool, 'can_spawn', lambda *_: True)
+    return task_pool, bar
+
+
+def test_spawn_task_abs_outputs(abs_pool):
+    """Test absolute outputs are only looked up for tasks which need them."""
+    task_pool, bar = abs_pool
+    task_pool.abs_outputs_done = {
+        'foo': {('foo', '1', 'succeeded')},
+        'baz': {('baz', '1', 'succeeded')}}
+    itask = task_pool.spawn_task('bar', IntegerPoint(3), 'a')
+    assert itask.state.prerequisites_all_satisfied()
+    assert task_pool.tasks_by_name == {'bar': {itask.identity: itask}}
+
+    # no absolute triggers, nothing to look up
+    bar.dependencies.clear()
+    with patch.object(TaskState, 'satisfy_me') as satisfy_me:
+        task_pool.spawn_task('bar', IntegerPoint(4), 'a')
+    satisfy_me.assert_not_called()
+
+    task_pool.remove(itask)
+    assert set(task_pool.tasks_by_name['bar']) == {'bar.4'}
@@ -0,0 +1,68 @@
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint, IntegerSequence
+from cylc.flow.task_trigger import TaskTrigger
+from cylc.flow.taskdef import (
+    TaskDef,
+    generate_graph_children,
+    generate_graph_parents,
+)
+
+
+@pytest.fixture
+def tdefs(cycling_mode):
+    """Return task definitions for the graph "P1 = foo[-P1] => bar"."""
+    cycling_mode(integer=True)
+    seq = IntegerSequence('P1', 1)
+    foo = TaskDef('foo', {}, 'live', IntegerPoint(1))
+    bar = TaskDef('bar', {}, 'live', IntegerPoint(1))
+    trigger = TaskTrigger('foo', '-P1', 'succeeded')
+    for tdef in (foo, bar):
+        tdef.add_sequence(seq)
+    foo.add_graph_child(trigger, 'bar', seq)
+    bar.add_graph_parent(trigger, 'foo', seq)
+    return foo, bar, seq
+
+
+def test_generate_graph_children_parents(tdefs):
+    """Test the graph children and parents of a task are cached."""
+    foo, bar, seq = tdefs
+    children = generate_graph_children(foo, IntegerPoint(1))
+    assert children == {'succeeded': [('bar', IntegerPoint(2), False)]}
+    assert generate_graph_children(foo, IntegerPoint(1)) is children
+    parents = generate_graph_parents(bar, IntegerPoint(2))
+    assert parents == {seq: [('foo', IntegerPoint(1), False)]}
+    assert generate_graph_parents(bar, IntegerPoint(2)) is parents
+
+    # changes to the graph invalidate the cache
+    foo.add_graph_child(TaskTrigger('foo', None, 'failed'), 'baz', seq)
+    assert foo.graph_children_cache == {}
+    assert generate_graph_children(foo, IntegerPoint(1)) == {
+        'succeeded': [('bar', IntegerPoint(2), False)],
+        'failed': [('baz', IntegerPoint(1), False)]}
+
+
+def test_graph_cache_bounded(tdefs, monkeypatch):
+    """Test the least recently used points are evicted from the cache."""
+    foo = tdefs[0]
+    monkeypatch.setattr(TaskDef, 'MAX_LEN_GRAPH_CACHE', 3)
+    for point in (1, 2, 3, 1, 4):
+        generate_graph_children(foo, IntegerPoint(point))
+    assert list(foo.graph_children_cache) == [
+        IntegerPoint(3), IntegerPoint(1), IntegerPoint(4)]
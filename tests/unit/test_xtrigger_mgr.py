@@ -152,7 +152,7 @@ def test_housekeeping_with_xtrigger_satisfied(xtrigger_mgr):
         tdef, start_point, FlowLabelMgr().get_new_label())
     xtrigger_mgr.collate([itask])
     # pretend the function has been activated
-    xtrigger_mgr.active.append(xtrig.get_signature())
+    xtrigger_mgr.active.add(xtrig.get_signature())
     xtrigger_mgr.callback(xtrig)
     assert xtrigger_mgr.sat_xtrig
     xtrigger_mgr.housekeep()
@@ -309,7 +309,7 @@ def test_callback_invalid_json(xtrigger_mgr):
         func_kwargs={}
     )
     get_name.out = "{no_quotes: \"mom!\"}"
-    xtrigger_mgr.active.append(get_name.get_signature())
+    xtrigger_mgr.active.add(get_name.get_signature())
     xtrigger_mgr.callback(get_name)
     # this means that the xtrigger was not satisfied
     # TODO: this means site admins are only aware of this if they
@@ -326,7 +326,7 @@ def test_callback(xtrigger_mgr):
         func_kwargs={}
     )
     get_name.out = "[\"True\", \"1\"]"
-    xtrigger_mgr.active.append(get_name.get_signature())
+    xtrigger_mgr.active.add(get_name.get_signature())
     xtrigger_mgr.callback(get_name)
     # this means that the xtrigger was satisfied
     assert xtrigger_mgr.sat_xtrig
@@ -394,6 +394,68 @@ def test_check_xtriggers(xtrigger_mgr_procpool):
     assert xtrigger_mgr_procpool.all_xtrig
 
 
+def test_check_xtriggers_shared(xtrigger_mgr_procpool_broadcast):
+    """Test tasks sharing an xtrigger signature are satisfied together.
+
+    The function context should be rendered once per cycle point, and the
+    function called once per signature."""
+    xtrigger_mgr = xtrigger_mgr_procpool_broadcast
+    get_name = SubFuncContext(
+        label="get_name",
+        func_name="get_name",
+        func_args=[],
+        func_kwargs={}
+    )
+    xtrigger_mgr.add_trig("get_name", get_name, 'fdir')
+    init()
+    sequence = ISO8601Sequence('P1D', '2019')
+    itasks = []
+    for name in ("foo", "bar", "baz"):
+        tdef = TaskDef(
+            name=name,
+            rtcfg=None,
+            run_mode="live",
+            start_point=1
+        )
+        tdef.xtrig_labels[sequence] = ["get_name"]
+        itask = TaskProxy(
+            tdef, ISO8601Point('2019'), FlowLabelMgr().get_new_label())
+        itask.state.xtriggers["get_name"] = False  # satisfied?
+        itasks.append(itask)
+    commands = []
+    xtrigger_mgr.proc_pool.put_command = (
+        lambda ctx, callback: commands.append(ctx))
+    broadcasts = []
+    xtrigger_mgr.broadcast_mgr.put_broadcast = (
+        lambda *args: broadcasts.append(args))
+
+    xtrigger_mgr.check_xtriggers(itasks)
+    assert len(xtrigger_mgr._xtrigs) == 1
+    assert len(xtrigger_mgr.waiting) == 1
+    assert len(commands) == 1
+    # called again before the callback, nothing to do
+    xtrigger_mgr.check_xtriggers(itasks)
+    assert len(commands) == 1
+
+    commands[0].ret_code = 0
+    commands[0].out = "[true, {\"name\": \"Yossarian\"}]"
+    xtrigger_mgr.callback(commands[0])
+    assert not xtrigger_mgr.active
+    with pytest.raises(ValueError):
+        xtrigger_mgr.callback(commands[0])
+    xtrigger_mgr.check_xtriggers(itasks)
+    assert all(itask.state.xtriggers["get_name"] for itask in itasks)
+    assert broadcasts == [(
+        ['2019'],
+        ['foo', 'bar', 'baz'],
+        [{'environment': {'get_name_name': 'Yossarian'}}]
+    )]
+    # nothing left waiting on the next pass
+    xtrigger_mgr.check_xtriggers(itasks)
+    assert not xtrigger_mgr.waiting
+    assert len(broadcasts) == 1
+
+
 # mock objects
 
 class MockedProcPool(SubProcPool):